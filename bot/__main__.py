@@ -1,8 +1,13 @@
 import logging
 
 from bot.constants import Client, bot
+from bot.profiler import StartupProfiler
 
 log = logging.getLogger(__name__)
 
+if Client.profile_startup:
+    log.info("Startup profiling enabled")
+    bot.profiler = StartupProfiler()
+
 bot.load_extension("bot.seasons")
 bot.run(Client.token)
@@ -1,13 +1,20 @@
+import importlib
 import logging
-import socket
+import time
 from traceback import format_exc
-from typing import List
+from typing import Dict, List, Optional
 
-from aiohttp import AsyncResolver, ClientSession, TCPConnector
 from discord import Embed
 from discord.ext import commands
 
 from bot import constants
+from bot.http_client import HTTPClient
+from bot.loop_monitor import LoopMonitor
+from bot.message_router import MessageRouter
+from bot.metrics import CommandMetrics, MetricsExporter
+from bot.profiler import StartupProfiler
+from bot.rendering import RenderCache, RenderEngine
+from bot.utils.avatars import AvatarService
 
 log = logging.getLogger(__name__)
 
@@ -19,26 +26,136 @@ class SeasonalBot(commands.Bot):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.http_session = ClientSession(
-            connector=TCPConnector(resolver=AsyncResolver(), family=socket.AF_INET)
+        self.http_client = HTTPClient(
+            limit=constants.HTTP.connection_limit,
+            limit_per_host=constants.HTTP.connection_limit_per_host,
+            keepalive_timeout=constants.HTTP.keepalive_timeout,
+            timeout=constants.HTTP.timeout,
+            retries=constants.HTTP.retries,
+            backoff=constants.HTTP.retry_backoff,
         )
+        self.renderer = RenderEngine(
+            workers=constants.Rendering.workers,
+            max_queue=constants.Rendering.max_queue,
+            timeout=constants.Rendering.timeout,
+        )
+        self.render_cache = RenderCache(
+            max_bytes=constants.Rendering.output_cache_budget,
+            spill_bytes=constants.Rendering.output_spill_budget,
+        )
+        self.avatars = AvatarService(self.http_client, constants.Rendering.avatar_cache_budget)
+        self.profiler: Optional[StartupProfiler] = None
+        self.message_router = MessageRouter(self)
+
+        self.command_metrics = CommandMetrics()
+        self.before_invoke(self.command_metrics.before_invoke)
+        self.after_invoke(self.command_metrics.after_invoke)
+        self.loop_monitor = LoopMonitor(constants.Metrics.loop_lag_interval, constants.Metrics.blocking_threshold)
+        self.metrics_exporter = None
+        if constants.Metrics.enabled:
+            self.metrics_exporter = MetricsExporter(self, constants.Metrics.host, constants.Metrics.port)
+
+    def add_cog(self, cog: commands.Cog):
+        """Add a cog, registering its message handlers with the message router."""
+        super().add_cog(cog)
+        self.message_router.register_cog(cog)
+
+    def remove_cog(self, name: str):
+        """Remove a cog along with its message handlers."""
+        cog = self.get_cog(name)
+        super().remove_cog(name)
+        if cog is not None:
+            self.message_router.unregister_cog(cog)
+
+    def dispatch(self, event_name: str, *args, **kwargs):
+        """Dispatch an event to its listeners, and messages to the matching message handlers too."""
+        super().dispatch(event_name, *args, **kwargs)
+        if event_name == "message":
+            self.message_router.dispatch(*args)
+
+    def load_extension(self, name: str):
+        """
+        Load an extension, profiling its import and setup separately if the profiler is enabled.
+
+        The module is imported on its own first, so the import is already cached by the time
+        discord.py imports it again and runs its `setup()` function.
+        """
+        if not self.profiler:
+            super().load_extension(name)
+            return
+
+        with self.profiler.profile(name) as profile:
+            importlib.import_module(name)
+            profile.imported()
+            super().load_extension(name)
+
+    def load_extensions(self, exts: List[str]) -> Dict[str, float]:
+        """
+        Bring the loaded extensions in line with the given extensions.
+
+        Only the difference between what is currently loaded and what was requested is acted upon:
+        extensions no longer wanted are unloaded, new ones are loaded and the rest are left running.
 
-    def load_extensions(self, exts: List[str]):
-        """Unload all current extensions, then load the given extensions."""
-        # Unload all cogs
-        extensions = list(self.extensions.keys())
-        for extension in extensions:
-            if extension != "bot.seasons":  # We shouldn't unload the manager.
+        Returns a mapping of each newly loaded extension to the seconds its import and setup took.
+        """
+        desired = set(exts)
+        current = {ext for ext in self.extensions if ext != "bot.seasons"}  # We shouldn't unload the manager.
+
+        # Unload only the cogs that aren't part of the new set of extensions
+        for extension in sorted(current - desired):
+            cog = extension.split(".")[-1]
+            try:
                 self.unload_extension(extension)
+                log.info(f'Successfully unloaded extension: {cog}')
+            except Exception as e:
+                log.error(f'Failed to unload extension {cog}: {repr(e)} {format_exc()}')
 
-        # Load in the list of cogs that was passed in here
+        # Load in the cogs which aren't already loaded, keeping the order they were passed in
+        load_times = {}
         for extension in exts:
+            if extension in current:
+                continue
+
             cog = extension.split(".")[-1]
+            start = time.perf_counter()
             try:
                 self.load_extension(extension)
-                log.info(f'Successfully loaded extension: {cog}')
             except Exception as e:
                 log.error(f'Failed to load extension {cog}: {repr(e)} {format_exc()}')
+            else:
+                load_times[extension] = time.perf_counter() - start
+                log.info(f'Successfully loaded extension: {cog} ({load_times[extension] * 1000:.1f}ms)')
+
+        log.info(
+            f"Extensions updated: {len(load_times)} loaded, {len(current - desired)} unloaded, "
+            f"{len(current & desired)} left untouched."
+        )
+        return load_times
+
+    async def start(self, *args, **kwargs):
+        """
+        Start the rendering workers, loop monitor and metrics exporter before connecting to Discord.
+
+        The rendering workers are started first, before the loop monitor's watchdog thread exists.
+        Blocking call detection times every step of the event loop, so it's only enabled in debug mode.
+        """
+        await self.renderer.warm_up()
+        self.loop_monitor.start(self.loop, detect_blocking=constants.Client.debug)
+        if self.metrics_exporter:
+            try:
+                await self.metrics_exporter.start()
+            except OSError as e:
+                log.error(f"Failed to start the metrics exporter: {e}")
+        await super().start(*args, **kwargs)
+
+    async def close(self):
+        """Close the shared HTTP client, rendering workers, loop monitor and metrics exporter along with the bot."""
+        await super().close()
+        self.renderer.close()
+        self.loop_monitor.stop()
+        await self.http_client.close()
+        if self.metrics_exporter:
+            await self.metrics_exporter.stop()
 
     async def send_log(self, title: str, details: str = None, *, icon: str = None):
         """Send an embed message to the devlog channel."""
@@ -58,6 +175,7 @@ class SeasonalBot(commands.Bot):
 
     async def on_command_error(self, context, exception):
         """Check command errors for UserInputError and reset the cooldown if thrown."""
+        self.command_metrics.record_error(context)
         if isinstance(exception, commands.UserInputError):
             context.command.reset_cooldown(context)
         else:
@@ -5,8 +5,8 @@ from typing import NamedTuple
 from bot.bot import SeasonalBot
 
 __all__ = (
-    "AdventOfCode", "Channels", "Client", "Colours", "Emojis", "Hacktoberfest", "Roles",
-    "Tokens", "ERROR_REPLIES", "bot"
+    "AdventOfCode", "Channels", "Client", "Colours", "Emojis", "Hacktoberfest", "HTTP", "Metrics", "Rendering",
+    "Roles", "Tokens", "ERROR_REPLIES", "bot"
 )
 
 log = logging.getLogger(__name__)
@@ -14,6 +14,9 @@ log = logging.getLogger(__name__)
 
 class AdventOfCode:
     leaderboard_cache_age_threshold_seconds = 3600
+    finished_leaderboard_cache_age_threshold_seconds = 24 * 60 * 60
+    leaderboard_min_refresh_interval_seconds = 15 * 60
+    leaderboard_max_refresh_backoff_seconds = 4 * 60 * 60
     leaderboard_id = 363275
     leaderboard_join_code = str(environ.get("AOC_JOIN_CODE", None))
     leaderboard_max_displayed_members = 10
@@ -60,6 +63,7 @@ class Client(NamedTuple):
     prefix = environ.get("PREFIX", ".")
     token = environ.get("SEASONALBOT_TOKEN")
     debug = environ.get("SEASONALBOT_DEBUG", "").lower() == "true"
+    profile_startup = environ.get("SEASONALBOT_PROFILE_STARTUP", "").lower() == "true"
     season_override = environ.get("SEASON_OVERRIDE")
 
 
@@ -87,6 +91,33 @@ class Emojis:
     terning6 = "<:terning6:431249726705369098>"
 
 
+class HTTP(NamedTuple):
+    connection_limit = int(environ.get("HTTP_CONNECTION_LIMIT", 100))
+    connection_limit_per_host = int(environ.get("HTTP_CONNECTION_LIMIT_PER_HOST", 10))
+    keepalive_timeout = 30
+    timeout = float(environ.get("HTTP_TIMEOUT", 10))
+    retries = int(environ.get("HTTP_RETRIES", 2))
+    retry_backoff = 0.5
+
+
+class Metrics(NamedTuple):
+    enabled = environ.get("METRICS_ENABLED", "true").lower() == "true"
+    host = environ.get("METRICS_HOST", "127.0.0.1")
+    port = int(environ.get("METRICS_PORT", 9155))
+    loop_lag_interval = float(environ.get("METRICS_LOOP_LAG_INTERVAL", 0.5))
+    blocking_threshold = float(environ.get("METRICS_BLOCKING_THRESHOLD", 0.1))
+
+
+class Rendering(NamedTuple):
+    workers = int(environ.get("RENDER_WORKERS", 2))
+    max_queue = int(environ.get("RENDER_MAX_QUEUE", 16))
+    timeout = float(environ.get("RENDER_TIMEOUT", 30))
+    asset_budget = int(environ.get("RENDER_ASSET_BUDGET", 64 * 1024 * 1024))
+    avatar_cache_budget = int(environ.get("RENDER_AVATAR_CACHE_BUDGET", 32 * 1024 * 1024))
+    output_cache_budget = int(environ.get("RENDER_OUTPUT_CACHE_BUDGET", 32 * 1024 * 1024))
+    output_spill_budget = int(environ.get("RENDER_OUTPUT_SPILL_BUDGET", 0))
+
+
 class Lovefest:
     role_id = int(environ.get("LOVEFEST_ROLE_ID", 542431903886606399))
 
@@ -0,0 +1,233 @@
+import asyncio
+import json
+import logging
+import random
+import socket
+import time
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, NamedTuple, Optional
+
+from aiohttp import (
+    AsyncResolver, ClientConnectionError, ClientResponseError, ClientSession, ClientTimeout, RequestInfo,
+    TCPConnector, TraceConfig
+)
+from multidict import CIMultiDictProxy
+from yarl import URL
+
+from bot.metrics import record_http_time
+
+log = logging.getLogger(__name__)
+
+__all__ = ("HTTPClient", "HTTPResponse", "HostMetrics")
+
+# Only requests without side effects are retried
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Response statuses which are worth retrying after a short wait
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HTTPResponse(NamedTuple):
+    """A fully read HTTP response, detached from the connection it arrived on."""
+
+    url: str
+    status: int
+    headers: CIMultiDictProxy
+    body: bytes
+    request_info: RequestInfo
+
+    def json(self) -> Any:
+        """Decode the body as JSON."""
+        return json.loads(self.body)
+
+    def text(self, encoding: str = "utf-8") -> str:
+        """Decode the body as text."""
+        return self.body.decode(encoding, errors="replace")
+
+    def raise_for_status(self):
+        """Raise a `ClientResponseError` if the response status is 400 or higher."""
+        if self.status >= 400:
+            raise ClientResponseError(self.request_info, (), status=self.status, headers=self.headers)
+
+
+class HostMetrics:
+    """Usage statistics for all the requests made to a single host."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.handshakes = 0
+        self.connections_reused = 0
+        self.bytes_received = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    @property
+    def latency_average(self) -> float:
+        """Return the mean latency of completed requests in seconds."""
+        completed = self.requests - self.errors
+        return self.latency_total / completed if completed else 0.0
+
+    def to_dict(self) -> dict:
+        """Return the metrics as a JSON-serializable dict."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "handshakes": self.handshakes,
+            "connections_reused": self.connections_reused,
+            "bytes_received": self.bytes_received,
+            "latency_average_ms": round(self.latency_average * 1000, 2),
+            "latency_max_ms": round(self.latency_max * 1000, 2),
+        }
+
+
+class HTTPClient:
+    """
+    The shared HTTP client used by every cog for requests to external APIs.
+
+    All requests go through a single pooled connector, so connections to a host are kept alive and
+    reused across commands rather than paying for a new DNS lookup and TCP/TLS handshake every time.
+    The connector also caps the number of concurrent connections to each host.
+
+    Idempotent requests which fail with a connection error, a timeout or a retryable status are
+    retried with exponential backoff and full jitter, waiting at least as long as any `Retry-After`
+    header asks. Per-host metrics are kept for every request.
+    """
+
+    def __init__(
+        self,
+        *,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        keepalive_timeout: float = 30,
+        timeout: float = 10,
+        retries: int = 2,
+        backoff: float = 0.5,
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = ClientTimeout(total=timeout)
+        self.metrics: Dict[str, HostMetrics] = defaultdict(HostMetrics)
+
+        trace_config = TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+
+        self.session = ClientSession(
+            connector=TCPConnector(
+                resolver=AsyncResolver(),
+                family=socket.AF_INET,
+                limit=limit,
+                limit_per_host=limit_per_host,
+                keepalive_timeout=keepalive_timeout,
+            ),
+            timeout=self.timeout,
+            trace_configs=[trace_config],
+        )
+
+    async def _on_request_start(self, session: ClientSession, context: Any, params: Any):
+        context.host = params.url.host
+
+    async def _on_connection_create_end(self, session: ClientSession, context: Any, params: Any):
+        self.metrics[context.host].handshakes += 1
+
+    async def _on_connection_reuseconn(self, session: ClientSession, context: Any, params: Any):
+        self.metrics[context.host].connections_reused += 1
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Return how long to wait before the next attempt, using exponential backoff with full jitter."""
+        return random.uniform(0, self.backoff * 2 ** attempt)
+
+    @staticmethod
+    def _retry_after(response: HTTPResponse) -> Optional[float]:
+        """Return how many seconds the `Retry-After` header asks to wait for, or None if there isn't a valid one."""
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    async def request(
+        self, method: str, url: str, *, retries: int = None, timeout: float = None, **kwargs
+    ) -> HTTPResponse:
+        """
+        Send a request and read the whole response.
+
+        `retries` and `timeout` override the client's defaults for this request only. Any other
+        keyword arguments are passed on to `aiohttp.ClientSession.request`.
+        """
+        if retries is None:
+            retries = self.retries
+        if method.upper() not in IDEMPOTENT_METHODS:
+            retries = 0
+        if timeout is not None:
+            kwargs["timeout"] = ClientTimeout(total=timeout)
+
+        started = time.perf_counter()
+        try:
+            return await self._request(method, url, retries, **kwargs)
+        finally:
+            record_http_time(time.perf_counter() - started)
+
+    async def _request(self, method: str, url: str, retries: int, **kwargs) -> HTTPResponse:
+        """Send a request, retrying it up to `retries` times."""
+        host = URL(url).host
+        timeout = kwargs.get("timeout", self.timeout).total
+        attempt = 0
+        while True:
+            metrics = self.metrics[host]
+            metrics.requests += 1
+            retry_after = None
+            start = time.perf_counter()
+            try:
+                async with self.session.request(method, url, **kwargs) as resp:
+                    body = await resp.read()
+                    response = HTTPResponse(str(resp.url), resp.status, resp.headers, body, resp.request_info)
+            except (ClientConnectionError, asyncio.TimeoutError) as e:
+                metrics.errors += 1
+                log.debug(f"Request to {url} failed on attempt {attempt + 1}: {e!r}")
+                if attempt >= retries:
+                    raise
+            else:
+                latency = time.perf_counter() - start
+                metrics.bytes_received += len(body)
+                metrics.latency_total += latency
+                metrics.latency_max = max(metrics.latency_max, latency)
+
+                if attempt >= retries or response.status not in RETRY_STATUSES:
+                    return response
+
+                # Retrying any sooner than the host asked would only be rejected again
+                retry_after = self._retry_after(response)
+                if retry_after is not None and timeout is not None and retry_after > timeout:
+                    log.debug(f"Not retrying request to {url}, it asked to wait {retry_after:.0f}s")
+                    return response
+
+            metrics.retries += 1
+            delay = max(self._backoff_delay(attempt), retry_after or 0.0)
+            log.debug(f"Retrying request to {url} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, url: str, **kwargs) -> HTTPResponse:
+        """Send a GET request and read the whole response."""
+        return await self.request("GET", url, **kwargs)
+
+    async def get_json(self, url: str, **kwargs) -> Any:
+        """Send a GET request and decode the response as JSON."""
+        response = await self.get(url, **kwargs)
+        return response.json()
+
+    async def close(self):
+        """Close the underlying session and all of its pooled connections."""
+        await self.session.close()
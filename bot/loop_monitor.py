@@ -0,0 +1,207 @@
+import asyncio
+import bisect
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+from bot.metrics import current_invocation
+
+log = logging.getLogger(__name__)
+
+# Upper bounds of the loop lag histogram buckets in seconds
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+# Number of recent lag samples kept for calculating percentiles
+SAMPLE_SIZE = 1024
+
+# Number of blocking locations kept, the ones which blocked the loop for the least time overall are dropped first
+MAX_OFFENDERS = 100
+
+BOT_ROOT = str(Path("bot").absolute())
+
+
+class BlockingCall:
+    """A single event loop step which ran for longer than the blocking threshold."""
+
+    def __init__(self, location: str, duration: float, command: Optional[str], stack: List[str]):
+        self.location = location
+        self.duration = duration
+        self.command = command
+        self.stack = stack
+        self.time = time.time()
+
+
+class Offender:
+    """Totals for all the blocking calls attributed to the same location."""
+
+    def __init__(self, location: str):
+        self.location = location
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.commands = set()
+        self.last: Optional[BlockingCall] = None
+
+    def add(self, call: BlockingCall):
+        """Add a blocking call to the totals."""
+        self.count += 1
+        self.total += call.duration
+        self.max = max(self.max, call.duration)
+        if call.command:
+            self.commands.add(call.command)
+        self.last = call
+
+
+def _location(stack: traceback.StackSummary) -> str:
+    """Return the innermost frame of the stack which belongs to the bot as `module:function`, else the innermost."""
+    for frame in reversed(stack):
+        if frame.filename.startswith(BOT_ROOT) and not frame.filename.endswith("loop_monitor.py"):
+            module = Path(frame.filename).relative_to(BOT_ROOT).with_suffix("").as_posix().replace("/", ".")
+            return f"bot.{module}:{frame.name}"
+    return f"{stack[-1].filename}:{stack[-1].name}"
+
+
+def _callback_location(handle: asyncio.Handle) -> str:
+    """Return the name of the coroutine a loop step ran for, or of its callback if it didn't run a task."""
+    callback = handle._callback
+    task = getattr(callback, "__self__", None)
+    if isinstance(task, asyncio.Task):
+        coro = task.get_coro() if hasattr(task, "get_coro") else task._coro
+        return getattr(coro, "__qualname__", type(coro).__name__)
+    return getattr(callback, "__qualname__", type(callback).__name__)
+
+
+class LoopMonitor:
+    """
+    Measures how late the event loop runs scheduled callbacks, and optionally which callbacks block it.
+
+    The lag sampler sleeps for a fixed interval and records how much later than requested it woke
+    up. With blocking detection enabled, every loop step is timed, and a watchdog thread snapshots
+    the loop thread's stack while a step is overrunning the threshold. Each blocking step is
+    attributed to the command being invoked in its context, if any, and to the innermost frame of
+    the bot's own code on the stack. Steps which ended before the watchdog caught their stack are
+    attributed to the coroutine or callback they ran instead.
+    """
+
+    def __init__(self, interval: float = 0.5, threshold: float = 0.1):
+        self.interval = interval
+        self.threshold = threshold
+
+        self.bounds = LAG_BUCKETS
+        self.buckets = [0] * (len(LAG_BUCKETS) + 1)
+        self.samples: Deque[float] = deque(maxlen=SAMPLE_SIZE)
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+
+        self.recent: Deque[BlockingCall] = deque(maxlen=50)
+        self.offenders: Dict[str, Offender] = {}
+        self.detecting = False
+
+        self._task: Optional[asyncio.Task] = None
+        self._loop_thread: Optional[int] = None
+        self._step = 0
+        self._step_started: Optional[float] = None
+        self._step_stack: Optional[traceback.StackSummary] = None
+        self._stack_step = -1
+
+    def start(self, loop: asyncio.AbstractEventLoop, *, detect_blocking: bool = False):
+        """Start sampling loop lag, and detecting blocking calls if `detect_blocking` is True."""
+        self._task = loop.create_task(self._sample_lag(loop))
+        if detect_blocking:
+            self._install_detector()
+
+    def stop(self):
+        """Stop sampling loop lag."""
+        if self._task:
+            self._task.cancel()
+
+    async def _sample_lag(self, loop: asyncio.AbstractEventLoop):
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record_lag(max(0.0, loop.time() - expected))
+
+    def record_lag(self, lag: float):
+        """Record a single scheduling delay."""
+        self.buckets[bisect.bisect_left(LAG_BUCKETS, lag)] += 1
+        self.samples.append(lag)
+        self.lag_total += lag
+        self.lag_max = max(self.lag_max, lag)
+
+    def percentile(self, percent: float) -> float:
+        """Return the given percentile of the recent scheduling delays in seconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+    def _install_detector(self):
+        """Wrap every event loop step with a timer, and start the watchdog thread."""
+        if self.detecting:
+            return
+
+        self.detecting = True
+        self._loop_thread = threading.get_ident()
+        original_run = asyncio.events.Handle._run
+        monitor = self
+
+        def timed_run(handle: asyncio.Handle):
+            monitor._step += 1
+            monitor._step_started = time.perf_counter()
+            try:
+                original_run(handle)
+            finally:
+                duration = time.perf_counter() - monitor._step_started
+                monitor._step_started = None
+                if duration >= monitor.threshold:
+                    monitor._report(handle, duration)
+
+        asyncio.events.Handle._run = timed_run
+        threading.Thread(target=self._watchdog, name="loop-watchdog", daemon=True).start()
+        log.info(f"Blocking call detection enabled with a threshold of {self.threshold * 1000:.0f}ms")
+
+    def _watchdog(self):
+        """Snapshot the loop thread's stack whenever a step overruns the threshold."""
+        while self.detecting:
+            time.sleep(self.threshold / 2)
+
+            started, step = self._step_started, self._step
+            if started is None or step == self._stack_step or time.perf_counter() - started < self.threshold:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is not None:
+                self._step_stack = traceback.extract_stack(frame)
+                self._stack_step = step
+
+    def _report(self, handle: asyncio.Handle, duration: float):
+        """Record a blocking step, attributing it to a command and a location in the bot's code."""
+        stack = self._step_stack if self._stack_step == self._step else None
+
+        invocation = handle._context.get(current_invocation) if getattr(handle, "_context", None) else None
+        command = invocation.command if invocation else None
+
+        location = _location(stack) if stack else _callback_location(handle)
+        formatted = traceback.format_list(stack[-8:]) if stack else []
+
+        call = BlockingCall(location, duration, command, formatted)
+        self.recent.append(call)
+        if location not in self.offenders:
+            if len(self.offenders) >= MAX_OFFENDERS:
+                del self.offenders[min(self.offenders, key=lambda key: self.offenders[key].total)]
+            self.offenders[location] = Offender(location)
+        self.offenders[location].add(call)
+
+        log.warning(
+            f"Event loop blocked for {duration * 1000:.0f}ms by {location}"
+            + (f" during command '{command}'" if command else "")
+        )
+
+    def worst_offenders(self) -> List[Offender]:
+        """Return the blocking locations ordered by the total time they blocked the loop for."""
+        return sorted(self.offenders.values(), key=lambda offender: offender.total, reverse=True)
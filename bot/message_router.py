@@ -0,0 +1,148 @@
+import inspect
+import logging
+import re
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Union
+
+import discord
+from discord.ext import commands
+
+log = logging.getLogger(__name__)
+
+__all__ = ("MessageRoute", "MessageRouter", "message_handler")
+
+# Name of the attribute `message_handler` stores the filters of a cog method under
+HANDLER_FILTERS = "__message_filters__"
+
+
+class MessageRoute:
+    """
+    A message handler along with the filters a message has to pass to reach it.
+
+    Handlers registered with a `pattern` are called with the match object as well as the message.
+    """
+
+    def __init__(
+        self,
+        callback: Callable,
+        *,
+        channels: Iterable[int] = None,
+        include_bots: bool = False,
+        prefixes: Iterable[str] = (),
+        pattern: Union[str, Pattern] = None,
+        flags: int = 0,
+    ):
+        self.callback = callback
+        self.name = getattr(callback, "__qualname__", repr(callback))
+        self.channels = frozenset(channels) if channels is not None else None
+        self.include_bots = include_bots
+        self.prefixes = tuple(prefixes)
+        self.pattern = re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+
+    def arguments(self, message: discord.Message) -> Optional[tuple]:
+        """Return the arguments to call the handler with for `message`, or None if it's filtered out."""
+        if message.author.bot and not self.include_bots:
+            return None
+        if self.prefixes and not message.content.startswith(self.prefixes):
+            return None
+        if self.pattern is None:
+            return (message,)
+
+        match = self.pattern.search(message.content)
+        return (message, match) if match else None
+
+
+class MessageRouter:
+    """
+    Delivers each message only to the handlers whose filters it can pass.
+
+    Handlers are indexed by the channels they listen in, so a message only has to be checked
+    against the handlers of its own channel and those listening everywhere. Matching handlers are
+    scheduled the same way as regular `on_message` listeners, including error handling.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._by_channel: Dict[int, List[MessageRoute]] = defaultdict(list)
+        self._any_channel: List[MessageRoute] = []
+        self._cog_routes: Dict[str, List[MessageRoute]] = {}
+
+        self.messages = 0
+        self.dispatches: Counter = Counter()
+
+    @property
+    def routes(self) -> List[MessageRoute]:
+        """Return every registered route."""
+        routes = list(self._any_channel)
+        for channel_routes in self._by_channel.values():
+            routes.extend(route for route in channel_routes if route not in routes)
+        return routes
+
+    def register(self, callback: Callable, **filters: Any) -> MessageRoute:
+        """Route messages passing `filters` to the coroutine function `callback`. See `MessageRoute`."""
+        route = MessageRoute(callback, **filters)
+        if route.channels is None:
+            self._any_channel.append(route)
+        else:
+            for channel_id in route.channels:
+                self._by_channel[channel_id].append(route)
+
+        log.trace(f"Registered message handler {route.name}")
+        return route
+
+    def unregister(self, route: MessageRoute):
+        """Stop routing messages to a handler."""
+        if route.channels is None:
+            self._any_channel.remove(route)
+            return
+
+        for channel_id in route.channels:
+            self._by_channel[channel_id].remove(route)
+            if not self._by_channel[channel_id]:
+                del self._by_channel[channel_id]
+
+    def register_cog(self, cog: commands.Cog):
+        """Register every method of `cog` decorated with `message_handler`."""
+        routes = []
+        for name, function in inspect.getmembers(type(cog), inspect.isfunction):
+            filters = getattr(function, HANDLER_FILTERS, None)
+            if filters is not None:
+                routes.append(self.register(getattr(cog, name), **filters))
+
+        if routes:
+            self._cog_routes[cog.qualified_name] = routes
+
+    def unregister_cog(self, cog: commands.Cog):
+        """Unregister the message handlers of `cog`."""
+        for route in self._cog_routes.pop(cog.qualified_name, ()):
+            self.unregister(route)
+
+    def dispatch(self, message: discord.Message):
+        """Schedule every handler whose filters `message` passes."""
+        self.messages += 1
+
+        candidates = self._any_channel
+        channel_routes = self._by_channel.get(message.channel.id)
+        if channel_routes:
+            candidates = channel_routes + candidates
+
+        for route in candidates:
+            arguments = route.arguments(message)
+            if arguments is None:
+                continue
+
+            self.dispatches[route.name] += 1
+            self.bot._schedule_event(route.callback, "on_message", *arguments)
+
+
+def message_handler(**filters: Any) -> Callable:
+    """
+    Mark a cog method as a handler for messages passing the given filters.
+
+    The filters are `channels`, `include_bots`, `prefixes`, and `pattern` with its `flags`, as
+    documented on `MessageRoute`. The handler is registered when its cog is added to the bot.
+    """
+    def decorator(function: Callable) -> Callable:
+        setattr(function, HANDLER_FILTERS, filters)
+        return function
+    return decorator
@@ -0,0 +1,249 @@
+import bisect
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterable, List, Optional
+
+from aiohttp import web
+from discord.ext.commands import Context
+
+from bot.utils.cache import caches
+
+log = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets in seconds, as exposed to Prometheus
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Number of recent latencies kept per command for calculating percentiles
+SAMPLE_SIZE = 1024
+
+
+class Invocation:
+    """Timings for a single command invocation in progress."""
+
+    def __init__(self, command: str):
+        self.command = command
+        self.start = time.perf_counter()
+        self.http_time = 0.0
+
+
+# The invocation being run by the current task, so time spent on HTTP requests can be attributed to it
+current_invocation: "ContextVar[Optional[Invocation]]" = ContextVar("current_invocation", default=None)
+
+
+def record_http_time(seconds: float):
+    """Attribute time spent waiting on an HTTP request to the command invocation of the current task."""
+    invocation = current_invocation.get()
+    if invocation is not None:
+        invocation.http_time += seconds
+
+
+class CommandStats:
+    """Latency histogram and counters for a single command."""
+
+    def __init__(self):
+        self.invocations = 0
+        self.errors = 0
+        self.latency_total = 0.0
+        self.http_time = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.samples: Deque[float] = deque(maxlen=SAMPLE_SIZE)
+
+    def record(self, latency: float, http_time: float):
+        """Record a completed invocation."""
+        self.invocations += 1
+        self.latency_total += latency
+        self.http_time += http_time
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.samples.append(latency)
+
+    def percentile(self, percent: float) -> float:
+        """Return the given percentile of the recent latencies in seconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    @property
+    def other_time(self) -> float:
+        """Return the time spent outside of HTTP requests, i.e. on CPU work and the Discord API."""
+        return max(0.0, self.latency_total - self.http_time)
+
+
+class CommandMetrics:
+    """
+    Per-command latency and throughput metrics, collected through the bot's global invoke hooks.
+
+    The time each invocation spends waiting on the shared HTTP client is tracked separately from
+    the rest of its run time, so slow external APIs can be told apart from slow processing.
+    """
+
+    def __init__(self):
+        self.commands: Dict[str, CommandStats] = {}
+
+    def _stats(self, command: str) -> CommandStats:
+        if command not in self.commands:
+            self.commands[command] = CommandStats()
+        return self.commands[command]
+
+    async def before_invoke(self, ctx: Context):
+        """Start timing an invocation, making it the current invocation for the rest of the task."""
+        ctx.invocation = Invocation(ctx.command.qualified_name)
+        current_invocation.set(ctx.invocation)
+
+    async def after_invoke(self, ctx: Context):
+        """Finish timing an invocation, whether it succeeded or not."""
+        invocation = getattr(ctx, "invocation", None)
+        if invocation is None:
+            return
+
+        latency = time.perf_counter() - invocation.start
+        self._stats(invocation.command).record(latency, invocation.http_time)
+        current_invocation.set(None)
+
+    def record_error(self, ctx: Context):
+        """Count an error raised by a command, including failed checks and bad arguments."""
+        if ctx.command is not None:
+            self._stats(ctx.command.qualified_name).errors += 1
+
+    def slowest(self, percent: float = 95) -> List[str]:
+        """Return the command names, ordered by the given latency percentile, slowest first."""
+        return sorted(self.commands, key=lambda name: self.commands[name].percentile(percent), reverse=True)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(bot) -> str:
+    """Render the bot's command, message, event loop, rendering, HTTP and cache metrics in Prometheus' text format."""
+    lines = []
+
+    def family(name: str, metric_type: str, description: str, samples: Iterable[str]):
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.extend(samples)
+
+    commands = sorted(bot.command_metrics.commands.items())
+
+    histogram = []
+    for name, stats in commands:
+        label = f'command="{_escape(name)}"'
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+            cumulative += count
+            histogram.append(f'seasonalbot_command_latency_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+        histogram.append(f'seasonalbot_command_latency_seconds_bucket{{{label},le="+Inf"}} {stats.invocations}')
+        histogram.append(f"seasonalbot_command_latency_seconds_sum{{{label}}} {stats.latency_total}")
+        histogram.append(f"seasonalbot_command_latency_seconds_count{{{label}}} {stats.invocations}")
+    family("seasonalbot_command_latency_seconds", "histogram", "Command latency.", histogram)
+
+    family("seasonalbot_command_errors_total", "counter", "Command errors.", (
+        f'seasonalbot_command_errors_total{{command="{_escape(name)}"}} {stats.errors}' for name, stats in commands
+    ))
+    family("seasonalbot_command_http_seconds_total", "counter", "Time commands spent waiting on HTTP.", (
+        f'seasonalbot_command_http_seconds_total{{command="{_escape(name)}"}} {stats.http_time}'
+        for name, stats in commands
+    ))
+
+    router = bot.message_router
+    family("seasonalbot_messages_routed_total", "counter", "Messages passed to the message router.", (
+        f"seasonalbot_messages_routed_total {router.messages}",
+    ))
+    family("seasonalbot_message_handler_dispatches_total", "counter", "Messages dispatched to each handler.", (
+        f'seasonalbot_message_handler_dispatches_total{{handler="{_escape(name)}"}} {count}'
+        for name, count in sorted(router.dispatches.items())
+    ))
+
+    monitor = bot.loop_monitor
+    histogram = []
+    cumulative = 0
+    for bound, count in zip(monitor.bounds, monitor.buckets):
+        cumulative += count
+        histogram.append(f'seasonalbot_event_loop_lag_seconds_bucket{{le="{bound}"}} {cumulative}')
+    histogram.append(f'seasonalbot_event_loop_lag_seconds_bucket{{le="+Inf"}} {sum(monitor.buckets)}')
+    histogram.append(f"seasonalbot_event_loop_lag_seconds_sum {monitor.lag_total}")
+    histogram.append(f"seasonalbot_event_loop_lag_seconds_count {sum(monitor.buckets)}")
+    family("seasonalbot_event_loop_lag_seconds", "histogram", "Event loop scheduling delay.", histogram)
+
+    family("seasonalbot_event_loop_blocked_seconds_total", "counter", "Time loop steps blocked the event loop for.", (
+        f'seasonalbot_event_loop_blocked_seconds_total{{location="{_escape(offender.location)}"}} {offender.total}'
+        for offender in monitor.worst_offenders()
+    ))
+
+    renders = sorted(bot.renderer.stats.items())
+    for metric, description in (
+        ("jobs", "Images rendered."),
+        ("errors", "Render jobs which raised an error."),
+        ("timeouts", "Render jobs which timed out."),
+        ("rejected", "Render jobs rejected because the queue was full."),
+        ("render_time", "Time spent rendering images in worker processes."),
+        ("wait_time", "Time render jobs spent queued or being passed to and from workers."),
+    ):
+        name = f"seasonalbot_render_{metric}_total"
+        family(name, "counter", description, (
+            f'{name}{{job="{_escape(job)}"}} {getattr(stats, metric)}' for job, stats in renders
+        ))
+    family("seasonalbot_render_jobs_pending", "gauge", "Render jobs queued or being rendered.", (
+        f"seasonalbot_render_jobs_pending {bot.renderer.pending}",
+    ))
+
+    hosts = sorted(bot.http_client.metrics.items())
+    for metric, description in (
+        ("requests", "HTTP requests made."),
+        ("errors", "HTTP requests which failed to connect or timed out."),
+        ("retries", "HTTP requests retried."),
+        ("handshakes", "New HTTP connections opened."),
+        ("connections_reused", "Pooled HTTP connections reused."),
+        ("bytes_received", "HTTP response bytes received."),
+    ):
+        name = f"seasonalbot_http_{metric}_total"
+        family(name, "counter", description, (
+            f'{name}{{host="{_escape(host)}"}} {getattr(host_metrics, metric)}' for host, host_metrics in hosts
+        ))
+
+    for metric, description in (
+        ("hits", "Cache hits."),
+        ("negative_hits", "Negative cache hits."),
+        ("misses", "Cache misses."),
+        ("coalesced", "Cache misses coalesced into an in-flight request."),
+        ("evictions", "Cache entries evicted."),
+    ):
+        name = f"seasonalbot_cache_{metric}_total"
+        family(name, "counter", description, (
+            f'{name}{{cache="{_escape(cache_name)}"}} {getattr(cache, metric)}'
+            for cache_name, cache in sorted(caches.items())
+        ))
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """A small local HTTP server exposing the bot's metrics to Prometheus at `/metrics`."""
+
+    def __init__(self, bot, host: str, port: int):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=render_prometheus(self.bot), content_type="text/plain")
+
+    async def start(self):
+        """Start serving the metrics."""
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        log.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        """Stop serving the metrics."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,125 @@
+import datetime
+import json
+import logging
+import os
+import resource
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+log = logging.getLogger(__name__)
+
+REPORT_FILE = Path("bot/log/startup_profile.json")
+
+
+def resident_memory() -> int:
+    """Return the resident set size of the process in bytes, falling back to the peak RSS."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is reported in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class ExtensionProfile:
+    """Timings and memory usage recorded while loading a single extension."""
+
+    def __init__(self, extension: str):
+        self.extension = extension
+        self.import_time = 0.0
+        self.setup_time = 0.0
+        self.memory_delta = 0
+
+        self._start = time.perf_counter()
+        self._imported = None
+
+    def imported(self):
+        """Mark the end of the import phase, with everything after it counted as setup."""
+        self._imported = time.perf_counter()
+        self.import_time = self._imported - self._start
+
+    def finish(self):
+        """Mark the end of the setup phase."""
+        end = time.perf_counter()
+        if self._imported is None:
+            self.import_time = end - self._start
+        else:
+            self.setup_time = end - self._imported
+
+    @property
+    def total_time(self) -> float:
+        """Return the time spent importing and setting up the extension in seconds."""
+        return self.import_time + self.setup_time
+
+    def to_dict(self) -> dict:
+        """Return the profile as a JSON-serializable dict."""
+        return {
+            "extension": self.extension,
+            "import_ms": round(self.import_time * 1000, 2),
+            "setup_ms": round(self.setup_time * 1000, 2),
+            "total_ms": round(self.total_time * 1000, 2),
+            "memory_delta_kb": self.memory_delta // 1024,
+        }
+
+
+class StartupProfiler:
+    """
+    An opt-in profiler for the time and memory spent loading the bot's extensions.
+
+    Each extension is profiled in two phases: importing the module, which includes any resources it
+    loads at import time, and running its `setup()` function, which includes the cog's `__init__`.
+    The report is sorted by the slowest extensions first and can be saved as JSON, so it can be
+    compared between releases.
+    """
+
+    def __init__(self, report_file: Path = REPORT_FILE):
+        self.report_file = report_file
+        self.started = datetime.datetime.utcnow()
+        self.profiles: Dict[str, ExtensionProfile] = {}
+
+        self._start_memory = resident_memory()
+        self._start = time.perf_counter()
+        self.ready_time = None
+
+    @contextmanager
+    def profile(self, extension: str) -> Iterator[ExtensionProfile]:
+        """Profile the loading of `extension` for the duration of the block."""
+        memory_before = resident_memory()
+        profile = ExtensionProfile(extension)
+        try:
+            yield profile
+        finally:
+            profile.finish()
+            profile.memory_delta = resident_memory() - memory_before
+            self.profiles[extension] = profile
+            log.debug(
+                f"Profiled {extension}: import {profile.import_time * 1000:.1f}ms, "
+                f"setup {profile.setup_time * 1000:.1f}ms, memory {profile.memory_delta // 1024:+}KB"
+            )
+
+    def mark_ready(self):
+        """Record how long it took from enabling the profiler until the first season finished loading."""
+        if self.ready_time is None:
+            self.ready_time = time.perf_counter() - self._start
+
+    def report(self) -> List[ExtensionProfile]:
+        """Return the extension profiles, slowest first."""
+        return sorted(self.profiles.values(), key=lambda profile: profile.total_time, reverse=True)
+
+    def to_dict(self) -> dict:
+        """Return the full report as a JSON-serializable dict."""
+        return {
+            "started": self.started.isoformat(),
+            "ready_ms": round(self.ready_time * 1000, 2) if self.ready_time is not None else None,
+            "memory_delta_kb": (resident_memory() - self._start_memory) // 1024,
+            "extensions": [profile.to_dict() for profile in self.report()],
+        }
+
+    def save(self):
+        """Write the report to the report file."""
+        self.report_file.parent.mkdir(parents=True, exist_ok=True)
+        with self.report_file.open("w", encoding="utf8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        log.info(f"Startup profile written to {self.report_file}")
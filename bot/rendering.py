@@ -0,0 +1,293 @@
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from bot.utils.cache import AsyncCache
+
+log = logging.getLogger(__name__)
+
+__all__ = ("RenderCache", "RenderEngine", "RenderError", "RenderQueueFull", "RenderTimeout")
+
+SPILL_DIR = Path("bot/resources/persist/render_cache")
+
+# Rendered images only depend on their key, so they never go stale
+RENDER_CACHE_TTL = 24 * 60 * 60
+
+
+class RenderError(Exception):
+    """An image couldn't be rendered. The message is suitable for showing to the user."""
+
+
+class RenderQueueFull(RenderError):
+    """Too many images are already waiting to be rendered."""
+
+
+class RenderTimeout(RenderError):
+    """An image took too long to render."""
+
+
+class RenderJob(NamedTuple):
+    """
+    A picklable description of an image to render.
+
+    `function` has to be defined at the top level of a module so it can be pickled by reference. It
+    should take plain data, like image bytes, numbers and strings, and return the encoded image.
+    """
+
+    function: Callable[..., bytes]
+    args: tuple
+    kwargs: Dict[str, Any]
+
+    @property
+    def name(self) -> str:
+        """Return the qualified name of the job's function."""
+        return f"{self.function.__module__}.{self.function.__qualname__}"
+
+
+def _run_job(job: RenderJob) -> Tuple[bytes, float]:
+    """Run a job in a worker process, returning the encoded image and the seconds it took to render."""
+    start = time.perf_counter()
+    data = job.function(*job.args, **job.kwargs)
+    return data, time.perf_counter() - start
+
+
+class RenderStats:
+    """Counters and timings for a single kind of render job."""
+
+    def __init__(self):
+        self.jobs = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.render_time = 0.0
+        self.wait_time = 0.0
+
+
+class RenderEngine:
+    """
+    Renders images in a pool of worker processes, keeping CPU heavy image work off the event loop.
+
+    At most `max_queue` jobs are accepted at once, including the ones being rendered; any more are
+    rejected with `RenderQueueFull`. A job which doesn't finish within its timeout raises
+    `RenderTimeout`. If it had already started it still runs to completion in its worker, and keeps
+    its place in the queue until then, so runaway jobs can't pile up.
+    """
+
+    def __init__(self, workers: int, max_queue: int, timeout: float):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        self.pending = 0
+        self.stats: Dict[str, RenderStats] = defaultdict(RenderStats)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Return the process pool, creating it if it doesn't exist yet or the previous one broke."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def warm_up(self):
+        """
+        Start every worker process ahead of the first job.
+
+        This should be done before the bot starts any threads, so the workers are forked from a
+        process without any locks held by other threads.
+        """
+        loop = asyncio.get_event_loop()
+        pids = await asyncio.gather(*(loop.run_in_executor(self.executor, os.getpid) for _ in range(self.workers)))
+        log.info(f"Started {len(set(pids))} image rendering workers")
+
+    def _release(self):
+        self.pending -= 1
+
+    def _reset(self):
+        """Throw away a broken process pool, so the next job starts a new one."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def render(self, function: Callable[..., bytes], *args, timeout: float = None, **kwargs) -> bytes:
+        """
+        Render an image by calling `function` with the given arguments in a worker process.
+
+        Exceptions raised by `function` are re-raised here, and `RenderError` is raised if the
+        job couldn't be run at all.
+        """
+        job = RenderJob(function, args, kwargs)
+        stats = self.stats[job.name]
+
+        if self.pending >= self.max_queue:
+            stats.rejected += 1
+            log.warning(f"Rejected render job {job.name}: {self.pending} jobs already pending")
+            raise RenderQueueFull("Too many images are being drawn right now, please try again in a moment.")
+
+        loop = asyncio.get_event_loop()
+        try:
+            future = self.executor.submit(_run_job, job)
+        except BrokenProcessPool:
+            self._reset()
+            future = self.executor.submit(_run_job, job)
+
+        self.pending += 1
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+
+        start = time.perf_counter()
+        try:
+            data, render_time = await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            log.warning(f"Render job {job.name} timed out after {timeout or self.timeout}s")
+            raise RenderTimeout("Drawing your image took too long, please try again later.") from None
+        except BrokenProcessPool:
+            stats.errors += 1
+            log.error(f"A rendering worker died while running {job.name}, restarting the pool")
+            self._reset()
+            raise RenderError("Something went wrong while drawing your image, please try again.") from None
+        except Exception:
+            stats.errors += 1
+            raise
+
+        stats.jobs += 1
+        stats.render_time += render_time
+        stats.wait_time += max(0.0, time.perf_counter() - start - render_time)
+        return data
+
+    def close(self):
+        """Shut down the worker processes, without waiting for any jobs still running."""
+        self._reset()
+
+
+def _delete_file(path: Path):
+    """Delete a file, if it exists."""
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class RenderCache:
+    """
+    Caches the images rendered by deterministic commands, so repeating a command skips rendering it.
+
+    Keys should identify the command along with everything its output depends on, like the avatar
+    hash and normalized arguments; commands with random output shouldn't use the cache. Images are
+    kept in memory up to `max_bytes` in total, least recently used first out. With a `spill_bytes`
+    budget, evicted images are written to `spill_dir` and read back from there on their next use,
+    until the files take up more than that budget. The spill directory is emptied on startup.
+    """
+
+    def __init__(self, max_bytes: int, spill_bytes: int = 0, spill_dir: Path = SPILL_DIR):
+        self.memory = AsyncCache(
+            "rendered images",
+            ttl=RENDER_CACHE_TTL,
+            max_entries=1024,
+            max_bytes=max_bytes,
+            sizeof=len,
+            on_evict=self._spill if spill_bytes else None,
+        )
+        self.spill_bytes = spill_bytes
+        self.spill_dir = spill_dir
+        self.spill_hits = 0
+
+        # File names of the spilled images along with their sizes, oldest first
+        self._spilled: "OrderedDict[str, int]" = OrderedDict()
+        self._spilled_size = 0
+        # The latest file operation scheduled for each spilled image which hasn't finished yet
+        self._pending: Dict[str, asyncio.Future] = {}
+
+        if spill_bytes:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+            spill_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _file_name(key: Hashable) -> str:
+        return hashlib.sha256(repr(key).encode("utf-8")).hexdigest() + ".png"
+
+    def _schedule(self, name: str, operation: Callable[[Path], Any]) -> asyncio.Future:
+        """
+        Run a blocking file operation on a spilled image in the background, returning its future.
+
+        Operations on the same file run in the order they were scheduled, so an image is never read
+        or deleted before it has been written. Any exception is logged as well as set on the future.
+        """
+        previous = self._pending.get(name)
+
+        async def run() -> Any:
+            if previous is not None:
+                await asyncio.wait([previous])
+            return await asyncio.get_event_loop().run_in_executor(None, operation, self.spill_dir / name)
+
+        def finished(task: asyncio.Future):
+            if self._pending.get(name) is task:
+                del self._pending[name]
+            if not task.cancelled() and task.exception() is not None:
+                log.error(f"Failed to update the spilled image {name}", exc_info=task.exception())
+
+        task = asyncio.ensure_future(run())
+        self._pending[name] = task
+        task.add_done_callback(finished)
+        return task
+
+    def _spill(self, key: Hashable, data: bytes):
+        """Write an image evicted from memory to the spill directory, in the background."""
+        name = self._file_name(key)
+        if name in self._spilled or len(data) > self.spill_bytes:
+            return
+
+        self._spilled[name] = len(data)
+        self._spilled_size += len(data)
+
+        while self._spilled_size > self.spill_bytes:
+            oldest, size = self._spilled.popitem(last=False)
+            self._spilled_size -= size
+            self._schedule(oldest, _delete_file)
+
+        def write(path: Path):
+            # Written under a temporary name first, so a half written image is never read back
+            temp_path = path.with_name(f"{path.name}.tmp")
+            temp_path.write_bytes(data)
+            temp_path.replace(path)
+
+        self._schedule(name, write)
+
+    async def _read_spilled(self, key: Hashable) -> Optional[bytes]:
+        """Take an image back out of the spill directory, returning None if it wasn't spilled."""
+        name = self._file_name(key)
+        size = self._spilled.pop(name, None)
+        if size is None:
+            return None
+        self._spilled_size -= size
+
+        def read(path: Path) -> bytes:
+            data = path.read_bytes()
+            _delete_file(path)
+            return data
+
+        try:
+            # Shielded so a cancelled command doesn't leave the file behind half way through
+            return await asyncio.shield(self._schedule(name, read))
+        except OSError:
+            # Already logged, the image will just be rendered again
+            return None
+
+    async def get_or_render(self, key: Hashable, render: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Return the image cached under `key`, calling `render` to render it on a miss."""
+        async def fetch() -> bytes:
+            data = await self._read_spilled(key)
+            if data is not None:
+                self.spill_hits += 1
+                return data
+            return await render()
+
+        return await self.memory.get_or_fetch(key, fetch)
@@ -0,0 +1,384 @@
+"""
+Offline gateway replay harness for benchmarking the bot's event listeners.
+
+Loads the given extensions into the real bot without connecting to Discord, then feeds a stream of
+gateway events through discord.py's own parsers, exactly as if they had arrived over the websocket.
+Every REST call the listeners make is answered by a stub and counted instead of being sent.
+
+    python -m bot.replay --season halloween --events 10000 --rate 500
+    python -m bot.replay bot.seasons.easter.egghead_quiz --recording events.jsonl
+
+Recordings are JSON lines of gateway dispatch payloads, as received by `on_socket_response`:
+`{"t": "MESSAGE_CREATE", "d": {...}}`. Without a recording, a synthetic stream of messages and
+reactions from fake members across the event channels is generated.
+
+Listeners run for real, so anything they persist locally, like the egg hunt database, is written to.
+"""
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import logging
+import pkgutil
+import random
+import time
+import types
+from collections import Counter
+from pathlib import Path
+from typing import Any, Coroutine, Dict, Iterable, Iterator, List, Set
+
+import discord
+from discord.http import Route
+
+from bot.constants import Channels, Client, Roles, bot
+
+log = logging.getLogger(__name__)
+
+# Building blocks of the synthetic event stream
+SYNTHETIC_WORDS = (
+    "hello", "python", "discord", "bot", "egg", "candy", "code", "help", "spooky", "skeleton",
+    "pumpkin", "halloween", "doot", "snake", "easter", "love", "season", "the", "a", "is",
+)
+SYNTHETIC_EMOJIS = ("\N{CANDY}", "\N{SKULL}", "\N{THUMBS UP SIGN}", "\N{JACK-O-LANTERN}", "\N{EGG}")
+SYNTHETIC_CHANNELS = (
+    Channels.seasonalbot_chat, Channels.off_topic_0, Channels.off_topic_1, Channels.off_topic_2,
+    Channels.python_discussion, Channels.seasonalbot_commands,
+)
+
+BOT_USER_ID = 10 ** 17
+MEMBER_ID_START = 2 * 10 ** 17
+
+_snowflakes = itertools.count(3 * 10 ** 17)
+
+
+def snowflake() -> str:
+    """Return a new unique ID, as a string like the gateway sends them."""
+    return str(next(_snowflakes))
+
+
+def user_payload(user_id: int, *, is_bot: bool = False) -> dict:
+    """Build a gateway user object."""
+    return {"id": str(user_id), "username": f"user{user_id % 10000}", "discriminator": "0001", "avatar": None,
+            "bot": is_bot}
+
+
+def message_payload(channel_id: int, author_id: int, content: str = "", *, is_bot: bool = False, **extra) -> dict:
+    """Build a gateway message object, as sent with `MESSAGE_CREATE` and returned by the REST API."""
+    payload = {
+        "id": snowflake(),
+        "channel_id": str(channel_id),
+        "guild_id": str(Client.guild),
+        "author": user_payload(author_id, is_bot=is_bot),
+        "member": {"roles": [], "joined_at": None, "deaf": False, "mute": False},
+        "content": content,
+        "timestamp": datetime.datetime.utcnow().isoformat(),
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+    }
+    payload.update(extra)
+    return payload
+
+
+def guild_payload(channel_ids: Iterable[int], member_ids: Iterable[int]) -> dict:
+    """Build a `GUILD_CREATE` payload for the bot's guild, with every configured channel and role."""
+    role_ids = {Client.guild} | {role for role in Roles.__dict__.values() if isinstance(role, int)}
+    member_ids = sorted(set(member_ids) | {BOT_USER_ID})
+    return {
+        "id": str(Client.guild),
+        "name": "Replay Guild",
+        "owner_id": str(MEMBER_ID_START),
+        "member_count": len(member_ids),
+        "roles": [
+            {"id": str(role_id), "name": str(role_id), "permissions": 0, "position": 0, "color": 0}
+            for role_id in sorted(role_ids)
+        ],
+        "channels": [
+            {"id": str(channel_id), "type": 0, "name": str(channel_id), "position": position}
+            for position, channel_id in enumerate(sorted(set(channel_ids)))
+        ],
+        "members": [
+            {"user": user_payload(member_id, is_bot=member_id == BOT_USER_ID), "roles": [], "joined_at": None}
+            for member_id in member_ids
+        ],
+    }
+
+
+class ListenerStats:
+    """Calls and time spent running a single listener."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cpu_time = 0.0
+        self.busy_time = 0.0
+
+
+@types.coroutine
+def measure(coro: Coroutine, stats: ListenerStats) -> Any:
+    """
+    Run `coro`, adding the CPU and wall time of each of its steps to `stats`.
+
+    Time spent suspended, waiting on sleeps or other tasks, is not counted, so this is the time
+    the listener itself held the event loop for.
+    """
+    value, error = None, None
+    while True:
+        cpu_start, busy_start = time.thread_time(), time.perf_counter()
+        try:
+            yielded = coro.throw(error) if error is not None else coro.send(value)
+        except StopIteration as e:
+            return e.value
+        finally:
+            stats.cpu_time += time.thread_time() - cpu_start
+            stats.busy_time += time.perf_counter() - busy_start
+
+        value, error = None, None
+        try:
+            value = yield yielded
+        except GeneratorExit:
+            coro.close()
+            raise
+        except BaseException as e:  # noqa: B036 - thrown into the listener, which may handle it
+            error = e
+
+
+class StubREST:
+    """Answers discord.py's REST requests locally, counting them by route."""
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+
+    async def request(self, route: Route, **kwargs) -> Any:
+        """Count the request and return a minimal response the calling code can work with."""
+        self.calls[f"{route.method} {route.path}"] += 1
+
+        if route.path == "/channels/{channel_id}/messages" and route.method == "POST":
+            data = kwargs.get("json") or {}
+            embeds = [data["embed"]] if data.get("embed") else []
+            return message_payload(route.channel_id, BOT_USER_ID, data.get("content") or "", is_bot=True, embeds=embeds)
+        if route.path == "/channels/{channel_id}/messages/{message_id}" and route.method in ("GET", "PATCH"):
+            return message_payload(route.channel_id, BOT_USER_ID, is_bot=True, id=route.url.rsplit("/", 1)[-1])
+        if route.method == "GET":
+            return []
+        return None
+
+
+class ReplayHarness:
+    """Feeds gateway events through the bot's listeners with the REST API stubbed out."""
+
+    def __init__(self, extensions: List[str]):
+        self.extensions = extensions
+        self.rest = StubREST()
+        self.listeners: Dict[str, ListenerStats] = {}
+        self.tasks: Set[asyncio.Future] = set()
+        self.events = 0
+        self.elapsed = 0.0
+
+    def _schedule_event(self, coro, event_name: str, *args, **kwargs) -> asyncio.Future:
+        """Replacement for the bot's `_schedule_event`, timing the listener it runs."""
+        name = getattr(coro, "__qualname__", repr(coro))
+        stats = self.listeners.setdefault(name, ListenerStats())
+        stats.calls += 1
+
+        async def timed_listener(*listener_args, **listener_kwargs):
+            try:
+                await measure(coro(*listener_args, **listener_kwargs), stats)
+            except Exception:
+                stats.errors += 1
+                raise
+
+        task = self._original_schedule_event(timed_listener, event_name, *args, **kwargs)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def setup(self, channel_ids: Iterable[int], member_ids: Iterable[int]):
+        """Populate the bot's cache with a fake guild, stub the REST API, and load the extensions."""
+        state = bot._connection
+        state.user = discord.ClientUser(state=state, data=user_payload(BOT_USER_ID, is_bot=True))
+        state._add_guild_from_data(guild_payload(channel_ids, member_ids))
+
+        bot.http.request = self.rest.request
+        self._original_schedule_event = bot._schedule_event
+        bot._schedule_event = self._schedule_event
+
+        for extension in self.extensions:
+            bot.load_extension(extension)
+        log.info(f"Loaded {len(self.extensions)} extensions for replay")
+
+    async def replay(self, events: Iterable[dict], rate: float = 0, drain_timeout: float = 5):
+        """
+        Dispatch each gateway event, at `rate` events per second or as fast as possible if 0.
+
+        The clock stops once every listener task has finished, or after `drain_timeout` seconds,
+        whichever is first. Listener tasks still running then are cancelled.
+        """
+        parsers = bot._connection.parsers
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+
+        for event in events:
+            if rate:
+                await asyncio.sleep(max(0.0, start + self.events / rate - loop.time()))
+            else:
+                await asyncio.sleep(0)
+
+            parser = parsers.get(event["t"])
+            if parser is None:
+                log.debug(f"Skipping unknown event {event['t']}")
+                continue
+            parser(event["d"])
+            self.events += 1
+
+        if self.tasks:
+            await asyncio.wait(list(self.tasks), timeout=drain_timeout)
+        self.elapsed = loop.time() - start
+
+        for task in list(self.tasks):
+            task.cancel()
+
+    def report(self) -> dict:
+        """Return the throughput, per-listener timings, and REST calls of the replay."""
+        return {
+            "events": self.events,
+            "seconds": round(self.elapsed, 3),
+            "events_per_second": round(self.events / self.elapsed, 1) if self.elapsed else 0.0,
+            "still_running": len(self.tasks),
+            "listeners": {
+                name: {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "cpu_ms": round(stats.cpu_time * 1000, 3),
+                    "busy_ms": round(stats.busy_time * 1000, 3),
+                    "busy_us_per_call": round(stats.busy_time * 1e6 / stats.calls, 1),
+                }
+                for name, stats in sorted(self.listeners.items(), key=lambda item: item[1].busy_time, reverse=True)
+            },
+            "rest_calls": dict(self.rest.calls.most_common()),
+        }
+
+
+def synthetic_events(count: int, members: int, reaction_ratio: float, seed: int = None) -> Iterator[dict]:
+    """Generate `count` message and reaction events from `members` fake members across the event channels."""
+    rng = random.Random(seed)
+    member_ids = range(MEMBER_ID_START, MEMBER_ID_START + members)
+    recent: List[dict] = []
+
+    for _ in range(count):
+        if recent and rng.random() < reaction_ratio:
+            message = rng.choice(recent)
+            yield {"t": "MESSAGE_REACTION_ADD", "d": {
+                "user_id": str(rng.choice(member_ids)),
+                "channel_id": message["channel_id"],
+                "message_id": message["id"],
+                "guild_id": str(Client.guild),
+                "emoji": {"id": None, "name": rng.choice(SYNTHETIC_EMOJIS), "animated": False},
+            }}
+            continue
+
+        content = " ".join(rng.choice(SYNTHETIC_WORDS) for _ in range(rng.randint(1, 12)))
+        message = message_payload(rng.choice(SYNTHETIC_CHANNELS), rng.choice(member_ids), content)
+        recent = (recent + [message])[-50:]
+        yield {"t": "MESSAGE_CREATE", "d": message}
+
+
+def recorded_events(path: Path) -> List[dict]:
+    """Load a recording of gateway dispatch payloads, moving them all into the bot's guild."""
+    events = []
+    with path.open(encoding="utf8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            if event.get("d") and "guild_id" in event["d"]:
+                event["d"]["guild_id"] = str(Client.guild)
+            events.append(event)
+    return events
+
+
+def season_extensions(season: str) -> List[str]:
+    """Return the extensions of a season, the same way the season manager finds them."""
+    path = Path("bot/seasons") / season
+    return [f"bot.seasons.{season}.{module.name}" for module in pkgutil.iter_modules([str(path)])]
+
+
+def print_report(report: dict):
+    """Print the replay report as human readable tables."""
+    print(
+        f"Replayed {report['events']} events in {report['seconds']}s "
+        f"({report['events_per_second']} events/sec), {report['still_running']} listeners cancelled at the end\n"
+    )
+
+    print(f"{'Listener':<45} {'Calls':>8} {'Errors':>7} {'CPU ms':>10} {'Busy ms':>10} {'us/call':>9}")
+    for name, stats in report["listeners"].items():
+        print(
+            f"{name:<45} {stats['calls']:>8} {stats['errors']:>7} {stats['cpu_ms']:>10.1f} "
+            f"{stats['busy_ms']:>10.1f} {stats['busy_us_per_call']:>9.1f}"
+        )
+
+    print(f"\n{'REST route':<80} {'Calls':>8}")
+    for route, calls in report["rest_calls"].items():
+        print(f"{route:<80} {calls:>8}")
+
+
+def main():
+    """Parse the command line arguments and run the replay."""
+    parser = argparse.ArgumentParser(description="Replay gateway events through the bot's listeners offline.")
+    parser.add_argument("extensions", nargs="*", help="extensions to load, e.g. bot.seasons.halloween.spookyreact")
+    parser.add_argument("--season", action="append", default=[], help="load every extension of this season")
+    parser.add_argument("--recording", type=Path, help="JSON lines file of recorded gateway dispatch payloads")
+    parser.add_argument("--events", type=int, default=10000, help="number of synthetic events to generate")
+    parser.add_argument("--members", type=int, default=200, help="number of synthetic members")
+    parser.add_argument("--reactions", type=float, default=0.2, help="fraction of synthetic events which are reactions")
+    parser.add_argument("--seed", type=int, help="random seed for the synthetic stream")
+    parser.add_argument("--rate", type=float, default=0, help="events per second to replay at, 0 for unthrottled")
+    parser.add_argument("--drain-timeout", type=float, default=5, help="seconds to wait for listeners to finish")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    extensions = args.extensions + [ext for season in args.season for ext in season_extensions(season)]
+    if not extensions:
+        parser.error("no extensions given")
+
+    member_ids = set(range(MEMBER_ID_START, MEMBER_ID_START + args.members))
+    channel_ids = {channel for channel in Channels.__dict__.values() if isinstance(channel, int)}
+    if args.recording:
+        events = recorded_events(args.recording)
+        for event in events:
+            data = event.get("d") or {}
+            if "channel_id" in data:
+                channel_ids.add(int(data["channel_id"]))
+            for key in ("author", "user"):
+                if key in data:
+                    member_ids.add(int(data[key]["id"]))
+            if "user_id" in data:
+                member_ids.add(int(data["user_id"]))
+    else:
+        events = synthetic_events(args.events, args.members, args.reactions, args.seed)
+
+    harness = ReplayHarness(extensions)
+
+    async def run():
+        harness.setup(channel_ids, member_ids)
+        await harness.replay(events, args.rate, args.drain_timeout)
+
+    bot.loop.run_until_complete(run())
+    bot.loop.run_until_complete(bot.http_client.close())
+
+    report = harness.report()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+import logging
+
+from bot.seasons.christmas.adventofcode.cog import AdventOfCode
+
+log = logging.getLogger(__name__)
+
+
+def setup(bot):
+    """Advent of Code Cog load."""
+    bot.add_cog(AdventOfCode(bot))
+    log.info("AdventOfCode cog loaded")
@@ -0,0 +1,240 @@
+"""
+Benchmarks for building the Advent of Code leaderboards, against the way they used to be built.
+
+Run with `pipenv run benchmark-aoc [private|global]`.
+"""
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from bs4 import BeautifulSoup
+
+from bot.constants import AdventOfCode as AocConfig
+from bot.seasons.christmas.adventofcode.cog import AocGlobalLeaderboard, AocPrivateLeaderboard
+
+
+class ListMember:
+    """A private leaderboard member with its starboard as lists, the way AocMember used to store it."""
+
+    def __init__(self, name: str, aoc_id: int, stars: int, starboard: list, local_score: int, global_score: int):
+        self.name = name
+        self.aoc_id = aoc_id
+        self.stars = stars
+        self.starboard = starboard
+        self.local_score = local_score
+        self.global_score = global_score
+        self.completions = self._completions_from_starboard(self.starboard)
+
+    @classmethod
+    def member_from_json(cls, injson: dict) -> "ListMember":
+        """Generate a member from AoC's private leaderboard API JSON."""
+        return cls(
+            name=injson["name"] if injson["name"] else "Anonymous User",
+            aoc_id=int(injson["id"]),
+            stars=injson["stars"],
+            starboard=cls._starboard_from_json(injson["completion_day_level"]),
+            local_score=injson["local_score"],
+            global_score=injson["global_score"],
+        )
+
+    @staticmethod
+    def _starboard_from_json(injson: dict) -> list:
+        if not isinstance(injson, dict):
+            raise ValueError
+
+        starboard = []
+        for _i in range(25):
+            starboard.append([False, False])
+
+        for day in injson:
+            idx = int(day) - 1
+            if "2" in injson[day].keys():
+                starboard[idx] = [True, True]
+            else:
+                starboard[idx] = [True, False]
+
+        return starboard
+
+    @staticmethod
+    def _completions_from_starboard(starboard: list) -> tuple:
+        completions = [0, 0]
+        for day in starboard:
+            if day[0]:
+                completions[0] += 1
+            if day[1]:
+                completions[1] += 1
+
+        return tuple(completions)
+
+
+class ListLeaderboard:
+    """A private leaderboard counting its daily completions member by member, the way it used to."""
+
+    def __init__(self, members: List[ListMember]):
+        self.members = members
+        self.daily_completion_summary = self.calculate_daily_completion()
+
+    @classmethod
+    def from_json(cls, injson: dict) -> "ListLeaderboard":
+        """Generate the leaderboard from AoC's private leaderboard API JSON."""
+        members = [ListMember.member_from_json(injson["members"][member]) for member in injson["members"]]
+        members.sort(key=lambda x: x.local_score, reverse=True)
+        return cls(members)
+
+    def calculate_daily_completion(self) -> List[tuple]:
+        """Return the number of members who completed each part of each day's puzzle."""
+        daily_member_completions = []
+        for day in range(25):
+            one_star_count = 0
+            two_star_count = 0
+            for member in self.members:
+                if member.starboard[day][1]:
+                    one_star_count += 1
+                    two_star_count += 1
+                elif member.starboard[day][0]:
+                    one_star_count += 1
+            else:
+                daily_member_completions.append((one_star_count, two_star_count))
+
+        return daily_member_completions
+
+
+def fake_leaderboard_json(members: int) -> dict:
+    """Generate the API JSON of a private leaderboard whose members drop out of the event as the days go by."""
+    members_json = {}
+    for member_id in range(members):
+        days = {}
+        for day in range(1, random.randint(0, 25) + 1):
+            if random.random() < 0.1:
+                continue
+            parts = ("1", "2") if random.random() < 0.85 else ("1",)
+            days[str(day)] = {part: {"get_star_ts": "1543640000"} for part in parts}
+        members_json[str(member_id)] = {
+            "id": str(member_id),
+            "name": f"Member {member_id}",
+            "stars": sum(len(parts) for parts in days.values()),
+            "completion_day_level": days,
+            "local_score": random.randint(0, 10000),
+            "global_score": 0,
+        }
+    return {"owner_id": 0, "event": str(AocConfig.year), "members": members_json}
+
+
+def benchmark_private(members: int, runs: int):
+    """
+    Print how long building a private leaderboard from its API JSON takes, with lists and with bitmasks.
+
+    Both build the sorted members and the daily completion summary. The bitmask leaderboard also
+    builds its member index.
+    """
+    injson = fake_leaderboard_json(members)
+    lists, bitmasks = ListLeaderboard.from_json(injson), AocPrivateLeaderboard.from_json(injson)
+    if lists.daily_completion_summary != bitmasks.daily_completion_summary:
+        raise RuntimeError("The daily completion summaries don't match")
+    if [member.completions for member in lists.members] != [member.completions for member in bitmasks.members]:
+        raise RuntimeError("The members' completions don't match")
+
+    timings = {}
+    for name, build in (("lists", ListLeaderboard.from_json), ("bitmasks", AocPrivateLeaderboard.from_json)):
+        start = time.perf_counter()
+        for _ in range(runs):
+            build(injson)
+        timings[name] = (time.perf_counter() - start) / runs
+
+    for name, timing in timings.items():
+        print(f"{name}: {timing * 1000:.2f}ms per leaderboard")
+    print(f"{members} members, {timings['lists'] / timings['bitmasks']:.1f}x faster")
+
+
+def global_leaderboard_from_soup(raw_html: str) -> List[tuple]:
+    """Parse a global leaderboard the way it was parsed before it was streamed, to benchmark against."""
+    soup = BeautifulSoup(raw_html, "html.parser")
+    lb_list = []
+    for entry in soup.find_all("div", class_="leaderboard-entry"):
+        raw_str = entry.text.replace("(AoC++)", "").rstrip()
+        r = re.match(r"(?:[ ]{,2}(\d+)\))?[ ]+(\d+)\s+([\w\(\)\#\@\-\d ]+)", raw_str)
+
+        member = r.group(3)
+        if member.lower().startswith("(anonymous"):
+            member = re.sub(r"[\(\)]", "", member).title()
+        lb_list.append((int(r.group(1)) if r.group(1) else None, int(r.group(2)), member))
+    return lb_list
+
+
+def fake_global_leaderboard_html(entries: int) -> str:
+    """Generate the HTML of a global leaderboard page, marked up the way AoC marks it up."""
+    head = (
+        "<!DOCTYPE html>\n<html lang=\"en-us\">\n<head>\n<meta charset=\"utf-8\"/>\n"
+        "<title>Leaderboard - Advent of Code 2018</title>\n"
+        "<link rel=\"stylesheet\" type=\"text/css\" href=\"/static/style.css\"/>\n</head>\n<body>\n"
+        "<header><div><h1 class=\"title-global\"><a href=\"/\">Advent of Code</a></h1><nav><ul>"
+        + "".join(f"<li><a href=\"/2018/{page}\">[{page}]</a></li>" for page in ("about", "events", "settings"))
+        + "</ul></nav></div></header>\n<main>\n<article><p>Below is the <em>Advent of Code 2018</em> overall "
+        "leaderboard; these are the 100 users with the highest total score.</p></article>\n"
+    )
+
+    rows = []
+    score = 40 * entries + 100
+    for position in range(1, entries + 1):
+        tied = random.random() < 0.05
+        if not tied:
+            score -= random.randint(1, 40)
+        rank = " " * 5 if tied else f"{position:3})"
+        if random.random() < 0.2:
+            name = f"<span class=\"leaderboard-anon\">(anonymous user #{random.randint(1, 500000)})</span>"
+        else:
+            name = (
+                f"<a href=\"https://github.com/user{position}\" target=\"_blank\">"
+                f"<span class=\"leaderboard-userphoto\"><img src=\"https://example.com/{position}.png\"/></span>"
+                f"User {position}</a>"
+            )
+        badge = " <a href=\"/2018/support\" class=\"supporter-badge\">(AoC++)</a>" if random.random() < 0.3 else ""
+        rows.append(
+            f"<div class=\"leaderboard-entry\"><span class=\"leaderboard-position\">{rank}</span> "
+            f"{score:4}  {name}{badge}</div>\n"
+        )
+
+    return head + "".join(rows) + "</main>\n</body>\n</html>\n"
+
+
+def benchmark_global(entries: int, runs: int):
+    """Print how long parsing a global leaderboard page takes, with BeautifulSoup and streamed."""
+    raw_html = fake_global_leaderboard_html(entries)
+    if AocGlobalLeaderboard.from_html(raw_html).members != global_leaderboard_from_soup(raw_html):
+        raise RuntimeError("The parsed leaderboards don't match")
+
+    timings = {}
+    for name, function in (
+        ("BeautifulSoup", global_leaderboard_from_soup),
+        ("streamed", AocGlobalLeaderboard.from_html),
+    ):
+        start = time.perf_counter()
+        for _ in range(runs):
+            function(raw_html)
+        timings[name] = (time.perf_counter() - start) / runs
+
+    for name, timing in timings.items():
+        print(f"{name}: {timing * 1000:.2f}ms per page")
+    speedup = timings["BeautifulSoup"] / timings["streamed"]
+    print(f"{entries} entries, {len(raw_html) / 1024:.0f}KiB, {speedup:.1f}x faster")
+
+
+def main():
+    """Benchmark building the private and global leaderboards from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark building the private and global leaderboards.")
+    parser.add_argument(
+        "board", nargs="?", choices=("private", "global"), default="private", help="Leaderboard to build."
+    )
+    parser.add_argument("--members", type=int, default=200, help="Members on the leaderboard.")
+    parser.add_argument("--runs", type=int, default=100, help="Times to build the leaderboard.")
+    args = parser.parse_args()
+    if args.board == "private":
+        benchmark_private(args.members, args.runs)
+    else:
+        benchmark_global(args.members, args.runs)
+
+
+if __name__ == "__main__":
+    main()
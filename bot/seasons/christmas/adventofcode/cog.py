@@ -0,0 +1,1166 @@
+import asyncio
+import json
+import logging
+import math
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import partial
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import discord
+from discord.ext import commands
+from pytz import timezone
+
+from bot.constants import AdventOfCode as AocConfig, Channels, Colours, Emojis, Tokens, bot
+from bot.seasons.christmas.adventofcode.index import MemberIndex, display_name
+from bot.seasons.christmas.adventofcode.snapshots import AccountLinks, SnapshotStore, StarEvent
+
+log = logging.getLogger(__name__)
+
+AOC_REQUEST_HEADER = {"user-agent": "PythonDiscord AoC Event Bot"}
+AOC_SESSION_COOKIE = {"session": Tokens.aoc_session_cookie}
+
+EST = timezone("EST")
+COUNTDOWN_STEP = 60 * 5
+
+FIRST_EVENT_YEAR = 2015
+
+# Entries of the global leaderboards of an event and of a single day, as text
+ENTRY_PATTERN = re.compile(r"(?:[ ]{,2}(\d+)\))?[ ]+(\d+)\s+([\w\(\)\#\@\-\d ]+)")
+DAY_ENTRY_PATTERN = re.compile(r"(?:\s*(\d+)\))?\s+(Dec\s+\d+\s+\d\d:\d\d:\d\d)\s+(.+)")
+ANONYMOUS_PARENS_PATTERN = re.compile(r"[\(\)]")
+
+# How many star events the recent stars command shows at most
+STAR_EVENTS_SHOWN = 20
+
+
+def is_in_advent() -> bool:
+    """Utility function to check if we are between December 1st and December 25th."""
+    # Run the code from the 1st to the 24th
+    return datetime.now(EST).day in range(1, 25) and datetime.now(EST).month == 12
+
+
+def puzzle_unlock_time(year: int, day: int) -> datetime:
+    """Return when a day's puzzle unlocks, at midnight EST, as a naive UTC datetime."""
+    return datetime(year, 12, day, 5)
+
+
+def leaderboard_is_finished(year: int, day: int = None) -> bool:
+    """
+    Return whether a global leaderboard can't change any more.
+
+    A day's leaderboard fills up within a day of its puzzle unlocking, and an event's leaderboard
+    once the last day's has.
+    """
+    return datetime.utcnow() >= puzzle_unlock_time(year, day or 25) + timedelta(days=1)
+
+
+def time_left_to_aoc_midnight() -> Tuple[datetime, timedelta]:
+    """Calculates the amount of time left until midnight in UTC-5 (Advent of Code maintainer timezone)."""
+    # Change all time properties back to 00:00
+    todays_midnight = datetime.now(EST).replace(microsecond=0,
+                                                second=0,
+                                                minute=0,
+                                                hour=0)
+
+    # We want tomorrow so add a day on
+    tomorrow = todays_midnight + timedelta(days=1)
+
+    # Calculate the timedelta between the current time and midnight
+    return tomorrow, tomorrow - datetime.now(EST)
+
+
+async def countdown_status(bot: commands.Bot):
+    """Set the playing status of the bot to the minutes & hours left until the next day's challenge."""
+    while is_in_advent():
+        _, time_left = time_left_to_aoc_midnight()
+
+        aligned_seconds = int(math.ceil(time_left.seconds / COUNTDOWN_STEP)) * COUNTDOWN_STEP
+        hours, minutes = aligned_seconds // 3600, aligned_seconds // 60 % 60
+
+        if aligned_seconds == 0:
+            playing = f"right now!"
+        elif aligned_seconds == COUNTDOWN_STEP:
+            playing = f"in less than {minutes} minutes"
+        elif hours == 0:
+            playing = f"in {minutes} minutes"
+        elif hours == 23:
+            playing = f"since {60 - minutes} minutes ago"
+        else:
+            playing = f"in {hours} hours and {minutes} minutes"
+
+        # Status will look like "Playing in 5 hours and 30 minutes"
+        await bot.change_presence(activity=discord.Game(playing))
+
+        # Sleep until next aligned time or a full step if already aligned
+        delay = time_left.seconds % COUNTDOWN_STEP or COUNTDOWN_STEP
+        await asyncio.sleep(delay)
+
+
+async def day_countdown(bot: commands.Bot):
+    """
+    Calculate the number of seconds left until the next day of Advent.
+
+    Once we have calculated this we should then sleep that number and when the time is reached, ping
+    the Advent of Code role notifying them that the new challenge is ready.
+    """
+    while is_in_advent():
+        tomorrow, time_left = time_left_to_aoc_midnight()
+
+        await asyncio.sleep(time_left.seconds)
+
+        channel = bot.get_channel(Channels.seasonalbot_chat)
+
+        if not channel:
+            log.error("Could not find the AoC channel to send notification in")
+            break
+
+        await channel.send(f"<@&{AocConfig.role_id}> Good morning! Day {tomorrow.day} is ready to be attempted. "
+                           f"View it online now at https://adventofcode.com/{AocConfig.year}/day/{tomorrow.day}"
+                           f" (this link could take a few minutes to start working). Good luck!")
+
+        # Wait a couple minutes so that if our sleep didn't sleep enough
+        # time we don't end up announcing twice.
+        await asyncio.sleep(120)
+
+
+class LeaderboardRefresher:
+    """
+    Keeps a leaderboard cached, refreshing it in the background once it's older than a soft TTL.
+
+    Readers are served the cached leaderboard straight away, even while it's being refreshed, and
+    only wait when there's nothing cached yet. Concurrent refreshes share a single request, and
+    requests are never made more often than once per `min_interval` seconds, as AoC asks of bots
+    polling its leaderboards. Failed refreshes back off exponentially, up to `max_backoff` seconds.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[Any]],
+        *,
+        soft_ttl: float,
+        min_interval: float,
+        max_backoff: float,
+    ):
+        self.name = name
+        self.fetch = fetch
+        self.soft_ttl = soft_ttl
+        self.min_interval = min_interval
+        self.max_backoff = max_backoff
+
+        self.leaderboard = None
+        self.failures = 0
+
+        self._fetched_at: Optional[float] = None
+        self._next_request = 0.0
+        self._task: Optional[asyncio.Future] = None
+
+    @property
+    def is_stale(self) -> bool:
+        """Return whether the cached leaderboard is missing or older than the soft TTL."""
+        return self._fetched_at is None or time.monotonic() - self._fetched_at >= self.soft_ttl
+
+    def refresh(self) -> Optional[asyncio.Future]:
+        """
+        Start refreshing the leaderboard in the background, returning the running refresh.
+
+        Returns None without making a request if the last one was too recent or failed too recently.
+        """
+        if self._task is not None:
+            return self._task
+
+        now = time.monotonic()
+        if now < self._next_request:
+            log.debug(f"Not refreshing the {self.name} leaderboard for another {self._next_request - now:.0f} seconds")
+            return None
+
+        self._next_request = now + self.min_interval
+        self._task = asyncio.ensure_future(self._refresh())
+        return self._task
+
+    async def _refresh(self):
+        try:
+            leaderboard = await self.fetch()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.failures += 1
+            backoff = min(self.max_backoff, self.min_interval * 2 ** self.failures)
+            self._next_request = time.monotonic() + backoff
+            log.exception(f"Failed to refresh the {self.name} leaderboard, next attempt in {backoff:.0f} seconds")
+        else:
+            self.leaderboard = leaderboard
+            self.failures = 0
+            self._fetched_at = time.monotonic()
+            log.debug(f"Refreshed the {self.name} leaderboard")
+        finally:
+            self._task = None
+
+    async def get(self) -> Any:
+        """
+        Return the cached leaderboard, refreshing it in the background if it's stale.
+
+        None is returned if nothing is cached and the leaderboard can't be fetched right now.
+        """
+        if self.is_stale:
+            task = self.refresh()
+            if self.leaderboard is None and task is not None:
+                # Shielded so a cancelled command doesn't cancel the refresh for everyone else
+                await asyncio.shield(task)
+        return self.leaderboard
+
+    def seed(self, leaderboard: Any, fetched_at: float):
+        """
+        Cache a leaderboard fetched earlier at `fetched_at`, a UNIX timestamp, e.g. before a restart.
+
+        Its age counts towards the soft TTL and the polling interval as if it had just been fetched by us.
+        """
+        fetched_at = time.monotonic() - max(0.0, time.time() - fetched_at)
+        self.leaderboard = leaderboard
+        self._fetched_at = fetched_at
+        self._next_request = max(self._next_request, fetched_at + self.min_interval)
+
+    def cancel(self):
+        """Cancel the running refresh, if there is one."""
+        if self._task is not None:
+            self._task.cancel()
+
+
+class AdventOfCode(commands.Cog):
+    """Advent of Code festivities! Ho Ho Ho!"""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+        self._base_url = f"https://adventofcode.com/{AocConfig.year}"
+        self.global_leaderboard_url = f"https://adventofcode.com/{AocConfig.year}/leaderboard"
+        self.private_leaderboard_url = f"{self._base_url}/leaderboard/private/view/{AocConfig.leaderboard_id}"
+
+        self.about_aoc_filepath = Path("./bot/resources/advent_of_code/about.json")
+        self.cached_about_aoc = self._build_about_embed()
+
+        # Global leaderboards by year and day, the day being None for the leaderboard of the whole event
+        self.global_refreshers: Dict[Tuple[int, Optional[int]], LeaderboardRefresher] = {}
+        self.private_refresher = LeaderboardRefresher(
+            "private",
+            self._fetch_private_leaderboard,
+            soft_ttl=AocConfig.leaderboard_cache_age_threshold_seconds,
+            min_interval=AocConfig.leaderboard_min_refresh_interval_seconds,
+            max_backoff=AocConfig.leaderboard_max_refresh_backoff_seconds,
+        )
+
+        # Start from the last private leaderboard we fetched, rather than waiting for AoC after a restart
+        self.snapshots = SnapshotStore(AocConfig.leaderboard_id, AocConfig.year)
+        snapshot = self.snapshots.latest()
+        if snapshot is not None:
+            leaderboard = AocPrivateLeaderboard.from_json(snapshot.data)
+            leaderboard.last_updated = datetime.utcfromtimestamp(snapshot.fetched_at)
+            self.private_refresher.seed(leaderboard, snapshot.fetched_at)
+            log.info(f"Loaded the private AoC leaderboard as of {leaderboard.last_updated} from its latest snapshot")
+
+        # The AoC accounts members have told us are theirs, for finding them on the private leaderboard
+        self.account_links = AccountLinks()
+
+        self.countdown_task = None
+        self.status_task = None
+
+        countdown_coro = day_countdown(self.bot)
+        self.countdown_task = asyncio.ensure_future(self.bot.loop.create_task(countdown_coro))
+
+        status_coro = countdown_status(self.bot)
+        self.status_task = asyncio.ensure_future(self.bot.loop.create_task(status_coro))
+
+    @property
+    def cached_global_leaderboard(self) -> Optional["AocGlobalLeaderboard"]:
+        """Return the cached global leaderboard of this year's event, which may be stale."""
+        return self.global_refresher(AocConfig.year).leaderboard
+
+    @property
+    def cached_private_leaderboard(self) -> Optional["AocPrivateLeaderboard"]:
+        """Return the cached PyDis private leaderboard, which may be stale."""
+        return self.private_refresher.leaderboard
+
+    def cog_unload(self):
+        """Cancel any leaderboard refreshes still running."""
+        for refresher in self.global_refreshers.values():
+            refresher.cancel()
+        self.private_refresher.cancel()
+
+    def global_refresher(self, year: int, day: int = None) -> LeaderboardRefresher:
+        """Return the refresher of the global leaderboard for a year's event, or for one of its days."""
+        refresher = self.global_refreshers.get((year, day))
+        if refresher is None:
+            # Finished leaderboards can't change any more, so there's no point refreshing them often
+            if leaderboard_is_finished(year, day):
+                soft_ttl = AocConfig.finished_leaderboard_cache_age_threshold_seconds
+            else:
+                soft_ttl = AocConfig.leaderboard_cache_age_threshold_seconds
+
+            name = f"global {year}" if day is None else f"global {year} day {day}"
+            refresher = self.global_refreshers[year, day] = LeaderboardRefresher(
+                name,
+                partial(AocGlobalLeaderboard.from_url, year, day),
+                soft_ttl=soft_ttl,
+                min_interval=AocConfig.leaderboard_min_refresh_interval_seconds,
+                max_backoff=AocConfig.leaderboard_max_refresh_backoff_seconds,
+            )
+        return refresher
+
+    @commands.group(name="adventofcode", aliases=("aoc",), invoke_without_command=True)
+    async def adventofcode_group(self, ctx: commands.Context):
+        """All of the Advent of Code commands."""
+        await ctx.send_help(ctx.command)
+
+    @adventofcode_group.command(
+        name="subscribe",
+        aliases=("sub", "notifications", "notify", "notifs"),
+        brief="Notifications for new days"
+    )
+    async def aoc_subscribe(self, ctx: commands.Context):
+        """Assign the role for notifications about new days being ready."""
+        role = ctx.guild.get_role(AocConfig.role_id)
+        unsubscribe_command = f"{ctx.prefix}{ctx.command.root_parent} unsubscribe"
+
+        if role not in ctx.author.roles:
+            await ctx.author.add_roles(role)
+            await ctx.send("Okay! You have been __subscribed__ to notifications about new Advent of Code tasks. "
+                           f"You can run `{unsubscribe_command}` to disable them again for you.")
+        else:
+            await ctx.send("Hey, you already are receiving notifications about new Advent of Code tasks. "
+                           f"If you don't want them any more, run `{unsubscribe_command}` instead.")
+
+    @adventofcode_group.command(name="unsubscribe", aliases=("unsub",), brief="Notifications for new days")
+    async def aoc_unsubscribe(self, ctx: commands.Context):
+        """Remove the role for notifications about new days being ready."""
+        role = ctx.guild.get_role(AocConfig.role_id)
+
+        if role in ctx.author.roles:
+            await ctx.author.remove_roles(role)
+            await ctx.send("Okay! You have been __unsubscribed__ from notifications about new Advent of Code tasks.")
+        else:
+            await ctx.send("Hey, you don't even get any notifications about new Advent of Code tasks currently anyway.")
+
+    @adventofcode_group.command(name="countdown", aliases=("count", "c"), brief="Return time left until next day")
+    async def aoc_countdown(self, ctx: commands.Context):
+        """Return time left until next day."""
+        if not is_in_advent():
+            datetime_now = datetime.now(EST)
+            december_first = datetime(datetime_now.year + 1, 12, 1, tzinfo=EST)
+            delta = december_first - datetime_now
+            await ctx.send(f"The Advent of Code event is not currently running. "
+                           f"The next event will start in {delta.days} days.")
+            return
+
+        tomorrow, time_left = time_left_to_aoc_midnight()
+
+        hours, minutes = time_left.seconds // 3600, time_left.seconds // 60 % 60
+
+        await ctx.send(f"There are {hours} hours and {minutes} minutes left until day {tomorrow.day}.")
+
+    @adventofcode_group.command(name="about", aliases=("ab", "info"), brief="Learn about Advent of Code")
+    async def about_aoc(self, ctx: commands.Context):
+        """Respond with an explanation of all things Advent of Code."""
+        await ctx.send("", embed=self.cached_about_aoc)
+
+    @adventofcode_group.command(name="join", aliases=("j",), brief="Learn how to join PyDis' private AoC leaderboard")
+    async def join_leaderboard(self, ctx: commands.Context):
+        """DM the user the information for joining the PyDis AoC private leaderboard."""
+        author = ctx.message.author
+        log.info(f"{author.name} ({author.id}) has requested the PyDis AoC leaderboard code")
+
+        info_str = (
+            "Head over to https://adventofcode.com/leaderboard/private "
+            f"with code `{AocConfig.leaderboard_join_code}` to join the PyDis private leaderboard!"
+        )
+        try:
+            await author.send(info_str)
+        except discord.errors.Forbidden:
+            log.debug(f"{author.name} ({author.id}) has disabled DMs from server members")
+            await ctx.send(f":x: {author.mention}, please (temporarily) enable DMs to receive the join code")
+
+    @adventofcode_group.command(
+        name="leaderboard",
+        aliases=("board", "lb"),
+        brief="Get a snapshot of the PyDis private AoC leaderboard",
+    )
+    async def aoc_leaderboard(self, ctx: commands.Context, number_of_people_to_display: int = 10):
+        """
+        Pull the top number_of_people_to_display members from the PyDis leaderboard and post an embed.
+
+        For readability, number_of_people_to_display defaults to 10. A maximum value is configured in the
+        Advent of Code section of the bot constants. number_of_people_to_display values greater than this
+        limit will default to this maximum and provide feedback to the user.
+        """
+        async with ctx.typing():
+            await self._check_leaderboard_cache(ctx)
+
+            if not self.cached_private_leaderboard:
+                # Feedback on issues with leaderboard caching are sent by _check_leaderboard_cache()
+                # Short circuit here if there's an issue
+                return
+
+            number_of_people_to_display = await self._check_n_entries(ctx, number_of_people_to_display)
+
+            # Generate leaderboard table for embed
+            members_to_print = self.cached_private_leaderboard.top_n(number_of_people_to_display)
+            table = AocPrivateLeaderboard.build_leaderboard_embed(members_to_print)
+
+            # Build embed
+            aoc_embed = discord.Embed(
+                description=f"Total members: {len(self.cached_private_leaderboard.members)}",
+                colour=Colours.soft_green,
+                timestamp=self.cached_private_leaderboard.last_updated
+            )
+            aoc_embed.set_author(name="Advent of Code", url=self.private_leaderboard_url)
+            aoc_embed.set_footer(text="Last Updated")
+
+        await ctx.send(
+            content=f"Here's the current Top {number_of_people_to_display}! {Emojis.christmas_tree*3}\n\n{table}",
+            embed=aoc_embed,
+        )
+
+    @adventofcode_group.command(
+        name="stats",
+        aliases=("dailystats", "ds"),
+        brief="Get daily statistics for the PyDis private leaderboard"
+    )
+    async def private_leaderboard_daily_stats(self, ctx: commands.Context):
+        """
+        Respond with a table of the daily completion statistics for the PyDis private leaderboard.
+
+        Embed will display the total members and the number of users who have completed each day's puzzle
+        """
+        async with ctx.typing():
+            await self._check_leaderboard_cache(ctx)
+
+            if not self.cached_private_leaderboard:
+                # Feedback on issues with leaderboard caching are sent by _check_leaderboard_cache()
+                # Short circuit here if there's an issue
+                return
+
+            # Build ASCII table
+            total_members = len(self.cached_private_leaderboard.members)
+            _star = Emojis.star
+            header = f"{'Day':4}{_star:^8}{_star*2:^4}{'% ' + _star:^8}{'% ' + _star*2:^4}\n{'='*35}"
+            table = ""
+            for day, completions in enumerate(self.cached_private_leaderboard.daily_completion_summary):
+                per_one_star = f"{(completions[0]/total_members)*100:.2f}"
+                per_two_star = f"{(completions[1]/total_members)*100:.2f}"
+
+                table += f"{day+1:3}){completions[0]:^8}{completions[1]:^6}{per_one_star:^10}{per_two_star:^6}\n"
+
+            table = f"```\n{header}\n{table}```"
+
+            # Build embed
+            daily_stats_embed = discord.Embed(
+                colour=Colours.soft_green, timestamp=self.cached_private_leaderboard.last_updated
+            )
+            daily_stats_embed.set_author(name="Advent of Code", url=self._base_url)
+            daily_stats_embed.set_footer(text="Last Updated")
+
+            await ctx.send(
+                content=f"Here's the current daily statistics!\n\n{table}", embed=daily_stats_embed
+            )
+
+    @adventofcode_group.command(
+        name="recent",
+        aliases=("new", "latest"),
+        brief="Get the stars recently got on the PyDis private leaderboard"
+    )
+    async def recent_stars(self, ctx: commands.Context, hours: float = 1):
+        """Respond with the stars members of the PyDis private leaderboard got in the last few hours."""
+        if not 0 < hours <= 24 * 31:
+            await ctx.send(f":x: {ctx.author.mention}, hours must be a positive number up to {24 * 31}")
+            return
+
+        async with ctx.typing():
+            await self._check_leaderboard_cache(ctx)
+
+            if not self.cached_private_leaderboard:
+                # Feedback on issues with leaderboard caching are sent by _check_leaderboard_cache()
+                # Short circuit here if there's an issue
+                return
+
+            since = datetime.utcnow() - timedelta(hours=hours)
+            events = await self.bot.loop.run_in_executor(None, self.snapshots.recent_stars, since, STAR_EVENTS_SHOWN)
+
+            if events:
+                now = datetime.utcnow()
+                table = _build_star_events_table(
+                    events, "Ago", lambda event: _format_duration(now - event.timestamp)
+                )
+                content = f"Here are the latest stars from the last {hours:g} hours! {Emojis.star}\n\n{table}"
+            else:
+                content = f"Nobody got any stars in the last {hours:g} hours."
+
+            embed = discord.Embed(colour=Colours.soft_green, timestamp=self.cached_private_leaderboard.last_updated)
+            embed.set_author(name="Advent of Code", url=self.private_leaderboard_url)
+            embed.set_footer(text="Last Updated")
+
+        await ctx.send(content=content, embed=embed)
+
+    @adventofcode_group.command(
+        name="firsts",
+        aliases=("first", "fastest"),
+        brief="Get the first PyDis private leaderboard members to solve a day"
+    )
+    async def first_finishers(self, ctx: commands.Context, day: int = None, part: int = 2):
+        """
+        Respond with the first members of the PyDis private leaderboard to get a star for a day's puzzle.
+
+        The day defaults to today's during the event and to the last day otherwise, and the part to the second.
+        """
+        if day is None:
+            day = datetime.now(EST).day if is_in_advent() else 25
+        if not 1 <= day <= 25 or part not in (1, 2):
+            await ctx.send(f":x: {ctx.author.mention}, the day must be between 1 and 25 and the part either 1 or 2")
+            return
+
+        async with ctx.typing():
+            await self._check_leaderboard_cache(ctx)
+
+            if not self.cached_private_leaderboard:
+                # Feedback on issues with leaderboard caching are sent by _check_leaderboard_cache()
+                # Short circuit here if there's an issue
+                return
+
+            number_of_people_to_display = AocConfig.leaderboard_max_displayed_members
+            events = await self.bot.loop.run_in_executor(
+                None, self.snapshots.first_finishers, day, part, number_of_people_to_display
+            )
+
+            if events:
+                unlocked = puzzle_unlock_time(AocConfig.year, day)
+                table = _build_star_events_table(
+                    events, "Time", lambda event: _format_duration(event.timestamp - unlocked)
+                )
+                content = f"Here are the first to get the day {day} part {part} star! {Emojis.star}\n\n{table}"
+            else:
+                content = f"Nobody has got the day {day} part {part} star yet."
+
+            embed = discord.Embed(colour=Colours.soft_green, timestamp=self.cached_private_leaderboard.last_updated)
+            embed.set_author(name="Advent of Code", url=f"{self._base_url}/day/{day}")
+            embed.set_footer(text="Last Updated")
+
+        await ctx.send(content=content, embed=embed)
+
+    @adventofcode_group.command(name="rank", aliases=("find", "whois"), brief="Find members on the PyDis leaderboard")
+    async def member_rank(self, ctx: commands.Context, *, name: str = None):
+        """
+        Respond with the rank of the PyDis private leaderboard members matching a name or AoC id.
+
+        Without a name, this is the same as the me command.
+        """
+        if name is None:
+            await ctx.invoke(self.my_rank)
+            return
+
+        async with ctx.typing():
+            await self._check_leaderboard_cache(ctx)
+            leaderboard = self.cached_private_leaderboard
+
+            if not leaderboard:
+                # Feedback on issues with leaderboard caching are sent by _check_leaderboard_cache()
+                # Short circuit here if there's an issue
+                return
+
+            members = leaderboard.index.find(name)
+            if not members:
+                await ctx.send(f":x: {ctx.author.mention}, nobody on the leaderboard is called anything like {name}")
+                return
+
+        await self._send_ranks(ctx, leaderboard, members)
+
+    @adventofcode_group.command(name="me", aliases=("myrank",), brief="Find yourself on the PyDis leaderboard")
+    async def my_rank(self, ctx: commands.Context):
+        """
+        Respond with your rank on the PyDis private leaderboard.
+
+        Your AoC account is found with the link command, or failing that by your Discord name.
+        """
+        async with ctx.typing():
+            await self._check_leaderboard_cache(ctx)
+            leaderboard = self.cached_private_leaderboard
+
+            if not leaderboard:
+                # Feedback on issues with leaderboard caching are sent by _check_leaderboard_cache()
+                # Short circuit here if there's an issue
+                return
+
+            link_command = f"{ctx.prefix}{ctx.command.root_parent} link"
+            aoc_id = self.account_links.get(ctx.author.id)
+            if aoc_id is not None:
+                members = [leaderboard.index.by_id[aoc_id]] if aoc_id in leaderboard.index.by_id else []
+            else:
+                members = leaderboard.index.find(ctx.author.display_name, fuzzy=False)
+                if len(members) != 1 and ctx.author.display_name != ctx.author.name:
+                    members = leaderboard.index.find(ctx.author.name, fuzzy=False)
+
+            if len(members) != 1:
+                await ctx.send(
+                    f":x: {ctx.author.mention}, I couldn't find you on the leaderboard. "
+                    f"Run `{link_command} <your AoC name or #id>` to tell me which account is yours."
+                )
+                return
+
+        await self._send_ranks(ctx, leaderboard, members)
+
+    @adventofcode_group.command(name="link", brief="Tell the bot which AoC account is yours")
+    async def link_account(self, ctx: commands.Context, *, name: str):
+        """Link your Discord account to your AoC account on the PyDis private leaderboard, by its name or #id."""
+        async with ctx.typing():
+            await self._check_leaderboard_cache(ctx)
+            leaderboard = self.cached_private_leaderboard
+
+            if not leaderboard:
+                # Feedback on issues with leaderboard caching are sent by _check_leaderboard_cache()
+                # Short circuit here if there's an issue
+                return
+
+            members = leaderboard.index.find(name, fuzzy=False)
+            if not members:
+                await ctx.send(f":x: {ctx.author.mention}, nobody on the leaderboard is called {name}")
+                return
+            if len(members) > 1:
+                candidates = ", ".join(f"{display_name(member)} (#{member.aoc_id})" for member in members)
+                await ctx.send(f":x: {ctx.author.mention}, that could be any of {candidates}. Try your #id instead.")
+                return
+
+            member = members[0]
+            await self.bot.loop.run_in_executor(None, self.account_links.link, ctx.author.id, member.aoc_id)
+            log.info(f"{ctx.author} ({ctx.author.id}) linked their AoC account {member.aoc_id}")
+
+        await ctx.send(f"Okay {ctx.author.mention}, you're {display_name(member)} on the leaderboard now!")
+
+    @adventofcode_group.command(name="unlink", brief="Make the bot forget your AoC account")
+    async def unlink_account(self, ctx: commands.Context):
+        """Unlink your Discord account from your AoC account."""
+        if await self.bot.loop.run_in_executor(None, self.account_links.unlink, ctx.author.id):
+            log.info(f"{ctx.author} ({ctx.author.id}) unlinked their AoC account")
+            await ctx.send(f"Okay {ctx.author.mention}, I've forgotten which AoC account is yours.")
+        else:
+            await ctx.send(f"Hey {ctx.author.mention}, you haven't linked an AoC account anyway.")
+
+    async def _send_ranks(
+        self, ctx: commands.Context, leaderboard: "AocPrivateLeaderboard", members: List["AocMember"]
+    ):
+        """Send the rank, score and stars of some members of the private leaderboard."""
+        lines = []
+        for member in members:
+            rank = leaderboard.index.rank(member)
+            tied_with = leaderboard.index.tied_with(member)
+            tie = f" (tied with {tied_with} other{'s' if tied_with > 1 else ''})" if tied_with else ""
+            lines.append(
+                f"**{display_name(member)}** is ranked **#{rank}** of {len(leaderboard.index)}{tie} with "
+                f"{member.local_score} points, {member.completions[0]} {Emojis.star} "
+                f"and {member.completions[1]} {Emojis.star * 2}"
+            )
+
+        embed = discord.Embed(
+            description="\n".join(lines), colour=Colours.soft_green, timestamp=leaderboard.last_updated
+        )
+        embed.set_author(name="Advent of Code", url=self.private_leaderboard_url)
+        embed.set_footer(text="Last Updated")
+        await ctx.send(embed=embed)
+
+    @adventofcode_group.command(
+        name="global",
+        aliases=("globalboard", "gb"),
+        brief="Get a snapshot of the global AoC leaderboard",
+    )
+    async def global_leaderboard(
+        self, ctx: commands.Context, number_of_people_to_display: int = 10, year: int = None, day: int = None
+    ):
+        """
+        Pull the top number_of_people_to_display members from the global AoC leaderboard and post an embed.
+
+        For readability, number_of_people_to_display defaults to 10. A maximum value is configured in the
+        Advent of Code section of the bot constants. number_of_people_to_display values greater than this
+        limit will default to this maximum and provide feedback to the user.
+
+        The leaderboard of an earlier year's event can be given, and that of a single day of it.
+        """
+        if year is None:
+            year = AocConfig.year
+        if not FIRST_EVENT_YEAR <= year <= AocConfig.year:
+            await ctx.send(
+                f":x: {ctx.author.mention}, the year must be between {FIRST_EVENT_YEAR} and {AocConfig.year}"
+            )
+            return
+        if day is not None and not (1 <= day <= 25 and puzzle_unlock_time(year, day) <= datetime.utcnow()):
+            await ctx.send(f":x: {ctx.author.mention}, the day must be between 1 and 25 and already unlocked")
+            return
+
+        async with ctx.typing():
+            leaderboard = await self._check_leaderboard_cache(ctx, global_board=True, year=year, day=day)
+
+            if not leaderboard:
+                # Feedback on issues with leaderboard caching are sent by _check_leaderboard_cache()
+                # Short circuit here if there's an issue
+                return
+
+            number_of_people_to_display = await self._check_n_entries(ctx, number_of_people_to_display)
+
+            # Generate leaderboard table for embed
+            members_to_print = leaderboard.top_n(number_of_people_to_display)
+            table = AocGlobalLeaderboard.build_leaderboard_embed(members_to_print)
+
+            # Build embed
+            aoc_embed = discord.Embed(colour=Colours.soft_green, timestamp=leaderboard.last_updated)
+            aoc_embed.set_author(name="Advent of Code", url=AocGlobalLeaderboard.url(year, day))
+            aoc_embed.set_footer(text="Last Updated")
+
+        board_name = f"{year} global" if day is None else f"{year} day {day} global"
+        await ctx.send(
+            content=f"Here's the {board_name} Top {number_of_people_to_display}! {Emojis.christmas_tree*3}\n\n{table}",  # noqa
+            embed=aoc_embed,
+        )
+
+    async def _check_leaderboard_cache(
+        self, ctx, global_board: bool = False, year: int = AocConfig.year, day: int = None
+    ) -> Union["AocGlobalLeaderboard", "AocPrivateLeaderboard", None]:
+        """
+        Make sure a leaderboard is cached, refreshing it in the background if it's stale, and return it.
+
+        A stale leaderboard is still served while it's refreshed, so only the very first request
+        waits for AoC. global_board is a boolean to toggle between the global board of the given year
+        and day, and the Pydis private board
+        """
+        if global_board:
+            refresher = self.global_refresher(year, day)
+        else:
+            refresher = self.private_refresher
+
+        log.debug(f"Checking {refresher.name} leaderboard cache")
+        leaderboard = await refresher.get()
+        if not leaderboard:
+            await ctx.send(
+                "",
+                embed=_error_embed_helper(
+                    title=f"Something's gone wrong and there's no cached {refresher.name} leaderboard!",
+                    description="Please check in with a staff member.",
+                ),
+            )
+        return leaderboard
+
+    async def _fetch_private_leaderboard(self) -> "AocPrivateLeaderboard":
+        """Fetch the PyDis private leaderboard, storing a snapshot of it along the way."""
+        api_json = await AocPrivateLeaderboard.json_from_url()
+        events = await self.bot.loop.run_in_executor(None, self.snapshots.save, api_json)
+        log.debug(f"{len(events)} stars were got on the private leaderboard since it was last fetched")
+        return AocPrivateLeaderboard.from_json(api_json)
+
+    async def _check_n_entries(self, ctx: commands.Context, number_of_people_to_display: int) -> int:
+        """Check for n > max_entries and n <= 0"""
+        max_entries = AocConfig.leaderboard_max_displayed_members
+        author = ctx.message.author
+        if not 0 <= number_of_people_to_display <= max_entries:
+            log.debug(
+                f"{author.name} ({author.id}) attempted to fetch an invalid number "
+                f" of entries from the AoC leaderboard ({number_of_people_to_display})"
+            )
+            await ctx.send(
+                f":x: {author.mention}, number of entries to display must be a positive "
+                f"integer less than or equal to {max_entries}\n\n"
+                f"Head to {self.private_leaderboard_url} to view the entire leaderboard"
+            )
+            number_of_people_to_display = max_entries
+
+        return number_of_people_to_display
+
+    def _build_about_embed(self) -> discord.Embed:
+        """Build and return the informational "About AoC" embed from the resources file."""
+        with self.about_aoc_filepath.open("r") as f:
+            embed_fields = json.load(f)
+
+        about_embed = discord.Embed(title=self._base_url, colour=Colours.soft_green, url=self._base_url)
+        about_embed.set_author(name="Advent of Code", url=self._base_url)
+        for field in embed_fields:
+            about_embed.add_field(**field)
+
+        about_embed.set_footer(text=f"Last Updated (UTC): {datetime.utcnow()}")
+
+        return about_embed
+
+
+class AocMember:
+    """
+    Object representing the Advent of Code user.
+
+    The days a member got each star on are stored as bitmasks, with bit 0 standing for day 1. Every
+    day with a second star also has its first star set.
+    """
+
+    __slots__ = ("name", "aoc_id", "stars", "first_stars", "second_stars", "local_score", "global_score")
+
+    def __init__(
+        self,
+        name: str,
+        aoc_id: int,
+        stars: int,
+        first_stars: int,
+        second_stars: int,
+        local_score: int,
+        global_score: int,
+    ):
+        self.name = name
+        self.aoc_id = aoc_id
+        self.stars = stars
+        self.first_stars = first_stars
+        self.second_stars = second_stars
+        self.local_score = local_score
+        self.global_score = global_score
+
+    def __repr__(self):
+        """Generate a user-friendly representation of the AocMember & their score."""
+        return f"<{self.name} ({self.aoc_id}): {self.local_score}>"
+
+    @property
+    def starboard(self) -> List[List[bool]]:
+        """Return a list of 25 [first star, second star] pairs of booleans, one for each day."""
+        return [[bool(self.first_stars >> day & 1), bool(self.second_stars >> day & 1)] for day in range(25)]
+
+    @property
+    def completions(self) -> Tuple[int, int]:
+        """Return days completed, as a (1 star, 2 star) tuple."""
+        return bin(self.first_stars).count("1"), bin(self.second_stars).count("1")
+
+    @classmethod
+    def member_from_json(cls, injson: dict) -> "AocMember":
+        """
+        Generate an AocMember from AoC's private leaderboard API JSON.
+
+        injson is expected to be the dict contained in:
+
+            AoC_APIjson['members'][<member id>:str]
+
+        Returns an AocMember object
+        """
+        first_stars, second_stars = cls._star_masks_from_json(injson["completion_day_level"])
+        return cls(
+            name=injson["name"] if injson["name"] else "Anonymous User",
+            aoc_id=int(injson["id"]),
+            stars=injson["stars"],
+            first_stars=first_stars,
+            second_stars=second_stars,
+            local_score=injson["local_score"],
+            global_score=injson["global_score"],
+        )
+
+    @staticmethod
+    def _star_masks_from_json(injson: dict) -> Tuple[int, int]:
+        """
+        Generate the first and second star bitmasks from AoC's private leaderboard API JSON.
+
+        injson is expected to be the dict contained in:
+
+            AoC_APIjson['members'][<member id>:str]['completion_day_level']
+        """
+        # Basic input validation
+        if not isinstance(injson, dict):
+            raise ValueError
+
+        first_stars = second_stars = 0
+        for day, parts in injson.items():
+            bit = 1 << int(day) - 1
+            # If the day exists in injson, then at least the first star is completed
+            first_stars |= bit
+            if "2" in parts:
+                second_stars |= bit
+
+        return first_stars, second_stars
+
+
+def count_days(masks: Iterable[int]) -> List[int]:
+    """
+    Count how many of the day bitmasks have each of the 25 days set.
+
+    Most members share their masks with others, having solved the same run of days, so each distinct
+    mask only has its set bits counted once.
+    """
+    counts = [0] * 25
+    for mask, members in Counter(masks).items():
+        while mask:
+            lowest = mask & -mask
+            counts[lowest.bit_length() - 1] += members
+            mask ^= lowest
+    return counts
+
+
+class AocPrivateLeaderboard:
+    """Object representing the Advent of Code private leaderboard."""
+
+    def __init__(self, members: list, owner_id: int, event_year: int):
+        self.members = members
+        self._owner_id = owner_id
+        self._event_year = event_year
+        self.last_updated = datetime.utcnow()
+
+        self.daily_completion_summary = self.calculate_daily_completion()
+        self.index = MemberIndex(members)
+
+    def top_n(self, n: int = 10) -> dict:
+        """
+        Return the top n participants on the leaderboard.
+
+        If n is not specified, default to the top 10
+        """
+        return self.members[:n]
+
+    def calculate_daily_completion(self) -> List[tuple]:
+        """
+        Calculate member completion rates by day.
+
+        Return a list of tuples for each day containing the number of users who completed each part
+        of the challenge
+        """
+        first_stars = count_days(member.first_stars for member in self.members)
+        second_stars = count_days(member.second_stars for member in self.members)
+        return list(zip(first_stars, second_stars))
+
+    @staticmethod
+    async def json_from_url(
+        leaderboard_id: int = AocConfig.leaderboard_id, year: int = AocConfig.year
+    ) -> "AocPrivateLeaderboard":
+        """
+        Request the API JSON from Advent of Code for leaderboard_id for the specified year's event.
+
+        If no year is input, year defaults to the current year
+        """
+        api_url = f"https://adventofcode.com/{year}/leaderboard/private/view/{leaderboard_id}.json"
+
+        log.debug("Querying Advent of Code Private Leaderboard API")
+        resp = await bot.http_client.get(api_url, cookies=AOC_SESSION_COOKIE, headers=AOC_REQUEST_HEADER)
+        if resp.status == 200:
+            raw_dict = resp.json()
+        else:
+            log.warning(f"Bad response received from AoC ({resp.status}), check session cookie")
+            resp.raise_for_status()
+
+        return raw_dict
+
+    @classmethod
+    def from_json(cls, injson: dict) -> "AocPrivateLeaderboard":
+        """Generate an AocPrivateLeaderboard object from AoC's private leaderboard API JSON."""
+        return cls(
+            members=cls._sorted_members(injson["members"]), owner_id=injson["owner_id"], event_year=injson["event"]
+        )
+
+    @classmethod
+    async def from_url(cls) -> "AocPrivateLeaderboard":
+        """Helper wrapping of AocPrivateLeaderboard.json_from_url and AocPrivateLeaderboard.from_json."""
+        api_json = await cls.json_from_url()
+        return cls.from_json(api_json)
+
+    @staticmethod
+    def _sorted_members(injson: dict) -> list:
+        """
+        Generate a sorted list of AocMember objects from AoC's private leaderboard API JSON.
+
+        Output list is sorted based on the AocMember.local_score
+        """
+        members = [AocMember.member_from_json(injson[member]) for member in injson]
+        members.sort(key=lambda x: x.local_score, reverse=True)
+
+        return members
+
+    @staticmethod
+    def build_leaderboard_embed(members_to_print: List[AocMember]) -> str:
+        """
+        Build a text table from members_to_print, a list of AocMember objects.
+
+        Returns a string to be used as the content of the bot's leaderboard response
+        """
+        stargroup = f"{Emojis.star}, {Emojis.star*2}"
+        header = f"{' '*3}{'Score'} {'Name':^25} {stargroup:^7}\n{'-'*44}"
+        table = ""
+        for i, member in enumerate(members_to_print):
+            if member.name == "Anonymous User":
+                name = f"{member.name} #{member.aoc_id}"
+            else:
+                name = member.name
+
+            table += (
+                f"{i+1:2}) {member.local_score:4} {name:25.25} "
+                f"({member.completions[0]:2}, {member.completions[1]:2})\n"
+            )
+        else:
+            table = f"```{header}\n{table}```"
+
+        return table
+
+
+class LeaderboardEntryParser(HTMLParser):
+    """
+    Collects the text of every entry of an AoC global leaderboard page as the HTML is fed to it.
+
+    Only the entries are kept, rather than a tree of the whole document.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.entries: List[str] = []
+        self._depth = 0  # How deep in the divs of an entry we are, 0 outside of one
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        """Start collecting the text of an entry when its div opens."""
+        if tag != "div":
+            return
+        if self._depth:
+            self._depth += 1
+        elif "leaderboard-entry" in (dict(attrs).get("class") or "").split():
+            self._depth = 1
+            self._text = []
+
+    def handle_endtag(self, tag: str):
+        """Finish an entry once its div closes."""
+        if tag == "div" and self._depth:
+            self._depth -= 1
+            if not self._depth:
+                self.entries.append("".join(self._text))
+
+    def handle_data(self, data: str):
+        """Collect the text inside an entry."""
+        if self._depth:
+            self._text.append(data)
+
+
+class AocGlobalLeaderboard:
+    """Object representing the Advent of Code global leaderboard of an event, or of one of its days."""
+
+    def __init__(self, members: List[tuple]):
+        self.members = members
+        self.last_updated = datetime.utcnow()
+
+    def top_n(self, n: int = 10) -> dict:
+        """
+        Return the top n participants on the leaderboard.
+
+        If n is not specified, default to the top 10
+        """
+        return self.members[:n]
+
+    @staticmethod
+    def url(year: int = AocConfig.year, day: int = None) -> str:
+        """Return the URL of the global leaderboard for a year's event, or for one of its days."""
+        if day is None:
+            return f"https://adventofcode.com/{year}/leaderboard"
+        return f"https://adventofcode.com/{year}/leaderboard/day/{day}"
+
+    @classmethod
+    async def from_url(cls, year: int = AocConfig.year, day: int = None) -> "AocGlobalLeaderboard":
+        """
+        Generate an list of tuples for the entries on AoC's global leaderboard.
+
+        Because there is no API for this, web scraping needs to be used
+        """
+        resp = await bot.http_client.get(cls.url(year, day), headers=AOC_REQUEST_HEADER)
+        if resp.status == 200:
+            raw_html = resp.text()
+        else:
+            log.warning(f"Bad response received from AoC ({resp.status}), check session cookie")
+            resp.raise_for_status()
+
+        return cls.from_html(raw_html, day is not None)
+
+    @classmethod
+    def from_html(cls, raw_html: str, day_board: bool = False) -> "AocGlobalLeaderboard":
+        """
+        Generate the leaderboard from the HTML of AoC's global leaderboard page.
+
+        Day leaderboards show completion times rather than scores, so their members are given the
+        points their rank is worth instead. Only those who got both stars of the day are kept.
+        """
+        parser = LeaderboardEntryParser()
+        parser.feed(raw_html)
+        parser.close()
+
+        lb_list = []
+        previous_rank = 0
+        points = None
+        for entry in parser.entries:
+            # Strip off the AoC++ decorator
+            raw_str = entry.replace("(AoC++)", "").rstrip()
+
+            # Group 1: Rank
+            # Group 2: Global Score, or completion time on a day leaderboard
+            # Group 3: Member string
+            r = (DAY_ENTRY_PATTERN if day_board else ENTRY_PATTERN).match(raw_str)
+            if r is None:
+                log.warning(f"Skipping unrecognised AoC global leaderboard entry {raw_str!r}")
+                continue
+
+            rank = int(r.group(1)) if r.group(1) else None
+            if day_board:
+                if rank is not None:
+                    if rank < previous_rank:
+                        # The first star's leaderboard comes after the one for both stars
+                        break
+                    previous_rank = rank
+                    points = 101 - rank
+                # Tied members share the points of the rank before them
+                global_score = points
+            else:
+                global_score = int(r.group(2))
+
+            member = r.group(3)
+            if member.lower().startswith("(anonymous"):
+                # Normalize anonymous user string by stripping () and title casing
+                member = ANONYMOUS_PARENS_PATTERN.sub("", member).title()
+
+            lb_list.append((rank, global_score, member))
+
+        return cls(lb_list)
+
+    @staticmethod
+    def build_leaderboard_embed(members_to_print: List[tuple]) -> str:
+        """
+        Build a text table from members_to_print, a list of tuples.
+
+        Returns a string to be used as the content of the bot's leaderboard response
+        """
+        header = f"{' '*4}{'Score'} {'Name':^25}\n{'-'*36}"
+        table = ""
+        for member in members_to_print:
+            # In the event of a tie, rank is None
+            if member[0]:
+                rank = f"{member[0]:3})"
+            else:
+                rank = f"{' ':4}"
+            table += f"{rank} {member[1]:4} {member[2]:25.25}\n"
+        else:
+            table = f"```{header}\n{table}```"
+
+        return table
+
+
+def _error_embed_helper(title: str, description: str) -> discord.Embed:
+    """Return a red-colored Embed with the given title and description."""
+    return discord.Embed(title=title, description=description, colour=discord.Colour.red())
+
+
+def _format_duration(duration: timedelta) -> str:
+    """Format a duration as hours, minutes and seconds, e.g. 26:03:12."""
+    seconds = max(0, int(duration.total_seconds()))
+    return f"{seconds // 3600}:{seconds // 60 % 60:02}:{seconds % 60:02}"
+
+
+def _build_star_events_table(events: List[StarEvent], time_header: str, time_of: Callable[[StarEvent], str]) -> str:
+    """
+    Build a text table of star events, labelling the column of times produced by `time_of` with `time_header`.
+
+    Returns a string to be used as the content of the bot's response
+    """
+    header = f"{time_header:>9} {'Name':^25} {'Day':>3} {'Part':>4}\n{'-'*44}"
+    table = ""
+    for event in events:
+        name = event.name or f"Anonymous User #{event.member_id}"
+        table += f"{time_of(event):>9} {name:25.25} {event.day:3} {event.part:4}\n"
+
+    return f"```{header}\n{table}```"
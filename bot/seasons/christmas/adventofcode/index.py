@@ -0,0 +1,88 @@
+import bisect
+import logging
+from collections import Counter
+from typing import Dict, List, Sequence
+
+from fuzzywuzzy import process
+
+log = logging.getLogger(__name__)
+
+__all__ = ("MemberIndex", "display_name")
+
+# How close a name has to be to the one searched for to be a match, out of 100
+FUZZY_CUTOFF = 75
+
+
+def display_name(member) -> str:
+    """Return the name a member is shown under, telling anonymous users apart by their AoC id."""
+    if member.name == "Anonymous User":
+        return f"{member.name} #{member.aoc_id}"
+    return member.name
+
+
+class MemberIndex:
+    """
+    Indexes the members of a private leaderboard by AoC id, by name and by rank.
+
+    The members are expected to be sorted by local score, best first. Members with the same score
+    share a rank, and the ranks after them are skipped, so three members tied for second place are
+    followed by the fifth.
+    """
+
+    def __init__(self, members: Sequence):
+        self.by_id = {}
+        self.ranks: Dict[int, int] = {}
+        self._names: Dict[str, list] = {}
+
+        rank = 0
+        previous_score = None
+        for position, member in enumerate(members, 1):
+            if member.local_score != previous_score:
+                rank, previous_score = position, member.local_score
+            self.by_id[member.aoc_id] = member
+            self.ranks[member.aoc_id] = rank
+            self._names.setdefault(display_name(member).casefold(), []).append(member)
+
+        self._rank_sizes = Counter(self.ranks.values())
+        self._sorted_names = sorted(self._names)
+
+    def __len__(self) -> int:
+        """Return the number of members indexed."""
+        return len(self.by_id)
+
+    def rank(self, member) -> int:
+        """Return the rank of a member on the leaderboard, starting from 1."""
+        return self.ranks[member.aoc_id]
+
+    def tied_with(self, member) -> int:
+        """Return how many other members share a member's rank."""
+        return self._rank_sizes[self.ranks[member.aoc_id]] - 1
+
+    def find(self, query: str, limit: int = 5, fuzzy: bool = True) -> List:
+        """
+        Return the members matching `query`, best ranked first.
+
+        A query of an AoC id, optionally prefixed with #, matches that member. Otherwise members are
+        matched by name, exactly and then by prefix, ignoring case. Only if neither match are the
+        names searched for fuzzily, which has to go through every name.
+        """
+        query = query.strip()
+        if query.lstrip("#").isdigit() and int(query.lstrip("#")) in self.by_id:
+            return [self.by_id[int(query.lstrip("#"))]]
+
+        name = query.casefold()
+        matches = list(self._names.get(name, ()))
+        if not matches:
+            start = bisect.bisect_left(self._sorted_names, name)
+            for candidate in self._sorted_names[start:start + limit]:
+                if not candidate.startswith(name):
+                    break
+                matches.extend(self._names[candidate])
+
+        if not matches and fuzzy:
+            for candidate, score in process.extract(name, self._sorted_names, limit=limit):
+                if score >= FUZZY_CUTOFF:
+                    matches.extend(self._names[candidate])
+
+        matches.sort(key=self.rank)
+        return matches[:limit]
@@ -0,0 +1,236 @@
+import json
+import logging
+import sqlite3
+import time
+import zlib
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple, Union
+
+log = logging.getLogger(__name__)
+
+__all__ = ("AccountLinks", "Snapshot", "SnapshotStore", "StarEvent")
+
+DB_PATH = Path("bot/resources/persist/aoc_snapshots.sqlite")
+
+# Star events hold the full history, so only the most recent snapshots are worth keeping
+KEPT_SNAPSHOTS = 48
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    leaderboard_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_board ON snapshots (leaderboard_id, year, fetched_at);
+
+CREATE TABLE IF NOT EXISTS members (
+    leaderboard_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    member_id INTEGER NOT NULL,
+    name TEXT,
+    PRIMARY KEY (leaderboard_id, year, member_id)
+);
+
+CREATE TABLE IF NOT EXISTS star_events (
+    leaderboard_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    member_id INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    part INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    PRIMARY KEY (leaderboard_id, year, member_id, day, part)
+);
+CREATE INDEX IF NOT EXISTS star_events_by_time ON star_events (leaderboard_id, year, ts);
+CREATE INDEX IF NOT EXISTS star_events_by_day ON star_events (leaderboard_id, year, day, part, ts);
+
+CREATE TABLE IF NOT EXISTS account_links (
+    discord_id INTEGER PRIMARY KEY,
+    aoc_id INTEGER NOT NULL
+);
+"""
+
+# A single star of a member: their AoC id, the day and the part
+Star = Tuple[int, int, int]
+
+
+class Snapshot(NamedTuple):
+    """A leaderboard's API JSON as it was fetched at `fetched_at`, a UNIX timestamp."""
+
+    fetched_at: float
+    data: dict
+
+
+class StarEvent(NamedTuple):
+    """A member getting a star for one part of a day's puzzle."""
+
+    member_id: int
+    name: Optional[str]
+    day: int
+    part: int
+    timestamp: datetime
+
+
+def parse_star_ts(value: Union[int, str]) -> int:
+    """Convert a `get_star_ts` value, a UNIX timestamp or an ISO 8601 string depending on the year, to an int."""
+    try:
+        return int(value)
+    except ValueError:
+        return int(datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z").timestamp())
+
+
+def stars_from_json(injson: dict) -> Dict[Star, int]:
+    """Return when every member of a private leaderboard's API JSON got each of their stars."""
+    stars = {}
+    for member in injson["members"].values():
+        member_id = int(member["id"])
+        for day, parts in member["completion_day_level"].items():
+            for part, completion in parts.items():
+                stars[member_id, int(day), int(part)] = parse_star_ts(completion["get_star_ts"])
+    return stars
+
+
+class SnapshotStore:
+    """
+    Stores fetched private leaderboards in sqlite, along with every star event they add up to.
+
+    Snapshots are kept as compressed JSON, so the latest one can be loaded again on a cold start.
+    Each snapshot is diffed against the one before it, recording the stars which appeared in
+    between with the time AoC says they were got, which can then be queried without refetching.
+
+    The methods are blocking, so they should be run in an executor.
+    """
+
+    def __init__(self, leaderboard_id: int, year: int, path: Path = DB_PATH):
+        self.leaderboard_id = leaderboard_id
+        self.year = year
+        self.path = path
+
+        # The stars in the latest snapshot, to diff the next one against
+        self._stars: Optional[Set[Star]] = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as db:
+            db.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path))
+
+    def latest(self) -> Optional[Snapshot]:
+        """Return the latest snapshot of the leaderboard, or None if there are none."""
+        with closing(self._connect()) as db:
+            row = db.execute(
+                "SELECT fetched_at, data FROM snapshots WHERE leaderboard_id = ? AND year = ? "
+                "ORDER BY fetched_at DESC LIMIT 1",
+                (self.leaderboard_id, self.year)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        fetched_at, data = row
+        snapshot = Snapshot(fetched_at, json.loads(zlib.decompress(data)))
+        self._stars = set(stars_from_json(snapshot.data))
+        return snapshot
+
+    def save(self, injson: dict, fetched_at: float = None) -> List[StarEvent]:
+        """Store a freshly fetched leaderboard, returning the stars got since the previous snapshot."""
+        if fetched_at is None:
+            fetched_at = time.time()
+        if self._stars is None:
+            self.latest()
+
+        stars = stars_from_json(injson)
+        new_stars = [star for star in stars if self._stars is None or star not in self._stars]
+        names = {int(member["id"]): member["name"] for member in injson["members"].values()}
+        data = zlib.compress(json.dumps(injson, separators=(",", ":")).encode())
+
+        with closing(self._connect()) as db, db:
+            board = (self.leaderboard_id, self.year)
+            db.execute(
+                "INSERT INTO snapshots (leaderboard_id, year, fetched_at, data) VALUES (?, ?, ?, ?)",
+                (*board, fetched_at, data)
+            )
+            db.execute(
+                "DELETE FROM snapshots WHERE leaderboard_id = ? AND year = ? AND id NOT IN ("
+                "SELECT id FROM snapshots WHERE leaderboard_id = ? AND year = ? ORDER BY fetched_at DESC LIMIT ?)",
+                (*board, *board, KEPT_SNAPSHOTS)
+            )
+            db.executemany(
+                "INSERT OR REPLACE INTO members (leaderboard_id, year, member_id, name) VALUES (?, ?, ?, ?)",
+                [(*board, member_id, name) for member_id, name in names.items()]
+            )
+            db.executemany(
+                "INSERT OR IGNORE INTO star_events (leaderboard_id, year, member_id, day, part, ts) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(*board, *star, stars[star]) for star in new_stars]
+            )
+
+        self._stars = set(stars)
+        log.debug(f"Stored a snapshot of AoC leaderboard {self.leaderboard_id} with {len(new_stars)} new stars")
+
+        events = [
+            StarEvent(member_id, names[member_id], day, part, datetime.utcfromtimestamp(stars[member_id, day, part]))
+            for member_id, day, part in new_stars
+        ]
+        events.sort(key=lambda event: event.timestamp)
+        return events
+
+    def _events(self, where: str, parameters: tuple, order: str, limit: int) -> List[StarEvent]:
+        with closing(self._connect()) as db:
+            rows = db.execute(
+                "SELECT e.member_id, m.name, e.day, e.part, e.ts FROM star_events e "
+                "LEFT JOIN members m USING (leaderboard_id, year, member_id) "
+                f"WHERE e.leaderboard_id = ? AND e.year = ? AND {where} ORDER BY {order} LIMIT ?",
+                (self.leaderboard_id, self.year, *parameters, limit)
+            ).fetchall()
+
+        return [
+            StarEvent(member_id, name, day, part, datetime.utcfromtimestamp(ts))
+            for member_id, name, day, part, ts in rows
+        ]
+
+    def recent_stars(self, since: datetime, limit: int = 50) -> List[StarEvent]:
+        """Return the stars got since `since`, a naive UTC datetime, most recent first."""
+        since_ts = int((since - datetime(1970, 1, 1)).total_seconds())
+        return self._events("e.ts >= ?", (since_ts,), "e.ts DESC", limit)
+
+    def first_finishers(self, day: int, part: int = 2, limit: int = 10) -> List[StarEvent]:
+        """Return the first members to get the star for a part of a day's puzzle, in order."""
+        return self._events("e.day = ? AND e.part = ?", (day, part), "e.ts ASC, e.member_id ASC", limit)
+
+
+class AccountLinks:
+    """
+    Remembers which AoC account Discord users said is theirs, alongside the leaderboard snapshots.
+
+    The links are kept in memory too, so looking one up doesn't touch the database. Changing a link
+    is blocking, so it should be run in an executor.
+    """
+
+    def __init__(self, path: Path = DB_PATH):
+        self.path = path
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(str(self.path))) as db:
+            db.executescript(SCHEMA)
+            self._links: Dict[int, int] = dict(db.execute("SELECT discord_id, aoc_id FROM account_links"))
+
+    def get(self, discord_id: int) -> Optional[int]:
+        """Return the AoC id linked to a Discord user, or None if they haven't linked one."""
+        return self._links.get(discord_id)
+
+    def link(self, discord_id: int, aoc_id: int):
+        """Link a Discord user to an AoC account, replacing any account linked before."""
+        with closing(sqlite3.connect(str(self.path))) as db, db:
+            db.execute("INSERT OR REPLACE INTO account_links (discord_id, aoc_id) VALUES (?, ?)", (discord_id, aoc_id))
+        self._links[discord_id] = aoc_id
+
+    def unlink(self, discord_id: int) -> bool:
+        """Forget the AoC account linked to a Discord user, returning whether there was one."""
+        with closing(sqlite3.connect(str(self.path))) as db, db:
+            db.execute("DELETE FROM account_links WHERE discord_id = ?", (discord_id,))
+        return self._links.pop(discord_id, None) is not None
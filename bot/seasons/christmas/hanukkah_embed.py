@@ -5,6 +5,7 @@ from discord import Embed
 from discord.ext import commands
 
 from bot.constants import Colours
+from bot.utils.cache import async_cache
 
 
 log = logging.getLogger(__name__)
@@ -21,11 +22,11 @@ class HanukkahEmbed(commands.Cog):
         self.hanukkah_months = []
         self.hanukkah_years = []
 
+    @async_cache("hanukkah.dates", ttl=24 * 60 * 60, max_entries=1)
     async def get_hanukkah_dates(self):
-        """Gets the dates for hanukkah festival."""
+        """Gets the dates for hanukkah festival, caching them for a day."""
         hanukkah_dates = []
-        async with self.bot.http_session.get(self.url) as response:
-            json_data = await response.json()
+        json_data = await self.bot.http_client.get_json(self.url)
         festivals = json_data['items']
         for festival in festivals:
             if festival['title'].startswith('Chanukah'):
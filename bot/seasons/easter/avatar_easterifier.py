@@ -1,14 +1,16 @@
-import asyncio
 import logging
 from io import BytesIO
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
 import discord
-from PIL import Image
-from PIL.ImageOps import posterize
 from discord.ext import commands
 
+from bot.seasons.easter.egg_decorating import EggChoice, EggDecorating, decorate_egg
+from bot.utils.assets import ASSETS
+from bot.utils.avatars import Avatar
+from bot.utils.palette import PaletteMapper
+
 log = logging.getLogger(__name__)
 
 COLOURS = [
@@ -17,6 +19,11 @@ COLOURS = [
     (135, 206, 235), (0, 204, 204), (64, 224, 208)
 ]  # Pastel colours - Easter-like
 
+# Averages each pixel with its closest Easter colour
+EASTER_PALETTE = PaletteMapper(COLOURS, average=True)
+
+BUNNY = Path("bot/resources/easter/chocolate_bunny.png")
+
 
 class AvatarEasterifier(commands.Cog):
     """Put an Easter spin on your avatar or image!"""
@@ -24,28 +31,6 @@ class AvatarEasterifier(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    @staticmethod
-    def closest(x):
-        """
-        Finds the closest easter colour to a given pixel.
-
-        Returns a merge between the original colour and the closest colour
-        """
-        r1, g1, b1 = x
-
-        def distance(point):
-            """Finds the difference between a pastel colour and the original pixel colour"""
-            r2, g2, b2 = point
-            return ((r1 - r2)**2 + (g1 - g2)**2 + (b1 - b2)**2)
-
-        closest_colours = sorted(COLOURS, key=lambda point: distance(point))
-        r2, g2, b2 = closest_colours[0]
-        r = (r1 + r2) // 2
-        g = (g1 + g2) // 2
-        b = (b1 + b2) // 2
-
-        return (r, g, b)
-
     @commands.command(pass_context=True, aliases=["easterify"])
     async def avatareasterify(self, ctx, *colours: Union[discord.Colour, str]):
         """
@@ -56,63 +41,18 @@ class AvatarEasterifier(commands.Cog):
         Colours are split by spaces, unless you wrap the colour name in double quotes.
         Discord colour names, HTML colour names, XKCD colour names and hex values are accepted.
         """
-        async def send(*args, **kwargs):
-            """
-            This replaces the original ctx.send.
-
-            When invoking the egg decorating command, the egg itself doesn't print to to the channel.
-            Returns the message content so that if any errors occur, the error message can be output.
-            """
-            if args:
-                return args[0]
+        egg = None
+        if colours:
+            egg = await EggDecorating.choose_egg(ctx, colours)
+            if egg is None:  # The colours couldn't be used, and the user has been told why
+                return
 
         async with ctx.typing():
 
-            # Grabs image of avatar
-            image_bytes = await ctx.author.avatar_url_as(size=256).read()
-
-            old = Image.open(BytesIO(image_bytes))
-            old = old.convert("RGBA")
-
-            # Grabs alpha channel since posterize can't be used with an RGBA image.
-            alpha = old.getchannel("A").getdata()
-            old = old.convert("RGB")
-            old = posterize(old, 6)
+            avatar = await self.bot.avatars.fetch(ctx.author, 256)
+            image = await self.bot.renderer.render(render_easterified_avatar, avatar, egg)
 
-            data = old.getdata()
-            setted_data = set(data)
-            new_d = {}
-
-            for x in setted_data:
-                new_d[x] = self.closest(x)
-                await asyncio.sleep(0)  # Ensures discord doesn't break in the background.
-            new_data = [(*new_d[x], alpha[i]) if x in new_d else x for i, x in enumerate(data)]
-
-            im = Image.new("RGBA", old.size)
-            im.putdata(new_data)
-
-            if colours:
-                send_message = ctx.send
-                ctx.send = send  # Assigns ctx.send to a fake send
-                egg = await ctx.invoke(self.bot.get_command("eggdecorate"), *colours)
-                if isinstance(egg, str):  # When an error message occurs in eggdecorate.
-                    return await send_message(egg)
-
-                ratio = 64 / egg.height
-                egg = egg.resize((round(egg.width * ratio), round(egg.height * ratio)))
-                egg = egg.convert("RGBA")
-                im.alpha_composite(egg, (im.width - egg.width, (im.height - egg.height)//2))  # Right centre.
-                ctx.send = send_message  # Reassigns ctx.send
-            else:
-                bunny = Image.open(Path("bot/resources/easter/chocolate_bunny.png"))
-                im.alpha_composite(bunny, (im.width - bunny.width, (im.height - bunny.height)//2))  # Right centre.
-
-            bufferedio = BytesIO()
-            im.save(bufferedio, format="PNG")
-
-            bufferedio.seek(0)
-
-            file = discord.File(bufferedio, filename="easterified_avatar.png")  # Creates file to be used in embed
+            file = discord.File(BytesIO(image), filename="easterified_avatar.png")  # Creates file to be used in embed
             embed = discord.Embed(
                 name="Your Lovely Easterified Avatar",
                 description="Here is your lovely avatar, all bright and colourful\nwith Easter pastel colours. Enjoy :D"
@@ -123,6 +63,29 @@ class AvatarEasterifier(commands.Cog):
         await ctx.send(file=file, embed=embed)
 
 
+def render_easterified_avatar(avatar: Avatar, egg_choice: Optional[EggChoice]) -> bytes:
+    """
+    Recolour an avatar with Easter colours, returning it as a PNG. Runs in a rendering worker.
+
+    The egg is placed in the right centre of the avatar if given, otherwise a chocolate bunny is.
+    """
+    im = EASTER_PALETTE.map(avatar.open())
+
+    if egg_choice is not None:
+        egg = decorate_egg(*egg_choice)
+        ratio = 64 / egg.height
+        egg = egg.resize((round(egg.width * ratio), round(egg.height * ratio)))
+        egg = egg.convert("RGBA")
+        im.alpha_composite(egg, (im.width - egg.width, (im.height - egg.height)//2))  # Right centre.
+    else:
+        bunny = ASSETS.image(BUNNY)
+        im.alpha_composite(bunny, (im.width - bunny.width, (im.height - bunny.height)//2))  # Right centre.
+
+    bufferedio = BytesIO()
+    im.save(bufferedio, format="PNG")
+    return bufferedio.getvalue()
+
+
 def setup(bot):
     """Avatar Easterifier Cog load."""
     bot.add_cog(AvatarEasterifier(bot))
@@ -25,6 +25,7 @@ class EasterRiddle(commands.Cog):
         self.winners = []
         self.correct = ""
         self.current_channel = None
+        self.answers = None
 
     @commands.command(aliases=["riddlemethis", "riddleme"])
     async def riddle(self, ctx):
@@ -37,60 +38,66 @@ class EasterRiddle(commands.Cog):
             return await ctx.send(f"A riddle is already being solved in {self.current_channel.mention}!")
 
         self.current_channel = ctx.message.channel
+        self.answers = self.bot.message_router.register(self.check_answer, channels=[self.current_channel.id])
 
-        random_question = random.choice(RIDDLE_QUESTIONS)
-        question = random_question["question"]
-        hints = random_question["riddles"]
-        self.correct = random_question["correct_answer"]
+        try:
+            random_question = random.choice(RIDDLE_QUESTIONS)
+            question = random_question["question"]
+            hints = random_question["riddles"]
+            self.correct = random_question["correct_answer"]
 
-        description = f"You have {TIMELIMIT} seconds before the first hint."
+            description = f"You have {TIMELIMIT} seconds before the first hint."
 
-        riddle_embed = discord.Embed(title=question, description=description, colour=Colours.pink)
+            riddle_embed = discord.Embed(title=question, description=description, colour=Colours.pink)
 
-        await ctx.send(embed=riddle_embed)
-        await asyncio.sleep(TIMELIMIT)
+            await ctx.send(embed=riddle_embed)
+            await asyncio.sleep(TIMELIMIT)
 
-        hint_embed = discord.Embed(
-            title=f"Here's a hint: {hints[0]}!",
-            colour=Colours.pink
-        )
+            hint_embed = discord.Embed(
+                title=f"Here's a hint: {hints[0]}!",
+                colour=Colours.pink
+            )
 
-        await ctx.send(embed=hint_embed)
-        await asyncio.sleep(TIMELIMIT)
+            await ctx.send(embed=hint_embed)
+            await asyncio.sleep(TIMELIMIT)
 
-        hint_embed = discord.Embed(
-            title=f"Here's a hint: {hints[1]}!",
-            colour=Colours.pink
-        )
+            hint_embed = discord.Embed(
+                title=f"Here's a hint: {hints[1]}!",
+                colour=Colours.pink
+            )
 
-        await ctx.send(embed=hint_embed)
-        await asyncio.sleep(TIMELIMIT)
+            await ctx.send(embed=hint_embed)
+            await asyncio.sleep(TIMELIMIT)
 
-        if self.winners:
-            win_list = " ".join(self.winners)
-            content = f"Well done {win_list} for getting it right!"
-        else:
-            content = "Nobody got it right..."
+            if self.winners:
+                win_list = " ".join(self.winners)
+                content = f"Well done {win_list} for getting it right!"
+            else:
+                content = "Nobody got it right..."
 
-        answer_embed = discord.Embed(
-            title=f"The answer is: {self.correct}!",
-            colour=Colours.pink
-        )
+            answer_embed = discord.Embed(
+                title=f"The answer is: {self.correct}!",
+                colour=Colours.pink
+            )
 
-        await ctx.send(content, embed=answer_embed)
+            await ctx.send(content, embed=answer_embed)
+        finally:
+            self._end_riddle()
 
+    def _end_riddle(self):
+        """Stop listening for answers and let the next riddle start."""
+        if self.answers is not None:
+            self.bot.message_router.unregister(self.answers)
+            self.answers = None
         self.winners = []
         self.current_channel = None
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        """If a non-bot user enters a correct answer, their username gets added to self.winners"""
-        if self.current_channel != message.channel:
-            return
-
-        if self.bot.user == message.author:
-            return
+    def cog_unload(self):
+        """Stop listening for answers to a riddle still being solved."""
+        self._end_riddle()
 
+    async def check_answer(self, message):
+        """If a non-bot user enters a correct answer, their username gets added to self.winners"""
         if message.content.lower() == self.correct.lower():
             self.winners.append(message.author.mention)
 
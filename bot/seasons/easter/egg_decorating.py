@@ -2,9 +2,10 @@ import json
 import logging
 import random
 from contextlib import suppress
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Union
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
 
 import discord
 from PIL import Image
@@ -27,6 +28,24 @@ IRREPLACEABLE = [
     (0, 0, 0, 0), (0, 0, 0, 255)
 ]  # Colours that are meant to stay the same - Transparent and Black
 
+DESIGNS = [Path(f"bot/resources/easter/easter_eggs/design{num}.png") for num in range(1, 7)]
+
+
+class EggChoice(NamedTuple):
+    """An egg design along with the 8 colours to decorate it with."""
+
+    design: int
+    colours: List[Tuple[int, int, int]]
+
+
+class EggDesign(NamedTuple):
+    """An egg design prepared for recolouring."""
+
+    image: Image.Image  # Palette image, with the replaceable colours at the start of the palette
+    alpha: Image.Image
+    palette: List[int]
+    replaceable: int
+
 
 class EggDecorating(commands.Cog):
     """Decorate some easter eggs!"""
@@ -43,63 +62,58 @@ class EggDecorating(commands.Cog):
             return int(XKCD_COLOURS[colour], 16)
         return None
 
-    @commands.command(aliases=["decorateegg"])
-    async def eggdecorate(self, ctx, *colours: Union[discord.Colour, str]):
+    @staticmethod
+    async def choose_egg(ctx, colours: Sequence[Union[discord.Colour, str]]) -> Optional[EggChoice]:
         """
-        Picks a random egg design and decorates it using the given colours.
+        Pick a random egg design to decorate with the given colours.
 
-        Colours are split by spaces, unless you wrap the colour name in double quotes.
-        Discord colour names, HTML colour names, XKCD colour names and hex values are accepted.
+        If the colours can't be used, the reason is sent to the channel and None is returned.
         """
         if len(colours) < 2:
-            return await ctx.send("You must include at least 2 colours!")
+            await ctx.send("You must include at least 2 colours!")
+            return None
 
         invalid = []
         colours = list(colours)
         for idx, colour in enumerate(colours):
             if isinstance(colour, discord.Colour):
                 continue
-            value = self.replace_invalid(colour)
+            value = EggDecorating.replace_invalid(colour)
             if value:
                 colours[idx] = discord.Colour(value)
             else:
                 invalid.append(colour)
 
         if len(invalid) > 1:
-            return await ctx.send(f"Sorry, I don't know these colours: {' '.join(invalid)}")
+            await ctx.send(f"Sorry, I don't know these colours: {' '.join(invalid)}")
+            return None
         elif len(invalid) == 1:
-            return await ctx.send(f"Sorry, I don't know the colour {invalid[0]}!")
+            await ctx.send(f"Sorry, I don't know the colour {invalid[0]}!")
+            return None
+
+        # Expand list to 8 colours
+        colours_n = len(colours)
+        if colours_n < 8:
+            q, r = divmod(8, colours_n)
+            colours = colours * q + colours[:r]
+        return EggChoice(random.randint(1, len(DESIGNS)), [colour.to_rgb() for colour in colours])
+
+    @commands.command(aliases=["decorateegg"])
+    async def eggdecorate(self, ctx, *colours: Union[discord.Colour, str]):
+        """
+        Picks a random egg design and decorates it using the given colours.
+
+        Colours are split by spaces, unless you wrap the colour name in double quotes.
+        Discord colour names, HTML colour names, XKCD colour names and hex values are accepted.
+        """
+        choice = await self.choose_egg(ctx, colours)
+        if choice is None:
+            return
 
         async with ctx.typing():
-            # Expand list to 8 colours
-            colours_n = len(colours)
-            if colours_n < 8:
-                q, r = divmod(8, colours_n)
-                colours = colours * q + colours[:r]
-            num = random.randint(1, 6)
-            im = Image.open(Path(f"bot/resources/easter/easter_eggs/design{num}.png"))
-            data = list(im.getdata())
-
-            replaceable = {x for x in data if x not in IRREPLACEABLE}
-            replaceable = sorted(replaceable, key=COLOURS.index)
-
-            replacing_colours = {colour: colours[i] for i, colour in enumerate(replaceable)}
-            new_data = []
-            for x in data:
-                if x in replacing_colours:
-                    new_data.append((*replacing_colours[x].to_rgb(), 255))
-                    # Also ensures that the alpha channel has a value
-                else:
-                    new_data.append(x)
-            new_im = Image.new(im.mode, im.size)
-            new_im.putdata(new_data)
-
-            bufferedio = BytesIO()
-            new_im.save(bufferedio, format="PNG")
-
-            bufferedio.seek(0)
-
-            file = discord.File(bufferedio, filename="egg.png")  # Creates file to be used in embed
+            egg = await self.bot.renderer.render(render_egg, *choice)
+
+            file = discord.File(BytesIO(egg), filename="egg.png")  # Creates file to be used in embed
             embed = discord.Embed(
                 title="Your Colourful Easter Egg",
                 description="Here is your pretty little egg. Hope you like it!"
@@ -108,7 +122,50 @@ class EggDecorating(commands.Cog):
             embed.set_footer(text=f"Made by {ctx.author.display_name}", icon_url=ctx.author.avatar_url)
 
         await ctx.send(file=file, embed=embed)
-        return new_im
+
+
+@lru_cache(maxsize=None)
+def load_design(design: int) -> EggDesign:
+    """
+    Load an egg design as a palette image, once per process.
+
+    Each distinct colour of the design gets its own palette entry, so recolouring is a matter of
+    swapping the entries of the replaceable colours.
+    """
+    im = Image.open(DESIGNS[design - 1]).convert("RGBA")
+    data = im.getdata()
+
+    design_colours = sorted(set(data), key=lambda x: (x in IRREPLACEABLE, COLOURS.index(x) if x in COLOURS else 0))
+    index = {colour: i for i, colour in enumerate(design_colours)}
+
+    palette_image = Image.new("P", im.size)
+    palette_image.putdata([index[x] for x in data])
+    palette = [value for colour in design_colours for value in colour[:3]]
+    replaceable = sum(colour not in IRREPLACEABLE for colour in design_colours)
+
+    return EggDesign(palette_image, im.getchannel("A"), palette, replaceable)
+
+
+def decorate_egg(design: int, colours: List[Tuple[int, int, int]]) -> Image.Image:
+    """Decorate an egg design with 8 colours, replacing its colours in the order of `COLOURS`."""
+    egg = load_design(design)
+
+    # Replaceable colours come first in the palette
+    palette = [value for colour in colours[:egg.replaceable] for value in colour]
+    palette += egg.palette[len(palette):]
+
+    im = egg.image.copy()
+    im.putpalette(palette)
+    im = im.convert("RGB")
+    im.putalpha(egg.alpha)
+    return im
+
+
+def render_egg(design: int, colours: List[Tuple[int, int, int]]) -> bytes:
+    """Decorate an egg design with 8 colours, returning it as a PNG. Runs in a rendering worker."""
+    bufferedio = BytesIO()
+    decorate_egg(design, colours).save(bufferedio, format="PNG")
+    return bufferedio.getvalue()
 
 
 def setup(bot):
@@ -11,6 +11,7 @@ from discord.ext import commands
 
 from bot.constants import Channels, Client, Roles as MainRoles, bot
 from bot.decorators import with_role
+from bot.message_router import message_handler
 from .constants import Colours, EggHuntSettings, Emoji, Roles
 
 log = logging.getLogger(__name__)
@@ -469,19 +470,12 @@ class EggHunt(commands.Cog):
         db.commit()
         db.close()
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        """Message event listener for random egg drops."""
+    @message_handler(channels=EggHuntSettings.allowed_channels)
+    async def random_egg_drop(self, message):
+        """Message handler for random egg drops in the Egg Hunt channels."""
         if self.current_timestamp() < EggHuntSettings.start_time:
             return
 
-        if message.channel.id not in EggHuntSettings.allowed_channels:
-            log.debug("Message not in Egg Hunt channel; ignored.")
-            return
-
-        if message.author.bot:
-            return
-
         if random.randrange(100) <= 5:
             await EggMessage(message, random.choice([Emoji.egg_white, Emoji.egg_blurple])).start()
 
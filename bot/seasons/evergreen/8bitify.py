@@ -4,6 +4,8 @@ import discord
 from PIL import Image
 from discord.ext import commands
 
+from bot.utils.avatars import Avatar
+
 
 class EightBitify(commands.Cog):
     """Make your avatar 8bit!"""
@@ -25,18 +27,14 @@ class EightBitify(commands.Cog):
     async def eightbit_command(self, ctx: commands.Context) -> None:
         """Pixelates your avatar and changes the palette to an 8bit one"""
         async with ctx.typing():
-            image_bytes = await ctx.author.avatar_url.read()
-            avatar = Image.open(BytesIO(image_bytes))
-            avatar = avatar.convert("RGBA").resize((1024, 1024))
-
-            eightbit = self.pixelate(avatar)
-            eightbit = self.quantize(eightbit)
+            async def render():
+                avatar = await self.bot.avatars.fetch(ctx.author, 32)
+                return await self.bot.renderer.render(render_8bit_avatar, avatar)
 
-            bufferedio = BytesIO()
-            eightbit.save(bufferedio, format="PNG")
-            bufferedio.seek(0)
+            key = ("8bitify", self.bot.avatars.identity(ctx.author))
+            eightbit = await self.bot.render_cache.get_or_render(key, render)
 
-            file = discord.File(bufferedio, filename="8bitavatar.png")
+            file = discord.File(BytesIO(eightbit), filename="8bitavatar.png")
 
             embed = discord.Embed(
                 title="Your 8-bit avatar",
@@ -49,6 +47,16 @@ class EightBitify(commands.Cog):
         await ctx.send(file=file, embed=embed)
 
 
+def render_8bit_avatar(avatar: Avatar) -> bytes:
+    """Pixelate an avatar and reduce its palette, returning it as a PNG. Runs in a rendering worker."""
+    eightbit = EightBitify.pixelate(avatar.open())
+    eightbit = EightBitify.quantize(eightbit)
+
+    bufferedio = BytesIO()
+    eightbit.save(bufferedio, format="PNG")
+    return bufferedio.getvalue()
+
+
 def setup(bot: commands.Bot) -> None:
     """Cog load."""
     bot.add_cog(EightBitify(bot))
@@ -5,6 +5,8 @@ import traceback
 
 from discord.ext import commands
 
+from bot.rendering import RenderError
+
 log = logging.getLogger(__name__)
 
 
@@ -87,6 +89,10 @@ class CommandErrorHandler(commands.Cog):
             logging.debug(f"{ctx.author} called the command '{ctx.command}' but the checks failed!")
             return await ctx.send(":no_entry: You are not authorized to use this command.")
 
+        if isinstance(error, RenderError):
+            logging.debug(f"{ctx.author} called the command '{ctx.command}' but rendering failed: {error}")
+            return await ctx.send(f":no_entry: {error}")
+
         print(f"Ignoring exception in command {ctx.command}:", file=sys.stderr)
 
         logging.warning(
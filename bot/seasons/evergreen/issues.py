@@ -1,9 +1,11 @@
 import logging
+from typing import Tuple
 
 import discord
 from discord.ext import commands
 
 from bot.constants import Colours
+from bot.utils.cache import async_cache
 
 log = logging.getLogger(__name__)
 
@@ -14,18 +16,28 @@ class Issues(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    @async_cache(
+        "issues.github", ttl=5 * 60, max_entries=256, negative_ttl=60, is_negative=lambda response: response[0] != 200
+    )
+    async def fetch_issue(self, user: str, repository: str, number: int) -> Tuple[int, dict]:
+        """
+        Fetch an issue from the GitHub API, returning the response status and JSON.
+
+        Issues are cached for 5 minutes, while failed lookups such as missing issues are cached for a minute.
+        """
+        api_url = f"https://api.github.com/repos/{user}/{repository}/issues/{number}"
+        response = await self.bot.http_client.get(api_url)
+        return response.status, response.json()
+
     @commands.command(aliases=("issues",))
     async def issue(self, ctx, number: int, repository: str = "seasonalbot", user: str = "python-discord"):
         """Command to retrieve issues from a GitHub repository."""
-        api_url = f"https://api.github.com/repos/{user}/{repository}/issues/{number}"
         failed_status = {
             404: f"Issue #{number} doesn't exist in the repository {user}/{repository}.",
             403: f"Rate limit exceeded. Please wait a while before trying again!"
         }
 
-        async with self.bot.http_session.get(api_url) as r:
-            json_data = await r.json()
-            response_code = r.status
+        response_code, json_data = await self.fetch_issue(user, repository, number)
 
         if response_code in failed_status:
             return await ctx.send(failed_status[response_code])
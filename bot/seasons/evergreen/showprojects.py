@@ -3,6 +3,7 @@ import logging
 from discord.ext import commands
 
 from bot.constants import Channels
+from bot.message_router import message_handler
 
 log = logging.getLogger(__name__)
 
@@ -14,13 +15,11 @@ class ShowProjects(commands.Cog):
         self.bot = bot
         self.lastPoster = 0  # Given 0 as the default last poster ID as no user can actually have 0 assigned to them
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
+    @message_handler(channels=[Channels.show_your_projects])
+    async def react_to_project(self, message):
         """Adds reactions to posts in #show-your-projects"""
         reactions = ["\U0001f44d", "\U00002764", "\U0001f440", "\U0001f389", "\U0001f680", "\U00002b50", "\U0001f6a9"]
-        if (message.channel.id == Channels.show_your_projects
-                and message.author.bot is False
-                and message.author.id != self.lastPoster):
+        if message.author.id != self.lastPoster:
             for reaction in reactions:
                 await message.add_reaction(reaction)
 
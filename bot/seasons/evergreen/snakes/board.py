@@ -0,0 +1,172 @@
+import argparse
+import io
+import logging
+import random
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Hashable, List, NamedTuple, Tuple
+
+from PIL import Image
+
+from bot.utils.assets import ASSETS
+from bot.utils.avatars import Avatar
+
+log = logging.getLogger(__name__)
+
+BOARD_IMAGE = Path("bot/resources/snakes/snakes_and_ladders/board.jpg").absolute()
+BOARD_QUALITY = 85  # JPEG quality of the rendered board
+
+# How many games' boards each rendering worker keeps around to update incrementally
+MAX_BOARDS = 16
+
+Box = Tuple[int, int, int, int]
+
+
+class Token(NamedTuple):
+    """A player's avatar at its position on the board."""
+
+    avatar: Avatar
+    position: Tuple[int, int]
+
+
+class BoardLayers:
+    """
+    The rendered board of a single game, updated incrementally as the players' tokens move.
+
+    The decoded base board is kept apart from the current frame, so the area under a token which
+    moved can be uncovered again without redrawing the rest of the board.
+    """
+
+    def __init__(self, token_size: int):
+        self.token_size = token_size
+        self.base = ASSETS.image(BOARD_IMAGE)
+        self.frame = self.base.copy()
+        self.tokens: Dict[int, Token] = {}
+
+    def _box(self, token: Token) -> Box:
+        x, y = token.position
+        return x, y, x + self.token_size, y + self.token_size
+
+    @staticmethod
+    def _overlaps(first: Box, second: Box) -> bool:
+        return first[0] < second[2] and second[0] < first[2] and first[1] < second[3] and second[1] < first[3]
+
+    def _token_image(self, avatar: Avatar) -> Image.Image:
+        size = (self.token_size, self.token_size)
+        return ASSETS.derived(("board token", *avatar.key, size), lambda: avatar.open().resize(size).convert("RGB"))
+
+    def update(self, tokens: List[Token]) -> int:
+        """
+        Move the tokens to their new positions, returning how many tokens had to be drawn.
+
+        Tokens are drawn in the given order, so later tokens cover earlier ones where they overlap.
+        """
+        new_tokens = {token.avatar.user_id: token for token in tokens}
+        removed = [token for user_id, token in self.tokens.items() if new_tokens.get(user_id) != token]
+        added = [token for user_id, token in new_tokens.items() if self.tokens.get(user_id) != token]
+
+        for token in removed:
+            box = self._box(token)
+            self.frame.paste(self.base.crop(box), box)
+
+        # Redraw every token overlapping the changed areas, and in turn every token overlapping those
+        dirty = [self._box(token) for token in removed + added]
+        redraw = set()
+        while True:
+            overlapping = {
+                token for token in tokens
+                if token not in redraw and any(self._overlaps(self._box(token), box) for box in dirty)
+            }
+            if not overlapping:
+                break
+            redraw |= overlapping
+            dirty.extend(self._box(token) for token in overlapping)
+
+        for token in tokens:
+            if token in redraw:
+                self.frame.paste(self._token_image(token.avatar), self._box(token))
+
+        self.tokens = new_tokens
+        return len(redraw)
+
+
+# The boards of the games this worker has rendered, least recently rendered first
+_boards: "OrderedDict[Hashable, BoardLayers]" = OrderedDict()
+
+
+def render_board(game: Hashable, tokens: List[Token], token_size: int) -> bytes:
+    """
+    Draw the Snakes and Ladders board of `game` as a JPEG. Runs in a rendering worker.
+
+    If this worker rendered the game's board before, only the tokens which moved since are redrawn.
+    """
+    board = _boards.get(game)
+    if board is None or board.token_size != token_size:
+        board = _boards[game] = BoardLayers(token_size)
+        while len(_boards) > MAX_BOARDS:
+            _boards.popitem(last=False)
+    _boards.move_to_end(game)
+
+    board.update(tokens)
+    buffer = io.BytesIO()
+    board.frame.save(buffer, format="JPEG", quality=BOARD_QUALITY)
+    return buffer.getvalue()
+
+
+def _render_from_scratch(tokens: List[Token], token_size: int) -> bytes:
+    """Draw the board the way it was drawn before it was layered, to benchmark against."""
+    board = Image.open(BOARD_IMAGE)
+    for avatar, position in tokens:
+        board.paste(Image.open(io.BytesIO(avatar.data)).resize((token_size, token_size)), box=position)
+
+    buffer = io.BytesIO()
+    board.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def benchmark(rounds: int, players: int = 4, token_size: int = 20, tile_size: int = 56):
+    """Print how long drawing each round of a game takes from scratch and with the layered board."""
+    avatars = []
+    for user_id in range(players):
+        buffer = io.BytesIO()
+        Image.effect_noise((32, 32), 64).convert("RGB").save(buffer, format="JPEG")
+        avatars.append(Avatar(user_id, "benchmark", 32, buffer.getvalue()))
+
+    tiles = [0] * players
+    games = []
+    for _ in range(rounds):
+        tiles = [min(99, tile + random.randint(1, 6)) for tile in tiles]
+        tokens = []
+        for i, (avatar, tile) in enumerate(zip(avatars, tiles)):
+            x = 10 + tile % 10 * tile_size + token_size * (i % 2)
+            y = tile // 10 * tile_size + token_size * (i // 2)
+            tokens.append(Token(avatar, (x, y)))
+        games.append(tokens)
+
+    timings = {}
+    sizes = {}
+    for name, function in (
+        ("from scratch", lambda tokens: _render_from_scratch(tokens, token_size)),
+        ("layered", lambda tokens: render_board("benchmark", tokens, token_size)),
+    ):
+        start = time.perf_counter()
+        sizes[name] = sum(len(function(tokens)) for tokens in games) / rounds
+        timings[name] = (time.perf_counter() - start) / rounds
+
+    for name in timings:
+        print(f"{name}: {timings[name] * 1000:.1f}ms and {sizes[name] / 1024:.0f}KiB per round")
+    print(f"{players} players over {rounds} rounds, {timings['from scratch'] / timings['layered']:.1f}x faster")
+
+
+def main():
+    """Benchmark rendering the Snakes and Ladders board from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark rendering the Snakes and Ladders board.")
+    parser.add_argument("--rounds", type=int, default=50, help="Rounds to play.")
+    parser.add_argument("--players", type=int, default=4, help="Players in the game.")
+    args = parser.parse_args()
+    benchmark(args.rounds, args.players)
+
+
+if __name__ == "__main__":
+    main()
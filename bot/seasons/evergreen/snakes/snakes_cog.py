@@ -7,12 +7,10 @@ import re
 import string
 import textwrap
 import urllib
-from functools import partial
+from functools import lru_cache
 from io import BytesIO
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
-import aiohttp
-import async_timeout
 from PIL import Image, ImageDraw, ImageFont
 from discord import Colour, Embed, File, Member, Message, Reaction
 from discord.ext.commands import BadArgument, Bot, Cog, Context, bot_has_permissions, group
@@ -21,6 +19,8 @@ from bot.constants import ERROR_REPLIES, Tokens
 from bot.decorators import locked
 from bot.seasons.evergreen.snakes import utils
 from bot.seasons.evergreen.snakes.converter import Snake
+from bot.utils.assets import ASSETS
+from bot.utils.cache import async_cache
 
 log = logging.getLogger(__name__)
 
@@ -169,85 +169,112 @@ class Snakes(Cog):
         return int(hex_rgb, 16)
 
     @staticmethod
-    def _generate_card(buffer: BytesIO, content: dict) -> BytesIO:
+    def _card_layers(icon_height: int, back_index: int) -> Tuple[Image.Image, Image.Image]:
         """
-        Generate a card from snake information.
+        Get the tiled background of a card, and the whole card apart from its snake and text.
 
-        Written by juan and Someone during the first code jam.
+        Neither depends on anything but the height of the snake icon and the back, so both are cached.
         """
-        snake = Image.open(buffer)
-
-        # Get the size of the snake icon, configure the height of the image box (yes, it changes)
-        icon_width = 347  # Hardcoded, not much i can do about that
-        icon_height = int((icon_width / snake.width) * snake.height)
-        frame_copies = icon_height // CARD['frame'].height + 1
-        snake.thumbnail((icon_width, icon_height))
-
-        # Get the dimensions of the final image
         main_height = icon_height + CARD['top'].height + CARD['bottom'].height
         main_width = CARD['frame'].width
 
-        # Start creating the foreground
-        foreground = Image.new("RGBA", (main_width, main_height), (0, 0, 0, 0))
-        foreground.paste(CARD['top'], (0, 0))
+        def draw_background() -> Image.Image:
+            back = CARD['backs'][back_index]
+            back_copies = main_height // back.height + 1
+            background = Image.new("RGBA", (main_width, main_height), (0, 0, 0, 0))
+
+            # Generate the tiled background
+            for offset in range(back_copies):
+                background.paste(back, (16, 16 + offset * back.height))
+            return background
+
+        def draw_template() -> Image.Image:
+            # Start creating the foreground
+            foreground = Image.new("RGBA", (main_width, main_height), (0, 0, 0, 0))
+            foreground.paste(CARD['top'], (0, 0))
+
+            # Generate the frame borders to the correct height
+            frame_copies = icon_height // CARD['frame'].height + 1
+            for offset in range(frame_copies):
+                position = (0, CARD['top'].height + offset * CARD['frame'].height)
+                foreground.paste(CARD['frame'], position)
+
+            # Add the bottom part of the image
+            foreground.paste(CARD['bottom'], (0, CARD['top'].height + icon_height))
+
+            # Place the foreground onto the background
+            template = background.copy()
+            template.paste(foreground, (0, 0), foreground)
+
+            # Create blank rectangle image which will be behind the text
+            margin = 36
+            offset = CARD['top'].height + icon_height + margin
+            rectangle = Image.new(
+                "RGBA",
+                (main_width, main_height),
+                (0, 0, 0, 0)
+            )
 
-        # Generate the frame borders to the correct height
-        for offset in range(frame_copies):
-            position = (0, CARD['top'].height + offset * CARD['frame'].height)
-            foreground.paste(CARD['frame'], position)
+            # Draw a semi-transparent rectangle on it
+            rect = ImageDraw.Draw(rectangle)
+            rect.rectangle(
+                (margin, offset, main_width - margin, main_height - margin),
+                fill=(63, 63, 63, 128)
+            )
 
-        # Add the image and bottom part of the image
-        foreground.paste(snake, (36, CARD['top'].height))  # Also hardcoded :(
-        foreground.paste(CARD['bottom'], (0, CARD['top'].height + icon_height))
+            # Paste it onto the template
+            template.paste(rectangle, (0, 0), mask=rectangle)
+            return template
 
-        # Setup the background
-        back = random.choice(CARD['backs'])
-        back_copies = main_height // back.height + 1
-        full_image = Image.new("RGBA", (main_width, main_height), (0, 0, 0, 0))
+        background = ASSETS.derived(("snake card background", icon_height, back_index), draw_background)
+        template = ASSETS.derived(("snake card", icon_height, back_index), draw_template)
+        return background, template
 
-        # Generate the tiled background
-        for offset in range(back_copies):
-            full_image.paste(back, (16, 16 + offset * back.height))
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _card_text(description: str) -> Tuple[Tuple[str, int], ...]:
+        """Wrap the description of a card into lines, returning each line along with its height."""
+        return tuple((line, CARD['font'].getsize(line)[1]) for line in textwrap.wrap(description, 36))
 
-        # Place the foreground onto the final image
-        full_image.paste(foreground, (0, 0), foreground)
+    @staticmethod
+    def _generate_card(snake_bytes: bytes, info: str) -> bytes:
+        """
+        Generate a card from snake information, as a PNG. Runs in a rendering worker.
 
-        # Get the first two sentences of the info
-        description = '.'.join(content['info'].split(".")[:2]) + '.'
+        Written by juan and Someone during the first code jam.
+        """
+        snake = Image.open(BytesIO(snake_bytes))
 
-        # Setup positioning variables
-        margin = 36
-        offset = CARD['top'].height + icon_height + margin
+        # Get the size of the snake icon, configure the height of the image box (yes, it changes)
+        icon_width = 347  # Hardcoded, not much i can do about that
+        icon_height = int((icon_width / snake.width) * snake.height)
+        snake.thumbnail((icon_width, icon_height))
 
-        # Create blank rectangle image which will be behind the text
-        rectangle = Image.new(
-            "RGBA",
-            (main_width, main_height),
-            (0, 0, 0, 0)
-        )
+        background, template = Snakes._card_layers(icon_height, random.randrange(len(CARD['backs'])))
+        full_image = template.copy()
 
-        # Draw a semi-transparent rectangle on it
-        rect = ImageDraw.Draw(rectangle)
-        rect.rectangle(
-            (margin, offset, main_width - margin, main_height - margin),
-            fill=(63, 63, 63, 128)
-        )
+        # The snake replaces the frame behind it, so uncover the background before placing the snake on it
+        snake = snake.convert("RGBA")
+        position = (36, CARD['top'].height)  # Also hardcoded :(
+        box = position + (position[0] + snake.width, position[1] + snake.height)
+        full_image.paste(background.crop(box), box)
+        full_image.paste(snake, position, snake)
 
-        # Paste it onto the final image
-        full_image.paste(rectangle, (0, 0), mask=rectangle)
+        # Get the first two sentences of the info
+        description = '.'.join(info.split(".")[:2]) + '.'
 
         # Draw the text onto the final image
+        margin = 36
+        offset = CARD['top'].height + icon_height + margin
         draw = ImageDraw.Draw(full_image)
-        for line in textwrap.wrap(description, 36):
+        for line, height in Snakes._card_text(description):
             draw.text([margin + 4, offset], line, font=CARD['font'])
-            offset += CARD['font'].getsize(line)[1]
+            offset += height
 
-        # Get the image contents as a BufferIO object
+        # Get the image contents as PNG bytes
         buffer = BytesIO()
         full_image.save(buffer, 'PNG')
-        buffer.seek(0)
-
-        return buffer
+        return buffer.getvalue()
 
     @staticmethod
     def _snakify(message):
@@ -272,14 +299,12 @@ class Snakes(Cog):
 
         return message
 
-    async def _fetch(self, session, url, params=None):
+    async def _fetch(self, url, params=None):
         """Asynchronous web request helper method."""
         if params is None:
             params = {}
 
-        async with async_timeout.timeout(10):
-            async with session.get(url, params=params) as response:
-                return await response.json()
+        return await self.bot.http_client.get_json(url, params=params, timeout=10)
 
     def _get_random_long_message(self, messages, retries=10):
         """
@@ -296,6 +321,10 @@ class Snakes(Cog):
 
         return long_message
 
+    @async_cache(
+        "snakes.wikipedia", ttl=24 * 60 * 60, max_entries=512,
+        negative_ttl=60 * 60, is_negative=lambda info: info is None
+    )
     async def _get_snek(self, name: str) -> Dict[str, Any]:
         """
         Fetches all the data from a wikipedia article about a snake.
@@ -304,101 +333,102 @@ class Snakes(Cog):
 
         Created by Ava and eivl.
 
+        Results are cached for a day, and snakes which couldn't be found for an hour.
+
         :param name: The name of the snake to get information for - omit for a random snake
         :return: A dict containing information on a snake
         """
         snake_info = {}
 
-        async with aiohttp.ClientSession() as session:
-            params = {
-                'format': 'json',
-                'action': 'query',
-                'list': 'search',
-                'srsearch': name,
-                'utf8': '',
-                'srlimit': '1',
-            }
-
-            json = await self._fetch(session, URL, params=params)
+        params = {
+            'format': 'json',
+            'action': 'query',
+            'list': 'search',
+            'srsearch': name,
+            'utf8': '',
+            'srlimit': '1',
+        }
 
-            # Wikipedia does have a error page
-            try:
-                pageid = json["query"]["search"][0]["pageid"]
-            except KeyError:
-                # Wikipedia error page ID(?)
-                pageid = 41118
-            except IndexError:
-                return None
-
-            params = {
-                'format': 'json',
-                'action': 'query',
-                'prop': 'extracts|images|info',
-                'exlimit': 'max',
-                'explaintext': '',
-                'inprop': 'url',
-                'pageids': pageid
-            }
-
-            json = await self._fetch(session, URL, params=params)
+        json = await self._fetch(URL, params=params)
 
-            # Constructing dict - handle exceptions later
-            try:
-                snake_info["title"] = json["query"]["pages"][f"{pageid}"]["title"]
-                snake_info["extract"] = json["query"]["pages"][f"{pageid}"]["extract"]
-                snake_info["images"] = json["query"]["pages"][f"{pageid}"]["images"]
-                snake_info["fullurl"] = json["query"]["pages"][f"{pageid}"]["fullurl"]
-                snake_info["pageid"] = json["query"]["pages"][f"{pageid}"]["pageid"]
-            except KeyError:
-                snake_info["error"] = True
-
-            if snake_info["images"]:
-                i_url = 'https://commons.wikimedia.org/wiki/Special:FilePath/'
-                image_list = []
-                map_list = []
-                thumb_list = []
-
-                # Wikipedia has arbitrary images that are not snakes
-                banned = [
-                    'Commons-logo.svg',
-                    'Red%20Pencil%20Icon.png',
-                    'distribution',
-                    'The%20Death%20of%20Cleopatra%20arthur.jpg',
-                    'Head%20of%20holotype',
-                    'locator',
-                    'Woma.png',
-                    '-map.',
-                    '.svg',
-                    'ange.',
-                    'Adder%20(PSF).png'
-                ]
-
-                for image in snake_info["images"]:
-                    # Images come in the format of `File:filename.extension`
-                    file, sep, filename = image["title"].partition(':')
-                    filename = filename.replace(" ", "%20")  # Wikipedia returns good data!
-
-                    if not filename.startswith('Map'):
-                        if any(ban in filename for ban in banned):
-                            pass
-                        else:
-                            image_list.append(f"{i_url}{filename}")
-                            thumb_list.append(f"{i_url}{filename}?width=100")
+        # Wikipedia does have a error page
+        try:
+            pageid = json["query"]["search"][0]["pageid"]
+        except KeyError:
+            # Wikipedia error page ID(?)
+            pageid = 41118
+        except IndexError:
+            return None
+
+        params = {
+            'format': 'json',
+            'action': 'query',
+            'prop': 'extracts|images|info',
+            'exlimit': 'max',
+            'explaintext': '',
+            'inprop': 'url',
+            'pageids': pageid
+        }
+
+        json = await self._fetch(URL, params=params)
+
+        # Constructing dict - handle exceptions later
+        try:
+            snake_info["title"] = json["query"]["pages"][f"{pageid}"]["title"]
+            snake_info["extract"] = json["query"]["pages"][f"{pageid}"]["extract"]
+            snake_info["images"] = json["query"]["pages"][f"{pageid}"]["images"]
+            snake_info["fullurl"] = json["query"]["pages"][f"{pageid}"]["fullurl"]
+            snake_info["pageid"] = json["query"]["pages"][f"{pageid}"]["pageid"]
+        except KeyError:
+            snake_info["error"] = True
+
+        if snake_info["images"]:
+            i_url = 'https://commons.wikimedia.org/wiki/Special:FilePath/'
+            image_list = []
+            map_list = []
+            thumb_list = []
+
+            # Wikipedia has arbitrary images that are not snakes
+            banned = [
+                'Commons-logo.svg',
+                'Red%20Pencil%20Icon.png',
+                'distribution',
+                'The%20Death%20of%20Cleopatra%20arthur.jpg',
+                'Head%20of%20holotype',
+                'locator',
+                'Woma.png',
+                '-map.',
+                '.svg',
+                'ange.',
+                'Adder%20(PSF).png'
+            ]
+
+            for image in snake_info["images"]:
+                # Images come in the format of `File:filename.extension`
+                file, sep, filename = image["title"].partition(':')
+                filename = filename.replace(" ", "%20")  # Wikipedia returns good data!
+
+                if not filename.startswith('Map'):
+                    if any(ban in filename for ban in banned):
+                        pass
                     else:
-                        map_list.append(f"{i_url}{filename}")
+                        image_list.append(f"{i_url}{filename}")
+                        thumb_list.append(f"{i_url}{filename}?width=100")
+                else:
+                    map_list.append(f"{i_url}{filename}")
 
-            snake_info["image_list"] = image_list
-            snake_info["map_list"] = map_list
-            snake_info["thumb_list"] = thumb_list
-            snake_info["name"] = name
+        snake_info["image_list"] = image_list
+        snake_info["map_list"] = map_list
+        snake_info["thumb_list"] = thumb_list
+        snake_info["name"] = name
 
-            match = self.wiki_brief.match(snake_info['extract'])
-            info = match.group(1) if match else None
+        match = self.wiki_brief.match(snake_info['extract'])
+        info = match.group(1) if match else None
 
-            if info:
-                info = info.replace("\n", "\n\n")  # Give us some proper paragraphs.
+        if info:
+            info = info.replace("\n", "\n\n")  # Give us some proper paragraphs.
 
-            snake_info["info"] = info
+        snake_info["info"] = info
 
         return snake_info
 
@@ -614,9 +644,8 @@ class Snakes(Cog):
 
             # Build and send the snek
             text = random.choice(self.snake_idioms)["idiom"]
-            factory = utils.PerlinNoiseFactory(dimension=1, octaves=2)
-            image_frame = utils.create_snek_frame(
-                factory,
+            png_bytes = await self.bot.renderer.render(
+                utils.render_snek,
                 snake_width=width,
                 snake_length=length,
                 snake_color=snek_color,
@@ -624,8 +653,7 @@ class Snakes(Cog):
                 text_color=text_color,
                 bg_color=bg_color
             )
-            png_bytesIO = utils.frame_to_png_bytes(image_frame)
-            file = File(png_bytesIO, filename='snek.png')
+            file = File(BytesIO(png_bytes), filename='snek.png')
             await ctx.send(file=file)
 
     @snakes_group.command(name='get')
@@ -747,6 +775,11 @@ class Snakes(Cog):
 
         await ctx.channel.send(embed=my_snake_embed)
 
+    @async_cache("snakes.omdb", ttl=6 * 60 * 60, max_entries=128)
+    async def _get_omdb(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch a response from the OMDB API, cached for a few hours."""
+        return await self.bot.http_client.get_json("http://www.omdbapi.com/", params=params)
+
     @snakes_group.command(name='movie')
     async def movie_command(self, ctx: Context):
         """
@@ -755,37 +788,26 @@ class Snakes(Cog):
         Written by Samuel.
         Modified by gdude.
         """
-        url = "http://www.omdbapi.com/"
         page = random.randint(1, 27)
 
-        response = await self.bot.http_session.get(
-            url,
-            params={
-                "s": "snake",
-                "page": page,
-                "type": "movie",
-                "apikey": Tokens.omdb
-            }
-        )
-        data = await response.json()
+        data = await self._get_omdb({
+            "s": "snake",
+            "page": page,
+            "type": "movie",
+            "apikey": Tokens.omdb
+        })
         movie = random.choice(data["Search"])["imdbID"]
 
-        response = await self.bot.http_session.get(
-            url,
-            params={
-                "i": movie,
-                "apikey": Tokens.omdb
-            }
-        )
-        data = await response.json()
+        data = await self._get_omdb({
+            "i": movie,
+            "apikey": Tokens.omdb
+        })
 
         embed = Embed(
             title=data["Title"],
             color=SNAKE_COLOR
         )
 
-        del data["Response"], data["imdbID"], data["Title"]
-
         for key, value in data.items():
             if not value or value == "N/A" or key in ("Response", "imdbID", "Title", "Type"):
                 continue
@@ -997,20 +1019,13 @@ class Snakes(Cog):
         # Make the card
         async with ctx.typing():
 
-            stream = BytesIO()
-            async with async_timeout.timeout(10):
-                async with self.bot.http_session.get(content['image_list'][0]) as response:
-                    stream.write(await response.read())
-
-            stream.seek(0)
-
-            func = partial(self._generate_card, stream, content)
-            final_buffer = await self.bot.loop.run_in_executor(None, func)
+            response = await self.bot.http_client.get(content['image_list'][0], timeout=10)
+            card = await self.bot.renderer.render(self._generate_card, response.body, content['info'])
 
         # Send it!
         await ctx.send(
             f"A wild {content['name'].title()} appears!",
-            file=File(final_buffer, filename=content['name'].replace(" ", "") + ".png")
+            file=File(BytesIO(card), filename=content['name'].replace(" ", "") + ".png")
         )
 
     @snakes_group.command(name='fact')
@@ -1091,7 +1106,7 @@ class Snakes(Cog):
 
         # Build the URL and make the request
         url = f'https://www.googleapis.com/youtube/v3/search'
-        response = await self.bot.http_session.get(
+        response = await self.bot.http_client.get_json(
             url,
             params={
                 "part": "snippet",
@@ -1100,7 +1115,6 @@ class Snakes(Cog):
                 "key": Tokens.youtube
             }
         )
-        response = await response.json()
         data = response['items']
 
         # Send the user a video
@@ -13,6 +13,8 @@ from PIL.ImageDraw import ImageDraw
 from discord import File, Member, Reaction
 from discord.ext.commands import Context
 
+from bot.seasons.evergreen.snakes.board import Token, render_board
+
 SNAKE_RESOURCES = Path("bot/resources/snakes").absolute()
 
 h1 = r'''```
@@ -166,6 +168,11 @@ class PerlinNoiseFactory(object):
 
         self.gradient = {}
 
+        # Offsets from the grid cell of a point to each of its corners, in the order product() visits them
+        self._corners = list(product((0, 1), repeat=dimension))
+        # The corners of every grid cell seen so far, along with their gradients
+        self._cells = {}
+
     def _generate_gradient(self):
         """
         Generate a random unit vector at each grid point.
@@ -186,30 +193,42 @@ class PerlinNoiseFactory(object):
         scale = sum(n * n for n in random_point) ** -0.5
         return tuple(coord * scale for coord in random_point)
 
-    def get_plain_noise(self, *point):
-        """Get plain noise for a single point, without taking into account either octaves or tiling."""
-        if len(point) != self.dimension:
-            raise ValueError("Expected {0} values, got {1}".format(
-                self.dimension, len(point)))
-
-        # Build a list of the (min, max) bounds in each dimension
-        grid_coords = []
-        for coord in point:
+    def _cell_corners(self, cell):
+        """Get the corners of a grid cell along with their gradients, generating any new gradients in order."""
+        corners = self._cells.get(cell)
+        if corners is None:
+            corners = []
+            for corner in self._corners:
+                grid_point = tuple(min_coord + offset for min_coord, offset in zip(cell, corner))
+                if grid_point not in self.gradient:
+                    self.gradient[grid_point] = self._generate_gradient()
+                corners.append((grid_point, self.gradient[grid_point]))
+            corners = self._cells[cell] = tuple(corners)
+        return corners
+
+    def _plain_noise(self, point):
+        """Get plain noise for a single point, given as a tuple with one coordinate per dimension."""
+        if self.dimension == 1:
+            # The common case of a single dimension, unrolled
+            (coord,) = point
             min_coord = math.floor(coord)
-            max_coord = min_coord + 1
-            grid_coords.append((min_coord, max_coord))
+            ((min_point, (min_gradient,)), (max_point, (max_gradient,))) = self._cell_corners((min_coord,))
+            return lerp(
+                smoothstep(coord - min_coord),
+                min_gradient * (coord - min_point[0]),
+                max_gradient * (coord - max_point[0]),
+            ) * self.scale_factor
+
+        cell = tuple([math.floor(coord) for coord in point])
 
         # Compute the dot product of each gradient vector and the point's
         # distance from the corresponding grid point.  This gives you each
         # gradient's "influence" on the chosen point.
+        dimensions = range(self.dimension)
         dots = []
-        for grid_point in product(*grid_coords):
-            if grid_point not in self.gradient:
-                self.gradient[grid_point] = self._generate_gradient()
-            gradient = self.gradient[grid_point]
-
+        for grid_point, gradient in self._cells.get(cell) or self._cell_corners(cell):
             dot = 0
-            for i in range(self.dimension):
+            for i in dimensions:
                 dot += gradient[i] * (point[i] - grid_point[i])
             dots.append(dot)
 
@@ -224,22 +243,13 @@ class PerlinNoiseFactory(object):
         dim = self.dimension
         while len(dots) > 1:
             dim -= 1
-            s = smoothstep(point[dim] - grid_coords[dim][0])
-
-            next_dots = []
-            while dots:
-                next_dots.append(lerp(s, dots.pop(0), dots.pop(0)))
-
-            dots = next_dots
+            s = smoothstep(point[dim] - cell[dim])
+            dots = [lerp(s, dots[i], dots[i + 1]) for i in range(0, len(dots), 2)]
 
         return dots[0] * self.scale_factor
 
-    def __call__(self, *point):
-        """
-        Get the value of this Perlin noise function at the given point.
-
-        The number of values given should match the number of dimensions.
-        """
+    def _noise(self, point):
+        """Get the value of this Perlin noise function at a single point, given as a tuple."""
         ret = 0
         for o in range(self.octaves):
             o2 = 1 << o
@@ -249,7 +259,7 @@ class PerlinNoiseFactory(object):
                 if self.tile[i]:
                     coord %= self.tile[i] * o2
                 new_point.append(coord)
-            ret += self.get_plain_noise(*new_point) / o2
+            ret += self._plain_noise(new_point) / o2
 
         # Need to scale n back down since adding all those extra octaves has
         # probably expanded it beyond ±1
@@ -272,6 +282,42 @@ class PerlinNoiseFactory(object):
 
         return ret
 
+    def _check_points(self, points):
+        """Make sure every point has a coordinate for each dimension, returning them as tuples."""
+        points = [tuple(point) for point in points]
+        for point in points:
+            if len(point) != self.dimension:
+                raise ValueError("Expected {0} values, got {1}".format(
+                    self.dimension, len(point)))
+        return points
+
+    def get_plain_noise(self, *point):
+        """Get plain noise for a single point, without taking into account either octaves or tiling."""
+        (point,) = self._check_points([point])
+        return self._plain_noise(point)
+
+    def get_plain_noise_batch(self, points):
+        """
+        Get plain noise for each of the given points, without taking into account either octaves or tiling.
+
+        Gradients are generated in the same order as when getting the noise of each point in turn,
+        so the results are the same for the same random seed.
+        """
+        return [self._plain_noise(point) for point in self._check_points(points)]
+
+    def noise_batch(self, points):
+        """Get the value of this Perlin noise function at each of the given points, in order."""
+        return [self._noise(point) for point in self._check_points(points)]
+
+    def __call__(self, *point):
+        """
+        Get the value of this Perlin noise function at the given point.
+
+        The number of values given should match the number of dimensions.
+        """
+        (point,) = self._check_points([point])
+        return self._noise(point)
+
 
 def create_snek_frame(
         perlin_factory: PerlinNoiseFactory, perlin_lookup_vertical_shift: float = 0,
@@ -304,10 +350,11 @@ def create_snek_frame(
     start_y = random.randint(image_margins[Y], image_dimensions[Y] - image_margins[Y])
     points = [(start_x, start_y)]
 
+    noise = perlin_factory.get_plain_noise_batch(
+        (((1 / (snake_length + 1)) * (index + 1)) + perlin_lookup_vertical_shift,) for index in range(snake_length)
+    )
     for index in range(0, snake_length):
-        angle = perlin_factory.get_plain_noise(
-            ((1 / (snake_length + 1)) * (index + 1)) + perlin_lookup_vertical_shift
-        ) * ANGLE_RANGE
+        angle = noise[index] * ANGLE_RANGE
         current_point = points[index]
         segment_length = random.randint(segment_length_range[0], segment_length_range[1])
         points.append((
@@ -360,6 +407,12 @@ def frame_to_png_bytes(image: Image) -> io.BytesIO:
     return stream
 
 
+def render_snek(**kwargs) -> bytes:
+    """Draw a random snek as a PNG, passing `kwargs` on to `create_snek_frame`. Runs in a rendering worker."""
+    factory = PerlinNoiseFactory(dimension=1, octaves=2)
+    return frame_to_png_bytes(create_snek_frame(factory, **kwargs)).getvalue()
+
+
 log = logging.getLogger(__name__)
 START_EMOJI = "\u2611"     # :ballot_box_with_check: - Start the game
 CANCEL_EMOJI = "\u274C"    # :x: - Cancel or leave the game
@@ -470,9 +523,7 @@ class SnakeAndLaddersGame:
         self.players.append(user)
         self.player_tiles[user.id] = 1
 
-        avatar_bytes = await user.avatar_url_as(format='jpeg', size=PLAYER_ICON_IMAGE_SIZE).read()
-        im = Image.open(io.BytesIO(avatar_bytes)).resize((BOARD_PLAYER_SIZE, BOARD_PLAYER_SIZE))
-        self.avatar_images[user.id] = im
+        self.avatar_images[user.id] = await self.ctx.bot.avatars.fetch(user, PLAYER_ICON_IMAGE_SIZE)
 
     async def player_join(self, user: Member):
         """
@@ -577,9 +628,7 @@ class SnakeAndLaddersGame:
         self.state = 'roll'
         for user in self.players:
             self.round_has_rolled[user.id] = False
-        # board_img = Image.open(os.path.join(
-        #     "bot", "resources", "snakes", "snakes_and_ladders", "board.jpg"))
-        board_img = Image.open(str(SNAKE_RESOURCES / "snakes_and_ladders" / "board.jpg"))
+        tokens = []
         player_row_size = math.ceil(MAX_PLAYERS / 2)
 
         for i, player in enumerate(self.players):
@@ -591,10 +640,10 @@ class SnakeAndLaddersGame:
                     (10 * BOARD_TILE_SIZE) - (9 - tile_coordinates[1]) * BOARD_TILE_SIZE - BOARD_PLAYER_SIZE)
             x_offset += BOARD_PLAYER_SIZE * (i % player_row_size)
             y_offset -= BOARD_PLAYER_SIZE * math.floor(i / player_row_size)
-            board_img.paste(self.avatar_images[player.id],
-                            box=(x_offset, y_offset))
+            tokens.append(Token(self.avatar_images[player.id], (x_offset, y_offset)))
 
-        board_file = File(frame_to_png_bytes(board_img), filename='Board.jpg')
+        board = await self.ctx.bot.renderer.render(render_board, self.ctx.message.id, tokens, BOARD_PLAYER_SIZE)
+        board_file = File(io.BytesIO(board), filename='Board.jpg')
         player_list = '\n'.join((user.mention + ": Tile " + str(self.player_tiles[user.id])) for user in self.players)
 
         # Store and send new messages
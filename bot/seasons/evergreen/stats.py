@@ -0,0 +1,205 @@
+import logging
+
+import discord
+from discord.ext import commands
+
+from bot.constants import Roles
+from bot.decorators import with_role
+from bot.utils.cache import caches
+
+log = logging.getLogger(__name__)
+
+# The most characters Discord allows in an embed's description
+EMBED_DESCRIPTION_LIMIT = 2048
+
+# How many offenders the blocking stats show at most, and how much of each one's stack
+MAX_OFFENDERS = 10
+STACK_LENGTH = 600
+
+
+class Stats(commands.Cog):
+    """Admin commands for inspecting the bot's performance."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @with_role(Roles.moderator, Roles.admin, Roles.owner)
+    @commands.group(name="stats", invoke_without_command=True)
+    async def stats_group(self, ctx):
+        """Commands for inspecting the bot's performance."""
+        await ctx.send_help(ctx.command)
+
+    @stats_group.command(name="startup")
+    async def startup_stats(self, ctx, count: int = 10):
+        """Shows the slowest extensions to load, as recorded by the startup profiler."""
+        profiler = self.bot.profiler
+        if not profiler:
+            await ctx.send("Startup profiling is disabled. Set `SEASONALBOT_PROFILE_STARTUP` to enable it.")
+            return
+
+        lines = []
+        for profile in profiler.report()[:count]:
+            name = profile.extension.replace("bot.seasons.", "")
+            lines.append(
+                f"`{name}`: {profile.total_time * 1000:.1f}ms "
+                f"(import {profile.import_time * 1000:.1f}ms, setup {profile.setup_time * 1000:.1f}ms, "
+                f"{profile.memory_delta // 1024:+}KB)"
+            )
+
+        embed = discord.Embed(description="\n".join(lines) or "No extensions profiled yet.", colour=ctx.guild.me.colour)
+        embed.set_author(name="Startup Profile")
+        if profiler.ready_time is not None:
+            embed.set_footer(text=f"Ready after {profiler.ready_time:.2f}s. Full report: {profiler.report_file}")
+        await ctx.send(embed=embed)
+
+    @stats_group.command(name="commands")
+    async def command_stats(self, ctx, count: int = 10):
+        """Shows the slowest commands by 95th percentile latency, with their HTTP and other time."""
+        metrics = self.bot.command_metrics
+
+        lines = []
+        for name in metrics.slowest()[:count]:
+            stats = metrics.commands[name]
+            lines.append(
+                f"`{name}`: {stats.invocations} calls, {stats.errors} errors\n"
+                f"p50 {stats.percentile(50) * 1000:.0f}ms, p95 {stats.percentile(95) * 1000:.0f}ms, "
+                f"p99 {stats.percentile(99) * 1000:.0f}ms, "
+                f"{stats.http_time:.1f}s on HTTP / {stats.other_time:.1f}s other"
+            )
+
+        embed = discord.Embed(description="\n\n".join(lines) or "No commands run yet.", colour=ctx.guild.me.colour)
+        embed.set_author(name="Command Latency")
+        await ctx.send(embed=embed)
+
+    @stats_group.command(name="http")
+    async def http_stats(self, ctx):
+        """Shows connection reuse, traffic and latency of the shared HTTP client for each host."""
+        metrics = self.bot.http_client.metrics
+
+        lines = []
+        for host, host_metrics in sorted(metrics.items(), key=lambda item: item[1].requests, reverse=True):
+            lines.append(
+                f"`{host}`: {host_metrics.requests} requests, {host_metrics.errors} errors, "
+                f"{host_metrics.retries} retries\n"
+                f"{host_metrics.handshakes} handshakes, {host_metrics.connections_reused} reused, "
+                f"{host_metrics.bytes_received // 1024}KB received, "
+                f"{host_metrics.latency_average * 1000:.0f}ms avg / {host_metrics.latency_max * 1000:.0f}ms max"
+            )
+
+        embed = discord.Embed(description="\n\n".join(lines) or "No requests made yet.", colour=ctx.guild.me.colour)
+        embed.set_author(name="HTTP Client")
+        await ctx.send(embed=embed)
+
+    @stats_group.command(name="cache")
+    async def cache_stats(self, ctx):
+        """Shows the hit and miss counters of every response cache."""
+        lines = []
+        for name, cache in sorted(caches.items()):
+            stats = cache.stats()
+            lines.append(
+                f"`{name}`: {stats['entries']} entries, {stats['hit_rate']:.0%} hit rate\n"
+                f"{stats['hits']} hits, {stats['negative_hits']} negative hits, {stats['misses']} misses, "
+                f"{stats['coalesced']} coalesced, {stats['evictions']} evictions"
+            )
+
+        embed = discord.Embed(description="\n\n".join(lines) or "No caches in use.", colour=ctx.guild.me.colour)
+        embed.set_author(name="Caches")
+        await ctx.send(embed=embed)
+
+    @stats_group.command(name="router")
+    async def router_stats(self, ctx):
+        """Shows how many messages were routed to each message handler."""
+        router = self.bot.message_router
+
+        lines = []
+        for route in router.routes:
+            channels = "any channel" if route.channels is None else f"{len(route.channels)} channels"
+            lines.append(f"`{route.name}` ({channels}): {router.dispatches[route.name]} messages")
+
+        description = "\n".join(lines) or "No message handlers registered."
+        embed = discord.Embed(description=description, colour=ctx.guild.me.colour)
+        embed.set_author(name="Message Router")
+        embed.set_footer(text=f"{router.messages} messages routed")
+        await ctx.send(embed=embed)
+
+    @stats_group.command(name="render")
+    async def render_stats(self, ctx):
+        """Shows how many images each render job has drawn, and how long they took."""
+        renderer = self.bot.renderer
+
+        lines = []
+        for name, stats in sorted(renderer.stats.items()):
+            average = stats.render_time / stats.jobs * 1000 if stats.jobs else 0
+            lines.append(
+                f"`{name.rsplit('.', 1)[-1]}`: {stats.jobs} rendered, {average:.0f}ms average, "
+                f"{stats.errors} errors, {stats.timeouts} timeouts, {stats.rejected} rejected"
+            )
+
+        description = "\n".join(lines) or "No images rendered yet."
+        embed = discord.Embed(description=description, colour=ctx.guild.me.colour)
+        embed.set_author(name="Image Rendering")
+        embed.set_footer(text=f"{renderer.workers} workers, {renderer.pending}/{renderer.max_queue} jobs pending")
+        await ctx.send(embed=embed)
+
+    @stats_group.command(name="lag")
+    async def lag_stats(self, ctx):
+        """Shows how late the event loop has been running scheduled callbacks."""
+        monitor = self.bot.loop_monitor
+        samples = sum(monitor.buckets)
+
+        description = (
+            f"p50 {monitor.percentile(50) * 1000:.1f}ms, p95 {monitor.percentile(95) * 1000:.1f}ms, "
+            f"p99 {monitor.percentile(99) * 1000:.1f}ms, max {monitor.lag_max * 1000:.1f}ms\n"
+            f"{samples} samples, one every {monitor.interval}s"
+        )
+
+        if not samples:
+            description = "No samples taken yet."
+
+        embed = discord.Embed(description=description, colour=ctx.guild.me.colour)
+        embed.set_author(name="Event Loop Lag")
+        await ctx.send(embed=embed)
+
+    @stats_group.command(name="blocking")
+    async def blocking_stats(self, ctx, count: int = 5):
+        """Shows the code which blocked the event loop for longest in total, with the last stack seen there."""
+        monitor = self.bot.loop_monitor
+        if not monitor.detecting:
+            await ctx.send("Blocking call detection is only enabled in debug mode.")
+            return
+
+        offenders = monitor.worst_offenders()[:max(1, min(count, MAX_OFFENDERS))]
+
+        # Share the embed's description between the offenders, cutting their stacks short to fit
+        share = EMBED_DESCRIPTION_LIMIT // max(1, len(offenders)) - 1
+        remaining = EMBED_DESCRIPTION_LIMIT
+        lines = []
+        for offender in offenders:
+            commands_seen = ", ".join(sorted(offender.commands)) or "no command"
+            line = (
+                f"`{offender.location}`: {offender.count} times, {offender.total * 1000:.0f}ms total, "
+                f"{offender.max * 1000:.0f}ms max ({commands_seen})"
+            )
+            stack = "".join(offender.last.stack[-3:])
+            stack_length = min(STACK_LENGTH, share - len(line) - len("\n```py\n```"))
+            if stack and stack_length > 0:
+                line += f"\n```py\n{stack[-stack_length:]}```"
+
+            if len(line) + 1 > remaining:
+                if lines:
+                    break
+                line = line[:remaining - 1]
+            lines.append(line)
+            remaining -= len(line) + 1
+
+        description = "\n".join(lines) or "Nothing has blocked the loop yet."
+        embed = discord.Embed(description=description, colour=ctx.guild.me.colour)
+        embed.set_author(name="Blocking Calls")
+        embed.set_footer(text=f"Threshold: {monitor.threshold * 1000:.0f}ms")
+        await ctx.send(embed=embed)
+
+
+def setup(bot):
+    """Stats Cog load."""
+    bot.add_cog(Stats(bot))
+    log.info("Stats cog loaded")
@@ -8,6 +8,7 @@ import discord
 from discord.ext import commands
 
 from bot.constants import Channels
+from bot.message_router import message_handler
 
 log = logging.getLogger(__name__)
 
@@ -33,16 +34,9 @@ class CandyCollection(commands.Cog):
             userid = userinfo['userid']
             self.get_candyinfo[userid] = userinfo
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
+    @message_handler(channels=[Channels.seasonalbot_chat])
+    async def random_candy_reaction(self, message):
         """Randomly adds candy or skull reaction to non-bot messages in the Event channel."""
-        # make sure its a human message
-        if message.author.bot:
-            return
-        # ensure it's hacktober channel
-        if message.channel.id != Channels.seasonalbot_chat:
-            return
-
         # do random check for skull first as it has the lower chance
         if random.randint(1, ADD_SKULL_REACTION_CHANCE) == 1:
             d = {"reaction": '\N{SKULL}', "msg_id": message.id, "won": False}
@@ -6,7 +6,6 @@ from collections import Counter
 from datetime import datetime
 from pathlib import Path
 
-import aiohttp
 import discord
 from discord.ext import commands
 
@@ -196,8 +195,7 @@ class HacktoberStats(commands.Cog):
         logging.info(f"Hacktoberfest PR built for GitHub user '{github_username}'")
         return stats_embed
 
-    @staticmethod
-    async def get_october_prs(github_username: str) -> typing.List[dict]:
+    async def get_october_prs(self, github_username: str) -> typing.List[dict]:
         """
         Query GitHub's API for PRs created during the month of October by github_username.
 
@@ -231,9 +229,7 @@ class HacktoberStats(commands.Cog):
         )
 
         headers = {"user-agent": "Discord Python Hactoberbot"}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(query_url, headers=headers) as resp:
-                jsonresp = await resp.json()
+        jsonresp = await self.bot.http_client.get_json(query_url, headers=headers)
 
         if "message" in jsonresp.keys():
             # One of the parameters is invalid, short circuit for now
@@ -2,10 +2,11 @@ import logging
 import random
 from os import environ
 
-import aiohttp
 from discord import Embed
 from discord.ext import commands
 
+from bot.utils.cache import async_cache
+
 log = logging.getLogger(__name__)
 
 
@@ -28,8 +29,12 @@ class ScaryMovie(commands.Cog):
 
         await ctx.send(embed=movie_details)
 
-    @staticmethod
-    async def select_movie():
+    @async_cache("scarymovie.tmdb", ttl=6 * 60 * 60, max_entries=128)
+    async def get_tmdb(self, url: str, params: dict, headers: dict = None) -> dict:
+        """Fetch a response from the TMDb API, cached for a few hours."""
+        return await self.bot.http_client.get_json(url, params=params, headers=headers)
+
+    async def select_movie(self):
         """Selects a random movie and returns a JSON of movie details from TMDb."""
         url = 'https://api.themoviedb.org/4/discover/movie'
         params = {
@@ -42,24 +47,19 @@ class ScaryMovie(commands.Cog):
         }
 
         # Get total page count of horror movies
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params, headers=headers)
-            total_pages = await response.json()
-            total_pages = total_pages.get('total_pages')
-
-            # Get movie details from one random result on a random page
-            params['page'] = random.randint(1, total_pages)
-            response = await session.get(url=url, params=params, headers=headers)
-            response = await response.json()
-            selection_id = random.choice(response.get('results')).get('id')
-
-            # Get full details and credits
-            selection = await session.get(
-                url='https://api.themoviedb.org/3/movie/' + str(selection_id),
-                params={'api_key': TMDB_API_KEY, 'append_to_response': 'credits'}
-            )
-
-            return await selection.json()
+        total_pages = await self.get_tmdb(url, params, headers)
+        total_pages = total_pages.get('total_pages')
+
+        # Get movie details from one random result on a random page
+        params['page'] = random.randint(1, total_pages)
+        response = await self.get_tmdb(url, params, headers)
+        selection_id = random.choice(response.get('results')).get('id')
+
+        # Get full details and credits
+        return await self.get_tmdb(
+            'https://api.themoviedb.org/3/movie/' + str(selection_id),
+            {'api_key': TMDB_API_KEY, 'append_to_response': 'credits'}
+        )
 
     @staticmethod
     async def format_metadata(movie):
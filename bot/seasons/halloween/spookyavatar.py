@@ -1,10 +1,7 @@
 import logging
-import os
 from io import BytesIO
 
-import aiohttp
 import discord
-from PIL import Image
 from discord.ext import commands
 
 from bot.utils.halloween import spookifications
@@ -18,12 +15,6 @@ class SpookyAvatar(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    async def get(self, url):
-        """Returns the contents of the supplied URL."""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                return await resp.read()
-
     @commands.command(name='savatar', aliases=('spookyavatar', 'spookify'),
                       brief='Spookify an user\'s avatar.')
     async def spooky_avatar(self, ctx, user: discord.Member = None):
@@ -36,15 +27,12 @@ class SpookyAvatar(commands.Cog):
             embed.title = "Is this you or am I just really paranoid?"
             embed.set_author(name=str(user.name), icon_url=user.avatar_url)
 
-            image_bytes = await ctx.author.avatar_url.read()
-            im = Image.open(BytesIO(image_bytes))
-            modified_im = spookifications.get_random_effect(im)
-            modified_im.save(str(ctx.message.id)+'.png')
-            f = discord.File(str(ctx.message.id)+'.png')
+            avatar = await self.bot.avatars.fetch(user, 1024)
+            modified_im = await self.bot.renderer.render(spookifications.render_spooky_avatar, avatar)
+            f = discord.File(BytesIO(modified_im), filename=str(ctx.message.id)+'.png')
             embed.set_image(url='attachment://'+str(ctx.message.id)+'.png')
 
         await ctx.send(file=f, embed=embed)
-        os.remove(str(ctx.message.id)+'.png')
 
 
 def setup(bot):
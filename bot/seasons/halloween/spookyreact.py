@@ -1,9 +1,12 @@
 import logging
 import re
+from typing import Match
 
 import discord
 from discord.ext.commands import Cog
 
+from bot.message_router import message_handler
+
 log = logging.getLogger(__name__)
 
 SPOOKY_TRIGGERS = {
@@ -16,6 +19,9 @@ SPOOKY_TRIGGERS = {
     'danger': (r"\bdanger\b", "\U00002620")
 }
 
+# All the triggers in one pattern, so a message is only scanned once. Each trigger is captured in its own group.
+SPOOKY_PATTERN = re.compile("|".join(f"({regex})" for regex, _ in SPOOKY_TRIGGERS.values()), re.IGNORECASE)
+
 
 class SpookyReact(Cog):
     """A cog that makes the bot react to message triggers."""
@@ -23,25 +29,25 @@ class SpookyReact(Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    @Cog.listener()
-    async def on_message(self, ctx: discord.Message):
+    @message_handler(pattern=SPOOKY_PATTERN, include_bots=True)
+    async def add_spooky_reactions(self, ctx: discord.Message, match: Match):
         """
-        A command to send the seasonalbot github project.
+        React to any spooky triggers in a message.
 
         Lines that begin with the bot's command prefix are ignored
 
         Seasonalbot's own messages are ignored
         """
-        for trigger in SPOOKY_TRIGGERS.keys():
-            trigger_test = re.search(SPOOKY_TRIGGERS[trigger][0], ctx.content.lower())
-            if trigger_test:
-                # Check message for bot replies and/or command invocations
-                # Short circuit if they're found, logging is handled in _short_circuit_check
-                if await self._short_circuit_check(ctx):
-                    return
-                else:
-                    await ctx.add_reaction(SPOOKY_TRIGGERS[trigger][1])
-                    logging.info(f"Added '{trigger}' reaction to message ID: {ctx.id}")
+        # Check message for bot replies and/or command invocations
+        # Short circuit if they're found, logging is handled in _short_circuit_check
+        if await self._short_circuit_check(ctx):
+            return
+
+        found = {trigger.lastindex for trigger in SPOOKY_PATTERN.finditer(ctx.content, match.start())}
+        for index, (trigger, (_, reaction)) in enumerate(SPOOKY_TRIGGERS.items(), start=1):
+            if index in found:
+                await ctx.add_reaction(reaction)
+                logging.info(f"Added '{trigger}' reaction to message ID: {ctx.id}")
 
     async def _short_circuit_check(self, ctx: discord.Message) -> bool:
         """
@@ -7,9 +7,13 @@ from PIL import Image, ImageDraw
 from discord.ext import commands
 
 from bot.constants import Colours
+from bot.utils.assets import ASSETS
+from bot.utils.avatars import Avatar
 
 log = logging.getLogger(__name__)
 
+FLAGS = Path("bot/resources/pride/flags")
+
 OPTIONS = {
     "agender": "agender",
     "androgyne": "androgyne",
@@ -59,23 +63,32 @@ class PrideAvatar(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    @staticmethod
+    def circle_mask(size):
+        """This creates a mask which crops an image of the given size into a circle."""
+        mask = Image.new("L", size, 0)
+        draw = ImageDraw.Draw(mask)
+        draw.ellipse((0, 0) + size, fill=255)
+        return mask
+
+    @staticmethod
+    def ring_mask(size, px):
+        """This creates a mask which crops an image of the given size into a ring px pixels thick."""
+        mask = PrideAvatar.circle_mask(size)
+        draw = ImageDraw.Draw(mask)
+        draw.ellipse((px, px, size[0]-px, size[1]-px), fill=0)
+        return mask
+
     @staticmethod
     def crop_avatar(avatar):
         """This crops the avatar into a circle."""
-        mask = Image.new("L", avatar.size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.ellipse((0, 0) + avatar.size, fill=255)
-        avatar.putalpha(mask)
+        avatar.putalpha(ASSETS.derived(("circle mask", avatar.size), lambda: PrideAvatar.circle_mask(avatar.size)))
         return avatar
 
     @staticmethod
     def crop_ring(ring, px):
         """This crops the ring into a circle."""
-        mask = Image.new("L", ring.size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.ellipse((0, 0) + ring.size, fill=255)
-        draw.ellipse((px, px, 1024-px, 1024-px), fill=0)
-        ring.putalpha(mask)
+        ring.putalpha(ASSETS.derived(("ring mask", ring.size, px), lambda: PrideAvatar.ring_mask(ring.size, px)))
         return ring
 
     @commands.group(aliases=["avatarpride", "pridepfp", "prideprofile"], invoke_without_command=True)
@@ -99,23 +112,14 @@ class PrideAvatar(commands.Cog):
 
         async with ctx.typing():
 
-            # Get avatar bytes
-            image_bytes = await ctx.author.avatar_url.read()
-            avatar = Image.open(BytesIO(image_bytes))
-            avatar = avatar.convert("RGBA").resize((1024, 1024))
-
-            avatar = self.crop_avatar(avatar)
+            async def render():
+                avatar = await self.bot.avatars.fetch(ctx.author, 1024)
+                return await self.bot.renderer.render(render_pride_avatar, avatar, flag, pixels)
 
-            ring = Image.open(Path(f"bot/resources/pride/flags/{flag}.png")).resize((1024, 1024))
-            ring = ring.convert("RGBA")
-            ring = self.crop_ring(ring, pixels)
+            key = ("prideavatar", self.bot.avatars.identity(ctx.author), flag, pixels)
+            image = await self.bot.render_cache.get_or_render(key, render)
 
-            avatar.alpha_composite(ring, (0, 0))
-            bufferedio = BytesIO()
-            avatar.save(bufferedio, format="PNG")
-            bufferedio.seek(0)
-
-            file = discord.File(bufferedio, filename="pride_avatar.png")  # Creates file to be used in embed
+            file = discord.File(BytesIO(image), filename="pride_avatar.png")  # Creates file to be used in embed
             embed = discord.Embed(
                 name="Your Lovely Pride Avatar",
                 description=f"Here is your lovely avatar, surrounded by\n a beautiful {option} flag. Enjoy :D"
@@ -139,6 +143,21 @@ class PrideAvatar(commands.Cog):
         await ctx.send(embed=embed)
 
 
+def render_pride_avatar(avatar: Avatar, flag: str, pixels: int) -> bytes:
+    """Surround an avatar with a ring of the given flag, returning it as a PNG. Runs in a rendering worker."""
+    avatar = avatar.open().resize((1024, 1024))
+
+    avatar = PrideAvatar.crop_avatar(avatar)
+
+    ring = ASSETS.image(FLAGS / f"{flag}.png", size=(1024, 1024), mode="RGBA").copy()
+    ring = PrideAvatar.crop_ring(ring, pixels)
+
+    avatar.alpha_composite(ring, (0, 0))
+    bufferedio = BytesIO()
+    avatar.save(bufferedio, format="PNG")
+    return bufferedio.getvalue()
+
+
 def setup(bot):
     """Cog load."""
     bot.add_cog(PrideAvatar(bot))
@@ -1,4 +1,5 @@
 import asyncio
+import bisect
 import contextlib
 import datetime
 import importlib
@@ -6,7 +7,7 @@ import inspect
 import logging
 import pkgutil
 from pathlib import Path
-from typing import List, Optional, Tuple, Type, Union
+from typing import Dict, List, NamedTuple, Optional, Tuple, Type, Union
 
 import async_timeout
 import discord
@@ -14,11 +15,17 @@ from discord.ext import commands
 
 from bot.constants import Channels, Client, Roles, bot
 from bot.decorators import with_role
+from bot.utils.branding import BrandingCache
 
 log = logging.getLogger(__name__)
 
 ICON_BASE_URL = "https://raw.githubusercontent.com/python-discord/branding/master"
 
+branding = BrandingCache(ICON_BASE_URL)
+
+# Seconds to wait after a season is loaded before prefetching the next season's assets
+PREFETCH_DELAY = 10 * 60
+
 
 def get_seasons() -> List[str]:
     """Returns all the Season objects located in /bot/seasons/."""
@@ -37,14 +44,131 @@ def get_season_class(season_name: str) -> Type["SeasonBase"]:
     return getattr(season_lib, class_name)
 
 
+class SeasonInterval(NamedTuple):
+    """A single dated occurrence of a season within the calendar index."""
+
+    start: datetime.datetime
+    end: datetime.datetime
+    season: Type["SeasonBase"]
+
+
+class SeasonRegistry:
+    """
+    Calendar of all the available seasons, built once and shared by the season manager.
+
+    Season packages are discovered and imported a single time. Every dated season is expanded into
+    an interval for the current and the next year, and those intervals are kept sorted by start date
+    so the active season for any date can be found with a binary search. The index is rebuilt
+    lazily whenever a date outside of the indexed years is looked up, e.g. after a new year.
+    """
+
+    def __init__(self):
+        self._classes: Dict[str, Type["SeasonBase"]] = {}
+        self._sorted: List[Type["SeasonBase"]] = []
+        self._intervals: List[SeasonInterval] = []
+        self._starts: List[datetime.datetime] = []
+        self._years: Tuple[int, ...] = ()
+
+    @property
+    def names(self) -> List[str]:
+        """Return the names of every season package."""
+        if not self._classes:
+            self._discover()
+        return list(self._classes)
+
+    @property
+    def seasons(self) -> List[Type["SeasonBase"]]:
+        """Return every season class, sorted by start date followed by lower duration."""
+        if not self._classes:
+            self._discover()
+        return list(self._sorted)
+
+    def _discover(self):
+        """Import each season package once and cache its season class."""
+        def season_key(season_class: Type["SeasonBase"]) -> Tuple[datetime.datetime, datetime.timedelta]:
+            return season_class.start(), season_class.end() - datetime.datetime.max
+
+        self._classes = {name: get_season_class(name) for name in get_seasons()}
+        self._sorted = sorted(self._classes.values(), key=season_key)
+        log.debug(f"Season registry discovered {len(self._classes)} seasons")
+
+    def get_class(self, season_name: str) -> Type["SeasonBase"]:
+        """Return the season class for `season_name`, falling back to evergreen if it doesn't exist."""
+        if not self._classes:
+            self._discover()
+        return self._classes.get(season_name, self._classes["evergreen"])
+
+    def _build(self, year: int):
+        """Build the sorted interval index for the given year and the one after it."""
+        if not self._classes:
+            self._discover()
+
+        intervals = []
+        for season_class in self._classes.values():
+            if not (season_class.start_date and season_class.end_date):
+                continue
+            for indexed_year in (year, year + 1):
+                start = season_class.start(year=indexed_year)
+                end = season_class.end(year=indexed_year)
+                intervals.append(SeasonInterval(start, end, season_class))
+
+        intervals.sort(key=lambda interval: (interval.start, interval.end))
+        self._intervals = intervals
+        self._starts = [interval.start for interval in intervals]
+        self._years = (year, year + 1)
+        log.debug(f"Season calendar index built for {year}-{year + 1} with {len(intervals)} intervals")
+
+    def lookup(self, date: datetime.datetime) -> Optional[SeasonInterval]:
+        """Return the indexed interval containing `date`, or None if no dated season is active."""
+        if date.year not in self._years:
+            self._build(date.year)
+
+        position = bisect.bisect_right(self._starts, date) - 1
+        if position < 0:
+            return None
+
+        # Seasons don't overlap, so the closest preceding start is the only possible match.
+        interval = self._intervals[position]
+        if date <= interval.end:
+            return interval
+        return None
+
+    def next_season(self, date: datetime.datetime) -> Optional[Type["SeasonBase"]]:
+        """Return the first dated season starting after `date`, or None if there are no dated seasons."""
+        # The following year has to be indexed as well for the search to wrap around new year
+        if self._years[:1] != (date.year,):
+            self._build(date.year)
+
+        position = bisect.bisect_right(self._starts, date)
+        if position == len(self._intervals):
+            return None
+        return self._intervals[position].season
+
+    def season_for(self, date: datetime.datetime) -> Type["SeasonBase"]:
+        """Return the season class active on `date`, falling back to evergreen."""
+        interval = self.lookup(date)
+        if interval is None:
+            return self.get_class("evergreen")
+        return interval.season
+
+    def is_active(self, season_class: Type["SeasonBase"], date: datetime.datetime) -> bool:
+        """Determines if `season_class` covers `date`, treating undated seasons as always active."""
+        if not (season_class.start_date and season_class.end_date):
+            return season_class.is_between_dates(date)
+
+        interval = self.lookup(date)
+        return interval is not None and interval.season is season_class
+
+
+registry = SeasonRegistry()
+
+
 def get_season(season_name: str = None, date: datetime.datetime = None) -> "SeasonBase":
     """Returns a Season object based on either a string or a date."""
     # If either both or neither are set, raise an error.
     if not bool(season_name) ^ bool(date):
         raise UserWarning("This function requires either a season or a date in order to run.")
 
-    seasons = get_seasons()
-
     # Use season override if season name not provided
     if not season_name and Client.season_override:
         log.debug(f"Season override found: {Client.season_override}")
@@ -52,22 +176,12 @@ def get_season(season_name: str = None, date: datetime.datetime = None) -> "Seas
 
     # If name provided grab the specified class or fallback to evergreen.
     if season_name:
-        season_name = season_name.lower()
-        if season_name not in seasons:
-            season_name = "evergreen"
-        season_class = get_season_class(season_name)
+        season_class = registry.get_class(season_name.lower())
         return season_class()
 
     # If not, we have to figure out if the date matches any of the seasons.
-    seasons.remove("evergreen")
-    for season_name in seasons:
-        season_class = get_season_class(season_name)
-        # check if date matches before returning an instance
-        if season_class.is_between_dates(date):
-            return season_class()
-    else:
-        evergreen_class = get_season_class("evergreen")
-        return evergreen_class()
+    season_class = registry.season_for(date)
+    return season_class()
 
 
 class SeasonBase:
@@ -93,32 +207,42 @@ class SeasonBase:
         return datetime.date.today().year
 
     @classmethod
-    def start(cls) -> datetime.datetime:
+    def start(cls, year: int = None) -> datetime.datetime:
         """
-        Returns the start date using current year and start_date attribute.
+        Returns the start date using the given year (or current year) and start_date attribute.
 
         If no start_date was defined, returns the minimum datetime to ensure it's always below checked dates.
         """
         if not cls.start_date:
             return datetime.datetime.min
-        return datetime.datetime.strptime(f"{cls.start_date}/{cls.current_year()}", cls.date_format)
+        year = year or cls.current_year()
+        return datetime.datetime.strptime(f"{cls.start_date}/{year}", cls.date_format)
 
     @classmethod
-    def end(cls) -> datetime.datetime:
+    def end(cls, year: int = None) -> datetime.datetime:
         """
-        Returns the start date using current year and end_date attribute.
+        Returns the end date using the given year (or current year) and end_date attribute.
 
-        If no end_date was defined, returns the minimum datetime to ensure it's always above checked dates.
+        If no end_date was defined, returns the maximum datetime to ensure it's always above checked dates.
         """
         if not cls.end_date:
             return datetime.datetime.max
-        return datetime.datetime.strptime(f"{cls.end_date}/{cls.current_year()}", cls.date_format)
+        year = year or cls.current_year()
+        return datetime.datetime.strptime(f"{cls.end_date}/{year}", cls.date_format)
 
     @classmethod
     def is_between_dates(cls, date: datetime.datetime) -> bool:
         """Determines if the given date falls between the season's date range."""
         return cls.start() <= date <= cls.end()
 
+    @classmethod
+    def asset_paths(cls) -> List[str]:
+        """Returns the relative URL paths of every branding asset used by the season."""
+        paths = list(cls.icon)
+        if cls.bot_icon:
+            paths.append(cls.bot_icon)
+        return paths
+
     @property
     def name_clean(self) -> str:
         """Return the Season's name with underscores replaced by whitespace."""
@@ -138,6 +262,9 @@ class SeasonBase:
         """
         Retrieve the season's icon from the branding repository using the Season's icon attribute.
 
+        Icons are served from the local branding cache, which is revalidated against the repository
+        once the cached copy goes stale.
+
         This also returns the relative URL path for logging purposes
         If `avatar` is True, uses optional bot-only avatar icon if present.
         Returns the data for the given `index`, defaulting to the first item.
@@ -150,10 +277,7 @@ class SeasonBase:
         if avatar and self.bot_icon:
             icon = self.bot_icon
 
-        full_url = ICON_BASE_URL + icon
-        log.debug(f"Getting icon from: {full_url}")
-        async with bot.http_session.get(full_url) as resp:
-            return (await resp.read(), icon)
+        return (await branding.get(bot.http_client, icon), icon)
 
     async def apply_username(self, *, debug: bool = False) -> Union[bool, None]:
         """
@@ -335,8 +459,14 @@ class SeasonBase:
                 for ext_name in [i[1] for i in pkgutil.iter_modules([path])]:
                     extensions.append(f"bot.seasons.{ext_folder}.{ext_name}")
 
-        # Finally we can load all the cogs we've prepared.
-        bot.load_extensions(extensions)
+        # Finally we can load all the cogs we've prepared, leaving the already loaded ones alone.
+        load_times = bot.load_extensions(extensions)
+        if load_times:
+            slowest = max(load_times, key=load_times.get)
+            log.info(
+                f"Loaded {len(load_times)} extensions in {sum(load_times.values()) * 1000:.1f}ms, "
+                f"slowest was {slowest} ({load_times[slowest] * 1000:.1f}ms)."
+            )
 
         # Apply seasonal elements after extensions successfully load
         username_changed = await self.apply_username(debug=Client.debug)
@@ -356,6 +486,10 @@ class SeasonBase:
 
         await bot.send_log("SeasonalBot Loaded!", f"Active Season: **{self.name_clean}**")
 
+        if bot.profiler:
+            bot.profiler.mark_ready()
+            await bot.loop.run_in_executor(None, bot.profiler.save)
+
 
 class SeasonManager(commands.Cog):
     """A cog for managing seasons."""
@@ -364,6 +498,7 @@ class SeasonManager(commands.Cog):
         self.bot = bot
         self.season = get_season(date=datetime.datetime.utcnow())
         self.season_task = bot.loop.create_task(self.load_seasons())
+        self.prefetch_task = None
 
         # Figure out number of seconds until a minute past midnight
         tomorrow = datetime.datetime.now() + datetime.timedelta(1)
@@ -381,6 +516,7 @@ class SeasonManager(commands.Cog):
         """Asynchronous timer loop to check for a new season every midnight."""
         await self.bot.wait_until_ready()
         await self.season.load()
+        self.schedule_prefetch()
 
         while True:
             await asyncio.sleep(self.sleep_time)  # Sleep until midnight
@@ -393,6 +529,31 @@ class SeasonManager(commands.Cog):
                 await self.season.load()
             else:
                 await self.season.change_server_icon()
+            self.schedule_prefetch()
+
+    def schedule_prefetch(self):
+        """Start prefetching the upcoming seasons' assets, replacing any prefetch already pending."""
+        if self.prefetch_task and not self.prefetch_task.done():
+            self.prefetch_task.cancel()
+        self.prefetch_task = self.bot.loop.create_task(self.prefetch_assets())
+
+    async def prefetch_assets(self):
+        """
+        Warm the branding cache with the assets of the next season in the calendar.
+
+        This waits a while first, so the prefetch happens while the bot is otherwise idle rather than
+        competing with a season load. Evergreen assets are included, as evergreen follows every season.
+        """
+        await asyncio.sleep(PREFETCH_DELAY)
+
+        upcoming = [registry.next_season(datetime.datetime.utcnow()), registry.get_class("evergreen")]
+        paths = []
+        for season_class in upcoming:
+            if season_class and season_class.name != self.season.name:
+                paths.extend(season_class.asset_paths())
+
+        log.info(f"Prefetching {len(paths)} branding assets for upcoming seasons.")
+        await branding.prefetch(self.bot.http_client, paths)
 
     @with_role(Roles.moderator, Roles.admin, Roles.owner)
     @commands.command(name="season")
@@ -406,17 +567,13 @@ class SeasonManager(commands.Cog):
     @commands.command(name="seasons")
     async def show_seasons(self, ctx):
         """Shows the available seasons and their dates."""
-        # Sort by start order, followed by lower duration
-        def season_key(season_class: Type[SeasonBase]):
-            return season_class.start(), season_class.end() - datetime.datetime.max
-
         current_season = self.season.name
+        now = datetime.datetime.utcnow()
 
         forced_space = "\u200b "
 
         entries = []
-        seasons = [get_season_class(s) for s in get_seasons()]
-        for season in sorted(seasons, key=season_key):
+        for season in registry.seasons:
             start = season.start_date
             end = season.end_date
             if start and not end:
@@ -429,7 +586,7 @@ class SeasonManager(commands.Cog):
                 period = f"{start} to {end}"
 
             # Bold period if current date matches season date range
-            is_current = season.is_between_dates(datetime.datetime.utcnow())
+            is_current = registry.is_active(season, now)
             pdec = "**" if is_current else ""
 
             # Underline currently active season
@@ -545,3 +702,5 @@ class SeasonManager(commands.Cog):
     def cog_unload(self):
         """Cancel season-related tasks on cog unload."""
         self.season_task.cancel()
+        if self.prefetch_task:
+            self.prefetch_task.cancel()
@@ -6,6 +6,8 @@ from urllib import parse
 import discord
 from discord.ext import commands
 
+from bot.utils.cache import async_cache
+
 TMDB_API_KEY = environ.get("TMDB_API_KEY")
 
 log = logging.getLogger(__name__)
@@ -17,6 +19,12 @@ class RomanceMovieFinder(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    @async_cache("romancemovie.tmdb", ttl=6 * 60 * 60, max_entries=32)
+    async def get_page(self, request_url: str) -> dict:
+        """Fetch a page of romance movies from the TMDb API, cached for a few hours."""
+        resp = await self.bot.http_client.get(request_url)
+        return resp.json()
+
     @commands.command(name="romancemovie")
     async def romance_movie(self, ctx):
         """Randomly selects a romance movie and displays information about it."""
@@ -34,27 +42,26 @@ class RomanceMovieFinder(commands.Cog):
         }
         # The api request url
         request_url = "https://api.themoviedb.org/3/discover/movie?" + parse.urlencode(params)
-        async with self.bot.http_session.get(request_url) as resp:
-            # Trying to load the json file returned from the api
-            try:
-                data = await resp.json()
-                # Selecting random result from results object in the json file
-                selected_movie = random.choice(data["results"])
-
-                embed = discord.Embed(
-                    title=f":sparkling_heart: {selected_movie['title']} :sparkling_heart:",
-                    description=selected_movie["overview"],
-                )
-                embed.set_image(url=f"http://image.tmdb.org/t/p/w200/{selected_movie['poster_path']}")
-                embed.add_field(name="Release date :clock1:", value=selected_movie["release_date"])
-                embed.add_field(name="Rating :star2:", value=selected_movie["vote_average"])
-                await ctx.send(embed=embed)
-            except KeyError:
-                warning_message = "A KeyError was raised while fetching information on the movie. The API service" \
-                                  " could be unavailable or the API key could be set incorrectly."
-                embed = discord.Embed(title=warning_message)
-                log.warning(warning_message)
-                await ctx.send(embed=embed)
+        # Trying to load the json file returned from the api
+        try:
+            data = await self.get_page(request_url)
+            # Selecting random result from results object in the json file
+            selected_movie = random.choice(data["results"])
+
+            embed = discord.Embed(
+                title=f":sparkling_heart: {selected_movie['title']} :sparkling_heart:",
+                description=selected_movie["overview"],
+            )
+            embed.set_image(url=f"http://image.tmdb.org/t/p/w200/{selected_movie['poster_path']}")
+            embed.add_field(name="Release date :clock1:", value=selected_movie["release_date"])
+            embed.add_field(name="Rating :star2:", value=selected_movie["vote_average"])
+            await ctx.send(embed=embed)
+        except KeyError:
+            warning_message = "A KeyError was raised while fetching information on the movie. The API service" \
+                              " could be unavailable or the API key could be set incorrectly."
+            embed = discord.Embed(title=warning_message)
+            log.warning(warning_message)
+            await ctx.send(embed=embed)
 
 
 def setup(bot):
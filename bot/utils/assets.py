@@ -0,0 +1,82 @@
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Hashable, Tuple, Union
+
+from PIL import Image
+
+from bot.constants import Rendering
+
+log = logging.getLogger(__name__)
+
+__all__ = ("ASSETS", "AssetRegistry")
+
+
+def _image_size(image: Image.Image) -> int:
+    """Return roughly how many bytes an image's pixels take up in memory."""
+    return image.width * image.height * len(image.getbands())
+
+
+class AssetRegistry:
+    """
+    Keeps decoded image assets, resized variants of them and images derived from them in memory.
+
+    Everything is held in a single LRU, evicting the least recently used images once their pixels
+    take up more than `budget` bytes. The images returned are shared, so they must be copied before
+    being modified in place.
+
+    Every process has its own registry, so each rendering worker decodes an asset the first time
+    one of its jobs needs it, and reuses it for every job after that.
+    """
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.size = 0
+        self._images: "OrderedDict[Hashable, Image.Image]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _store(self, key: Hashable, image: Image.Image):
+        self._images[key] = image
+        self.size += _image_size(image)
+
+        while self.size > self.budget and len(self._images) > 1:
+            evicted_key, evicted = self._images.popitem(last=False)
+            self.size -= _image_size(evicted)
+            self.evictions += 1
+            log.trace(f"Evicted {evicted_key} from the asset registry")
+
+    def derived(self, key: Hashable, factory: Callable[[], Image.Image]) -> Image.Image:
+        """Return the image stored under `key`, creating it with `factory` if it isn't cached."""
+        try:
+            image = self._images[key]
+        except KeyError:
+            self.misses += 1
+            image = factory()
+            image.load()
+            self._store(key, image)
+        else:
+            self.hits += 1
+            self._images.move_to_end(key)
+        return image
+
+    def image(self, path: Union[str, Path], size: Tuple[int, int] = None, mode: str = None) -> Image.Image:
+        """Return the image at `path`, decoded once, optionally resized to `size` and then converted to `mode`."""
+        path = str(path)
+        if size is None and mode is None:
+            return self.derived(path, lambda: Image.open(path))
+
+        def variant() -> Image.Image:
+            image = self.image(path)
+            if size is not None:
+                image = image.resize(size)
+            if mode is not None:
+                image = image.convert(mode)
+            return image
+
+        return self.derived((path, size, mode), variant)
+
+
+ASSETS = AssetRegistry(Rendering.asset_budget)
@@ -0,0 +1,86 @@
+import logging
+from io import BytesIO
+from typing import Hashable, NamedTuple, Optional
+
+import discord
+from PIL import Image
+
+from bot.http_client import HTTPClient
+from bot.utils.cache import AsyncCache
+
+log = logging.getLogger(__name__)
+
+__all__ = ("Avatar", "AvatarService")
+
+# The sizes Discord's CDN can serve avatars in
+AVATAR_SIZES = tuple(2 ** exponent for exponent in range(4, 13))
+
+# Avatars are keyed by their hash, so a cached avatar only goes stale when it's evicted
+AVATAR_TTL = 60 * 60
+
+
+class Avatar(NamedTuple):
+    """A user's avatar, as downloaded from the CDN in one of `AVATAR_SIZES`."""
+
+    user_id: int
+    hash: Optional[str]
+    size: int
+    data: bytes
+
+    @property
+    def key(self) -> Hashable:
+        """Return the key identifying this avatar at this size."""
+        return self.user_id, self.hash, self.size
+
+    def open(self) -> Image.Image:
+        """
+        Decode the avatar as an RGBA image, reusing an earlier decode from the same process.
+
+        The image is shared, so it must be copied before being modified in place.
+        """
+        # The asset registry is configured from the constants, which can't be imported before the bot
+        from bot.utils.assets import ASSETS
+
+        return ASSETS.derived(("avatar", *self.key), lambda: Image.open(BytesIO(self.data)).convert("RGBA"))
+
+
+class AvatarService:
+    """
+    Downloads avatars at the smallest CDN size a command needs, caching them by user, hash and size.
+
+    Concurrent requests for the same avatar share a single download, and the cache is bounded by
+    the total size of the avatars in it.
+    """
+
+    def __init__(self, http_client: HTTPClient, max_bytes: int):
+        self.http_client = http_client
+        self.cache = AsyncCache(
+            "avatars",
+            ttl=AVATAR_TTL,
+            max_entries=1024,
+            max_bytes=max_bytes,
+            sizeof=lambda avatar: len(avatar.data),
+        )
+
+    @staticmethod
+    def cdn_size(size: int) -> int:
+        """Return the smallest size the CDN serves which is at least `size` pixels, or its largest."""
+        return next((cdn_size for cdn_size in AVATAR_SIZES if cdn_size >= size), AVATAR_SIZES[-1])
+
+    @staticmethod
+    def identity(user: discord.abc.User) -> str:
+        """Return a string identifying the image of a user's avatar, for use in cache keys."""
+        return user.avatar or f"default-{user.default_avatar.value}"
+
+    async def fetch(self, user: discord.abc.User, size: int) -> Avatar:
+        """Return the avatar of `user`, at least `size` pixels wide where possible."""
+        size = self.cdn_size(size)
+        return await self.cache.get_or_fetch((user.id, user.avatar, size), lambda: self._download(user, size))
+
+    async def _download(self, user: discord.abc.User, size: int) -> Avatar:
+        url = str(user.avatar_url_as(static_format="png", size=size))
+        response = await self.http_client.get(url)
+        response.raise_for_status()
+
+        log.trace(f"Downloaded the {size}px avatar of {user} ({len(response.body)} bytes)")
+        return Avatar(user.id, user.avatar, size, response.body)
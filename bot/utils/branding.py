@@ -0,0 +1,153 @@
+import asyncio
+import datetime
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import aiohttp
+
+from bot.http_client import HTTPClient
+
+log = logging.getLogger(__name__)
+
+CACHE_DIR = Path("bot/resources/persist/branding")
+
+# Assets validated more recently than this are served straight from disk without a network request
+FRESH_FOR = datetime.timedelta(hours=12)
+
+
+class BrandingCache:
+    """
+    A content-addressed on-disk cache for assets from the branding repository.
+
+    Asset bodies are stored once under their SHA-256 digest, and an index maps each relative URL
+    path to its digest along with the `ETag` and `Last-Modified` headers it was served with. Stale
+    entries are revalidated with a conditional request, so unchanged assets never get downloaded
+    twice. If the branding repository can't be reached, the last cached copy is used instead.
+    """
+
+    def __init__(self, base_url: str, cache_dir: Path = CACHE_DIR):
+        self.base_url = base_url
+        self.cache_dir = cache_dir
+        self.objects_dir = cache_dir / "objects"
+        self.index_file = cache_dir / "index.json"
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index: Dict[str, dict] = self._read_index()
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+        # Assets are fetched concurrently, but the index is written through a single temporary file.
+        # The lock is created on first use, as the cache is created before the event loop runs
+        self._index_lock: Optional[asyncio.Lock] = None
+
+    def _read_index(self) -> Dict[str, dict]:
+        """Load the index of cached assets, starting afresh if it is missing or corrupted."""
+        try:
+            with self.index_file.open("r", encoding="utf8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index: Dict[str, dict]):
+        """Atomically persist `index`, a snapshot of the index of cached assets."""
+        temp_file = self.index_file.with_suffix(".tmp")
+        with temp_file.open("w", encoding="utf8") as f:
+            json.dump(index, f, indent=2)
+        temp_file.replace(self.index_file)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest
+
+    def _read_object(self, digest: str) -> Optional[bytes]:
+        try:
+            return self._object_path(digest).read_bytes()
+        except OSError:
+            return None
+
+    def _write_object(self, data: bytes) -> str:
+        """Store `data` under its digest, returning the digest. Identical content is only stored once."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            temp_file = path.with_suffix(".tmp")
+            temp_file.write_bytes(data)
+            temp_file.replace(path)
+        return digest
+
+    @staticmethod
+    def _is_fresh(entry: dict) -> bool:
+        checked = datetime.datetime.fromisoformat(entry["checked"])
+        return datetime.datetime.utcnow() - checked < FRESH_FOR
+
+    async def get(self, client: HTTPClient, path: str, *, revalidate: bool = False) -> bytes:
+        """
+        Return the asset at the relative URL `path`, using the local copy whenever possible.
+
+        Fresh assets are read from disk. Stale assets, or any asset if `revalidate` is True, are
+        checked against the branding repository with `If-None-Match`/`If-Modified-Since` first.
+        """
+        lock = self._locks.setdefault(path, asyncio.Lock())
+        async with lock:
+            loop = asyncio.get_event_loop()
+            entry = self.index.get(path)
+
+            cached = None
+            if entry:
+                cached = await loop.run_in_executor(None, self._read_object, entry["sha256"])
+                if cached is not None and not revalidate and self._is_fresh(entry):
+                    log.trace(f"Branding cache hit: {path}")
+                    return cached
+
+            headers = {}
+            if cached is not None:
+                if entry.get("etag"):
+                    headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    headers["If-Modified-Since"] = entry["last_modified"]
+
+            full_url = self.base_url + path
+            log.debug(f"Getting icon from: {full_url}")
+            try:
+                resp = await client.get(full_url, headers=headers)
+                if resp.status == 304 and cached is not None:
+                    log.debug(f"Branding asset not modified: {path}")
+                    data = cached
+                else:
+                    resp.raise_for_status()
+                    data = resp.body
+                etag = resp.headers.get("ETag", entry and entry.get("etag"))
+                last_modified = resp.headers.get("Last-Modified", entry and entry.get("last_modified"))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if cached is None:
+                    raise
+                log.warning(f"Failed to revalidate branding asset {path}, using cached copy: {e}")
+                return cached
+
+            digest = await loop.run_in_executor(None, self._write_object, data)
+            self.index[path] = {
+                "sha256": digest,
+                "etag": etag,
+                "last_modified": last_modified,
+                "checked": datetime.datetime.utcnow().isoformat(),
+            }
+            await self._save_index()
+            return data
+
+    async def _save_index(self):
+        """Persist a snapshot of the index in an executor, one write at a time, so the latest one lands last."""
+        if self._index_lock is None:
+            self._index_lock = asyncio.Lock()
+        async with self._index_lock:
+            await asyncio.get_event_loop().run_in_executor(None, self._write_index, dict(self.index))
+
+    async def prefetch(self, client: HTTPClient, paths: Iterable[str]):
+        """Revalidate and store each of `paths` one at a time, so a later `get` is a disk read."""
+        for path in paths:
+            try:
+                await self.get(client, path, revalidate=True)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                log.warning(f"Failed to prefetch branding asset {path}: {e}")
+            else:
+                log.debug(f"Prefetched branding asset: {path}")
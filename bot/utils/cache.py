@@ -0,0 +1,215 @@
+import asyncio
+import functools
+import inspect
+import logging
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional
+
+log = logging.getLogger(__name__)
+
+__all__ = ("AsyncCache", "async_cache", "caches")
+
+# Every cache by name, so their counters can be inspected from one place
+caches: Dict[str, "AsyncCache"] = {}
+
+
+def approximate_size(value: Any) -> int:
+    """Return a rough estimate of the memory used by `value`, following JSON-like containers."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approximate_size(k) + approximate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item) for item in value)
+    return size
+
+
+def make_key(args: tuple, kwargs: dict) -> Hashable:
+    """Build a hashable cache key from call arguments, converting dicts and lists along the way."""
+    def freeze(value: Any) -> Hashable:
+        if isinstance(value, dict):
+            return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+        if isinstance(value, (list, set)):
+            return tuple(freeze(item) for item in value)
+        return value
+
+    return freeze(args), freeze(kwargs)
+
+
+class CacheEntry(NamedTuple):
+    """A cached value along with its expiry time and bookkeeping."""
+
+    value: Any
+    expires: float
+    size: int
+    negative: bool
+
+
+class AsyncCache:
+    """
+    An asynchronous TTL cache bounded by entry count and approximate size, evicting the least recently used.
+
+    Concurrent misses for the same key are coalesced, so only the first caller runs the fetch and
+    every other caller waits for its result. Values matching `is_negative` (e.g. a 404 response) are
+    cached for `negative_ttl` seconds instead of `ttl`. Exceptions are never cached. `on_evict` is
+    called with the key and value of every entry evicted to make room for another.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        ttl: float,
+        max_entries: int = 128,
+        max_bytes: Optional[int] = None,
+        negative_ttl: Optional[float] = None,
+        is_negative: Optional[Callable[[Any], bool]] = None,
+        sizeof: Callable[[Any], int] = approximate_size,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.negative_ttl = negative_ttl if negative_ttl is not None else ttl
+        self.is_negative = is_negative
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+        caches[name] = self
+
+    def __len__(self) -> int:
+        """Return the number of cached entries, including any which have expired but not been dropped yet."""
+        return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> Optional[CacheEntry]:
+        """Return the live entry for `key`, dropping it if it has expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry.expires <= time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size
+
+    def _store(self, key: Hashable, value: Any):
+        negative = bool(self.is_negative and self.is_negative(value))
+        ttl = self.negative_ttl if negative else self.ttl
+        size = self.sizeof(value) if self.max_bytes else 0
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CacheEntry(value, time.monotonic() + ttl, size, negative)
+        self.total_bytes += size
+
+        # Evict the least recently used entries until we're within bounds again
+        while len(self._entries) > self.max_entries or (self.max_bytes and self.total_bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            evicted = self._entries[oldest]
+            self._remove(oldest)
+            self.evictions += 1
+            if self.on_evict and not evicted.negative:
+                self.on_evict(oldest, evicted.value)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for `key` without fetching it, or `default` if it's not cached."""
+        entry = self._lookup(key)
+        return default if entry is None else entry.value
+
+    def set(self, key: Hashable, value: Any):
+        """Cache `value` under `key`, replacing any existing entry."""
+        self._store(key, value)
+
+    def invalidate(self, key: Hashable = None):
+        """Drop the entry for `key`, or every entry if no key is given."""
+        if key is None:
+            self._entries.clear()
+            self.total_bytes = 0
+        elif key in self._entries:
+            self._remove(key)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for `key`, calling `fetch` on a miss."""
+        entry = self._lookup(key)
+        if entry is not None:
+            if entry.negative:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return entry.value
+
+        if key in self._in_flight:
+            self.coalesced += 1
+            return await asyncio.shield(self._in_flight[key])
+
+        self.misses += 1
+        task = asyncio.ensure_future(fetch())
+        self._in_flight[key] = task
+
+        def store_result(finished: asyncio.Future):
+            self._in_flight.pop(key, None)
+            if not finished.cancelled() and finished.exception() is None:
+                self._store(key, finished.result())
+
+        task.add_done_callback(store_result)
+
+        # Shielded so a cancelled caller doesn't cancel the fetch for everyone else waiting on it
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """Return the hit and miss counters of the cache."""
+        lookups = self.hits + self.negative_hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.negative_hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
+
+
+def async_cache(name: str = None, *, key: Callable[..., Hashable] = None, **options) -> Callable:
+    """
+    Cache the results of the decorated coroutine function in an `AsyncCache`.
+
+    The cache key is built from all the arguments, except `self` when decorating a method. A custom
+    `key` function taking the same arguments as the decorated function can be passed instead. Any
+    other keyword arguments are passed on to `AsyncCache`. The cache is exposed as `func.cache`.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        cache = AsyncCache(name or func.__qualname__, **options)
+        parameters = list(inspect.signature(func).parameters)
+        is_method = bool(parameters) and parameters[0] in ("self", "cls")
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            if key is not None:
+                cache_key = key(*args, **kwargs)
+            else:
+                cache_key = make_key(args[1:] if is_method else args, kwargs)
+            return await cache.get_or_fetch(cache_key, lambda: func(*args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
@@ -1,11 +1,17 @@
 import logging
+from io import BytesIO
 from random import choice, randint
 
-from PIL import Image
 from PIL import ImageOps
 
+from bot.utils.assets import ASSETS
+from bot.utils.avatars import Avatar
+
 log = logging.getLogger()
 
+PENTAGRAM = 'bot/resources/halloween/bloody-pentagram.png'
+BAT = 'bot/resources/halloween/bat-clipart.png'
+
 
 def inversion(im):
     """
@@ -22,8 +28,7 @@ def pentagram(im):
     """Adds pentagram to the image."""
     im = im.convert('RGB')
     wt, ht = im.size
-    penta = Image.open('bot/resources/halloween/bloody-pentagram.png')
-    penta = penta.resize((wt, ht))
+    penta = ASSETS.image(PENTAGRAM, size=(wt, ht))
     im.paste(penta, (0, 0), penta)
     return im
 
@@ -37,10 +42,9 @@ def bat(im):
     """
     im = im.convert('RGB')
     wt, ht = im.size
-    bat = Image.open('bot/resources/halloween/bat-clipart.png')
     bat_size = randint(wt//10, wt//7)
     rot = randint(0, 90)
-    bat = bat.resize((bat_size, bat_size))
+    bat = ASSETS.image(BAT, size=(bat_size, bat_size))
     bat = bat.rotate(rot)
     x = randint(wt-(bat_size * 3), wt-bat_size)
     y = randint(10, bat_size)
@@ -56,3 +60,11 @@ def get_random_effect(im):
     effect = choice(effects)
     log.info("Spookyavatar's chosen effect: " + effect.__name__)
     return effect(im)
+
+
+def render_spooky_avatar(avatar: Avatar) -> bytes:
+    """Apply a random effect to an avatar, returning it as a PNG. Runs in a rendering worker."""
+    im = get_random_effect(avatar.open())
+    buffer = BytesIO()
+    im.save(buffer, format="PNG")
+    return buffer.getvalue()
@@ -0,0 +1,118 @@
+import argparse
+import logging
+import time
+from io import BytesIO
+from typing import Iterable, Tuple
+
+from PIL import Image, ImageChops
+from PIL.ImageOps import posterize
+
+log = logging.getLogger(__name__)
+
+__all__ = ("PaletteMapper",)
+
+Colour = Tuple[int, int, int]
+
+
+class PaletteMapper:
+    """
+    Maps every pixel of an image to the nearest colour of a palette in a single pass.
+
+    The nearest colour search runs in Pillow's C palette conversion, which caches its lookups over
+    the colour cube, instead of comparing each pixel against the palette in Python. Posterizing to
+    `bits` bits per channel first keeps that cache small. The alpha channel passes through untouched.
+    """
+
+    def __init__(self, colours: Iterable[Colour], *, average: bool = False, bits: int = 6):
+        """
+        Set up the mapper for `colours`, of which there can be at most 256.
+
+        With `average`, each pixel becomes the average of its colour and the nearest palette colour
+        instead of being replaced by it.
+        """
+        self.colours = [tuple(colour) for colour in colours]
+        if not 0 < len(self.colours) <= 256:
+            raise ValueError("A palette needs between 1 and 256 colours")
+
+        self.average = average
+        self.bits = bits
+
+        # Unused palette entries repeat the first colour, so they can never be a closer match
+        padding = [self.colours[0]] * (256 - len(self.colours))
+        self.palette = Image.new("P", (1, 1))
+        self.palette.putpalette([value for colour in self.colours + padding for value in colour])
+
+    def map(self, image: Image.Image) -> Image.Image:
+        """Return a copy of `image` with its colours mapped onto the palette, as an RGBA image."""
+        image = image.convert("RGBA")
+        alpha = image.getchannel("A")
+
+        rgb = image.convert("RGB")
+        if self.bits < 8:
+            rgb = posterize(rgb, self.bits)
+
+        # `Image.quantize` always dithers on older Pillow versions, so convert through the core directly
+        nearest = rgb._new(rgb.im.convert("P", Image.NONE, self.palette.im)).convert("RGB")
+        if self.average:
+            nearest = ImageChops.add(rgb, nearest, scale=2)
+
+        nearest.putalpha(alpha)
+        return nearest
+
+
+def _map_per_pixel(image: Image.Image, colours: Iterable[Colour]) -> Image.Image:
+    """Average each pixel with its nearest colour by looking them up in Python, to benchmark against."""
+    colours = list(colours)
+    image = image.convert("RGBA")
+    alpha = image.getchannel("A").getdata()
+    rgb = posterize(image.convert("RGB"), 6)
+
+    def closest(pixel: Colour) -> Colour:
+        nearest = min(colours, key=lambda colour: sum((a - b) ** 2 for a, b in zip(pixel, colour)))
+        return tuple((a + b) // 2 for a, b in zip(pixel, nearest))
+
+    data = rgb.getdata()
+    lookup = {pixel: closest(pixel) for pixel in set(data)}
+    mapped = Image.new("RGBA", rgb.size)
+    mapped.putdata([(*lookup[pixel], alpha[i]) for i, pixel in enumerate(data)])
+    return mapped
+
+
+def benchmark(sizes: Iterable[int], runs: int):
+    """Print how long mapping a noisy avatar takes per pixel in Python and with `PaletteMapper`."""
+    from bot.seasons.easter.avatar_easterifier import COLOURS
+
+    mapper = PaletteMapper(COLOURS, average=True)
+    for size in sizes:
+        # Noise scaled up a little, so there are plenty of distinct colours without being pure static
+        noise = Image.effect_noise((size // 4, size // 4), 96)
+        image = Image.merge("RGB", [noise, noise.rotate(90), noise.rotate(180)]).resize((size, size))
+        buffer = BytesIO()
+        image.save(buffer, "PNG")
+        image = Image.open(BytesIO(buffer.getvalue()))
+
+        timings = {}
+        for name, function in (("per pixel", lambda im: _map_per_pixel(im, COLOURS)), ("mapper", mapper.map)):
+            start = time.perf_counter()
+            for _ in range(runs):
+                function(image)
+            timings[name] = (time.perf_counter() - start) / runs
+
+        speedup = timings["per pixel"] / timings["mapper"]
+        print(
+            f"{size}px: per pixel {timings['per pixel'] * 1000:.1f}ms, "
+            f"mapper {timings['mapper'] * 1000:.1f}ms ({speedup:.0f}x faster)"
+        )
+
+
+def main():
+    """Benchmark palette mapping from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark mapping avatars onto a colour palette.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 1024], help="Avatar sizes, in pixels.")
+    parser.add_argument("--runs", type=int, default=3, help="Times to map each avatar.")
+    args = parser.parse_args()
+    benchmark(args.sizes, args.runs)
+
+
+if __name__ == "__main__":
+    main()